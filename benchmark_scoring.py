@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""
+Scoring Benchmark Script
+Compares per-item scoring with score_batch on synthetic headlines (10k and 100k titles)
+and checks that both produce identical scores.
+Measured locally the batch path is about 1.2x faster, except technews at 10k titles
+where NumPy setup outweighs the savings (about 0.8x); the regex scan dominates both.
+"""
+
+import os
+import sys
+import random
+import time
+
+# Scoring needs no API access, but importing the core module requires a key
+os.environ.setdefault("OPENAI_API_KEY", "benchmark-only")
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
+
+from core.main import (
+    score_batch, calculate_content_score, calculate_crypto_content_score,
+    TECHNEWS_TITLE_RULES, CRYPTO_TITLE_RULES,
+)
+
+WORDS = [
+    "new", "study", "shows", "ai", "said", "second", "sec", "bitcoin", "price", "market",
+    "research", "breakthrough", "quantum", "policy", "laws", "startup", "raises", "funding",
+    "security", "hack", "exploit", "ethereum", "defi", "regulation", "update", "release",
+    "climate", "energy", "machine", "learning", "artificial", "intelligence", "moon", "pump",
+    "the", "of", "in", "for", "and", "with", "launches", "report", "analysis", "rumor",
+]
+SOURCES = [
+    "hnrss.org", "www.techmeme.com", "feeds.arstechnica.com", "feeds.feedburner.com",
+    "www.coindesk.com", "cointelegraph.com", "news.mit.edu",
+]
+
+def make_items(count, seed=42):
+    """Generate synthetic headline dicts"""
+    rng = random.Random(seed)
+    return [
+        {"title": " ".join(rng.choice(WORDS) for _ in range(rng.randint(4, 14))).capitalize(),
+         "source": rng.choice(SOURCES)}
+        for _ in range(count)
+    ]
+
+def benchmark(count):
+    """Time both scoring paths for both rule sets and verify equality"""
+    items = make_items(count)
+
+    for name, scorer, rules in [
+        ("technews", calculate_content_score, TECHNEWS_TITLE_RULES),
+        ("crypto", calculate_crypto_content_score, CRYPTO_TITLE_RULES),
+    ]:
+        start = time.perf_counter()
+        expected = [scorer(item) for item in items]
+        per_item = time.perf_counter() - start
+
+        start = time.perf_counter()
+        batch = score_batch(items, rules)
+        batched = time.perf_counter() - start
+
+        assert batch.tolist() == expected, f"{name}: score_batch differs from per-item scores"
+        print(f"   {name:<8} {count:>7} titles: per-item {per_item * 1000:8.1f} ms | "
+              f"batch {batched * 1000:8.1f} ms | speedup {per_item / batched:4.1f}x")
+
+if __name__ == "__main__":
+    print("⏱️  Scoring benchmark (results verified identical)")
+    print("=" * 60)
+    score_batch(make_items(10), TECHNEWS_TITLE_RULES)  # warm up (NumPy import)
+    for count in (10_000, 100_000):
+        benchmark(count)
+    print("=" * 60)
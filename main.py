@@ -10,8 +10,13 @@ import os
 # Add src directory to Python path
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
 
+# --no-cache: bypass the LLM response cache for this run (read by core.main at import)
+if "--no-cache" in sys.argv:
+    sys.argv.remove("--no-cache")
+    os.environ["LLM_CACHE_BYPASS"] = "1"
+
 # Import the main bot functionality
-from core.main import main, clear_memory_files, show_memory_status, run_specific_accounts
+from core.main import main, clear_memory_files, show_memory_status, run_specific_accounts, report_feed_duplicates, show_feed_health, poll_feeds_once, poll_feeds_forever, fill_backlog, backlog_counts, show_llm_stats
 
 if __name__ == "__main__":
     if len(sys.argv) > 1:
@@ -21,6 +26,27 @@ if __name__ == "__main__":
             clear_memory_files()
         elif command == "status":
             show_memory_status()
+        elif command == "poll":
+            if len(sys.argv) > 2 and sys.argv[2].lower() == "once":
+                poll_feeds_once()
+            else:
+                poll_feeds_forever()
+        elif command == "feeds":
+            report_feed_duplicates()
+            show_feed_health()
+        elif command == "backlog":
+            # backlog [status | books | quotes] [target]
+            args = [arg.lower() for arg in sys.argv[2:]]
+            if args and args[0] == "status":
+                counts = backlog_counts()
+                print(f"📦 Backlog: {counts.get('books', 0)} book thread(s), {counts.get('quotes', 0)} quote thread(s)")
+            else:
+                content_types = [arg for arg in args if arg in ["books", "quotes"]] or ["books", "quotes"]
+                target = next((int(arg) for arg in args if arg.isdigit()), None)
+                for content_type in content_types:
+                    fill_backlog(content_type, target)
+        elif command == "stats":
+            show_llm_stats(sys.argv[2] if len(sys.argv) > 2 else "7d")
         elif command == "help":
             print("""
 🔧 Quinn Social Media Bot - Command Line Options:
@@ -35,6 +61,14 @@ Usage:
   python main.py quotes             # Run only Quotes
   python main.py clear              # Clear all memory files
   python main.py status             # Show memory status
+  python main.py poll               # Run the background feed poller (keeps data/entries.db fresh)
+  python main.py poll once          # Refresh the feed index once and exit
+  python main.py feeds              # Show duplicate feeds and feed health
+  python main.py backlog            # Pre-generate book and quote threads (off-peak job)
+  python main.py backlog books 20   # Queue up to 20 book threads
+  python main.py backlog status     # Show queued threads
+  python main.py stats              # LLM calls, latency, tokens and spend per account (last 7 days)
+  python main.py stats 24h          # Same for the last 24 hours
   python main.py help               # Show this help
 
 Account Types:
@@ -55,6 +89,7 @@ Examples:
   python main.py reddit product     # Run Reddit and ProductHunt
   python main.py clear              # Start fresh with no memory
   python main.py status             # Check what's been used recently
+  python main.py books --no-cache   # Skip the LLM response cache for this run
             """)
         elif command in ["technews", "reddit", "product", "books", "quotes", "crypto"]:
             # Run specific account type(s) - support multiple accounts
@@ -1,15 +1,36 @@
 import os, json
 import requests, feedparser
-from urllib.parse import urljoin, quote
+from urllib.parse import urljoin, quote, urlsplit, urlunsplit, parse_qsl, urlencode
 from bs4 import BeautifulSoup
 from dotenv import load_dotenv
-from openai import OpenAI
+from openai import OpenAI, APIConnectionError, RateLimitError, InternalServerError
 import urllib3
-import tweepy
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+import re
+import math
 import time
 import random
-from datetime import datetime, timedelta
-from config.twitter_dict import accounts_data
+import pickle
+import hashlib
+import threading
+import sqlite3
+import calendar
+import zlib
+import unicodedata
+from concurrent.futures import ThreadPoolExecutor, Future, wait, FIRST_COMPLETED
+from contextlib import contextmanager, ExitStack
+from datetime import datetime
+
+try:
+    import fcntl
+except ImportError:  # not available on Windows; locking becomes a no-op
+    fcntl = None
+
+try:
+    import tiktoken
+except ImportError:  # token counts fall back to an estimate
+    tiktoken = None
 urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
 
 # ---------- Config ----------
@@ -78,7 +99,7 @@ OPENAI_MODEL     = os.getenv("OPENAI_MODEL", "gpt-4o-mini")
 if not OPENAI_API_KEY:
     raise SystemExit("Missing OPENAI_API_KEY in .env file")
 
-client = OpenAI(api_key=OPENAI_API_KEY)
+client = OpenAI(api_key=OPENAI_API_KEY, max_retries=0)  # retries are handled by hedged_completion
 
 # ---------- Time Filtering Configuration ----------
 # Maximum age of content in hours (configurable per feed type)
@@ -90,154 +111,748 @@ MAX_CONTENT_AGE_HOURS = {
     "default": 24      # Default for any other types
 }
 
+# ---------- HTTP Configuration ----------
+# Shared connection pool for every outbound request (feeds, article pages, URL shortener)
+HTTP_TIMEOUT = float(os.getenv("HTTP_TIMEOUT", "10"))          # seconds per request
+HTTP_RETRIES = int(os.getenv("HTTP_RETRIES", "1"))             # retries on connection errors / 429 / 5xx
+HTTP_POOL_HOSTS = int(os.getenv("HTTP_POOL_HOSTS", "20"))      # number of per-host pools kept alive
+HTTP_POOL_PER_HOST = int(os.getenv("HTTP_POOL_PER_HOST", "4")) # max open connections per host
+
+# ---------- Feed Ingestion Configuration ----------
+# Maximum number of feeds fetched at the same time (bounded thread pool)
+FEED_FETCH_WORKERS = int(os.getenv("FEED_FETCH_WORKERS", "8"))
+
+# Conditional GET cache: ETag/Last-Modified validators plus the last parsed feed per URL
+FEED_CACHE_DIR = "data/feed_cache"
+FEED_VALIDATORS_FILE = os.path.join(FEED_CACHE_DIR, "validators.json")
+
+# Feed health / circuit breaker: after FEED_BREAKER_THRESHOLD consecutive failures
+# (errors or empty feeds) a feed is skipped, then probed again on an exponential backoff
+FEED_HEALTH_FILE = "data/feed_health.json"
+FEED_BREAKER_THRESHOLD = int(os.getenv("FEED_BREAKER_THRESHOLD", "3"))
+FEED_BREAKER_BASE_SECONDS = int(os.getenv("FEED_BREAKER_BASE_SECONDS", "3600"))     # 1 hour
+FEED_BREAKER_MAX_SECONDS = int(os.getenv("FEED_BREAKER_MAX_SECONDS", "86400"))      # 24 hours
+
+# ---------- Near-Duplicate Clustering Configuration ----------
+# Candidates whose title word sets overlap at least this much (Jaccard) are the same story
+NEAR_DUPLICATE_THRESHOLD = float(os.getenv("NEAR_DUPLICATE_THRESHOLD", "0.5"))
+
+# ---------- Feed Poller Configuration ----------
+# `python main.py poll` keeps a local SQLite index of feed entries fresh so that
+# posting runs read candidates locally instead of crawling every feed inline
+ENTRY_INDEX_FILE = "data/entries.db"
+FEED_POLL_INTERVAL = int(os.getenv("FEED_POLL_INTERVAL", "900"))                         # seconds between polls
+FEED_INDEX_MAX_AGE = int(os.getenv("FEED_INDEX_MAX_AGE", str(FEED_POLL_INTERVAL * 3)))   # index older than this is ignored
+FEED_INDEX_RETENTION_HOURS = 7 * 24  # entries kept in the index
+
 # ---------- Helpers ----------
+_http_session = None
+_http_session_lock = threading.Lock()
+
+def get_http_session():
+    """Return the process-wide pooled requests session (keep-alive, retries, per-host limits)"""
+    global _http_session
+    with _http_session_lock:
+        if _http_session is None:
+            retry = Retry(
+                total=HTTP_RETRIES,
+                backoff_factor=0.5,
+                status_forcelist=[429, 500, 502, 503, 504],
+                allowed_methods=["GET", "HEAD"],
+                raise_on_status=False,
+            )
+            adapter = HTTPAdapter(
+                pool_connections=HTTP_POOL_HOSTS,
+                pool_maxsize=HTTP_POOL_PER_HOST,
+                pool_block=True,  # wait for a free connection instead of opening extra ones
+                max_retries=retry,
+            )
+            session = requests.Session()
+            session.mount("http://", adapter)
+            session.mount("https://", adapter)
+            _http_session = session
+        return _http_session
+
+def http_get(url, **kwargs):
+    """GET through the shared session with the default timeout"""
+    kwargs.setdefault("timeout", HTTP_TIMEOUT)
+    return get_http_session().get(url, **kwargs)
+
+_feed_cache_lock = threading.Lock()
+_feed_validators = None
+_dirty_validators = set()  # URLs whose validators changed since the last flush
+
+def load_feed_validators():
+    """Load the ETag/Last-Modified validators saved by previous runs"""
+    global _feed_validators
+    with _feed_cache_lock:
+        if _feed_validators is None:
+            try:
+                with open(FEED_VALIDATORS_FILE, 'r') as f:
+                    _feed_validators = json.load(f)
+            except Exception:
+                _feed_validators = {}
+        return _feed_validators
+
+def _feed_cache_path(url):
+    """Path of the pickled parse result for a feed URL"""
+    digest = hashlib.sha1(url.encode("utf-8")).hexdigest()
+    return os.path.join(FEED_CACHE_DIR, f"{digest}.pickle")
+
+def load_cached_feed(url):
+    """Return the previously parsed feed for a URL, or None if there is none"""
+    try:
+        with open(_feed_cache_path(url), 'rb') as f:
+            return pickle.load(f)
+    except Exception:
+        return None
+
+def store_cached_feed(url, response, feed):
+    """Remember the validators and parsed result of a 200 response"""
+    etag = response.headers.get("ETag")
+    last_modified = response.headers.get("Last-Modified")
+    validators = load_feed_validators()
+    
+    with _feed_cache_lock:
+        if not etag and not last_modified:
+            # Nothing to revalidate with next time
+            validators.pop(url, None)
+        else:
+            try:
+                os.makedirs(FEED_CACHE_DIR, exist_ok=True)
+                path = _feed_cache_path(url)
+                with open(f"{path}.{os.getpid()}.{threading.get_ident()}.tmp", 'wb') as f:
+                    pickle.dump(feed, f)
+                os.replace(f.name, path)
+                validators[url] = {"etag": etag, "last_modified": last_modified}
+            except Exception as e:
+                print(f"[feeds] Could not cache {url}: {e}")
+                validators.pop(url, None)
+        # Written by flush_feed_state() once the fetch round is done
+        _dirty_validators.add(url)
+
+def _merge_feed_state(path, state, dirty, lock, label):
+    """Write the changed records of `state` over the file's current contents.
+    
+    The file is re-read under a file lock so records written by other processes survive,
+    and replaced atomically so a reader never sees a half-written file.
+    """
+    with lock:
+        if not dirty:
+            return
+        changes = {url: dict(state[url]) if url in state else None for url in dirty}
+        dirty.clear()
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with file_lock(path + ".lock"):
+            try:
+                with open(path, 'r') as f:
+                    records = json.load(f)
+            except (FileNotFoundError, ValueError):
+                records = {}
+            for url, record in changes.items():
+                if record is None:
+                    records.pop(url, None)
+                else:
+                    records[url] = record
+            with open(f"{path}.{os.getpid()}.tmp", 'w') as f:
+                json.dump(records, f, indent=2)
+            os.replace(f.name, path)
+    except Exception as e:
+        print(f"[feeds] Could not save {label}: {e}")
+
+def flush_feed_state():
+    """Persist the feed validators and health records changed since the last flush"""
+    if _feed_validators is not None:
+        _merge_feed_state(FEED_VALIDATORS_FILE, _feed_validators, _dirty_validators, _feed_cache_lock, "feed validators")
+    if _feed_health is not None:
+        _merge_feed_state(FEED_HEALTH_FILE, _feed_health, _dirty_health, _feed_health_lock, "feed health")
+
+_feed_health_lock = threading.Lock()
+_feed_health = None
+_dirty_health = set()  # URLs whose health changed since the last flush
+
+def load_feed_health():
+    """Load the persisted per-feed health records"""
+    global _feed_health
+    with _feed_health_lock:
+        if _feed_health is None:
+            try:
+                with open(FEED_HEALTH_FILE, 'r') as f:
+                    _feed_health = json.load(f)
+            except Exception:
+                _feed_health = {}
+        return _feed_health
+
+def feed_circuit_open(url):
+    """True while a failing feed is in its backoff window and should be skipped"""
+    record = load_feed_health().get(url)
+    return bool(record) and record.get("open_until", 0) > time.time()
+
+def record_feed_result(url, ok, latency, error=None):
+    """Update a feed's health record and trip/reset its circuit breaker"""
+    health = load_feed_health()
+    now = time.time()
+    with _feed_health_lock:
+        record = health.setdefault(url, {
+            "failures": 0, "total_failures": 0, "successes": 0,
+            "avg_latency": None, "last_latency": None,
+            "last_success": None, "last_failure": None, "last_error": None,
+            "open_until": 0,
+        })
+        record["last_latency"] = round(latency, 3)
+        if record["avg_latency"] is None:
+            record["avg_latency"] = round(latency, 3)
+        else:
+            # Exponentially weighted so recent behaviour dominates
+            record["avg_latency"] = round(0.7 * record["avg_latency"] + 0.3 * latency, 3)
+        
+        if ok:
+            record["failures"] = 0
+            record["successes"] += 1
+            record["last_success"] = now
+            record["open_until"] = 0
+        else:
+            record["failures"] += 1
+            record["total_failures"] += 1
+            record["last_failure"] = now
+            record["last_error"] = error
+            if record["failures"] >= FEED_BREAKER_THRESHOLD:
+                backoff = FEED_BREAKER_BASE_SECONDS * 2 ** (record["failures"] - FEED_BREAKER_THRESHOLD)
+                record["open_until"] = now + min(backoff, FEED_BREAKER_MAX_SECONDS)
+        # Written by flush_feed_state() once the fetch round is done
+        _dirty_health.add(url)
+
 def custom_feedparser(url: str):
-    """Feedparser via requests (more forgiving TLS)."""
+    """Feedparser via requests (more forgiving TLS), guarded by the feed's circuit breaker."""
+    if feed_circuit_open(url):
+        retry_at = datetime.fromtimestamp(load_feed_health()[url]["open_until"])
+        print(f"[feeds] {url} -> skipped (circuit open until {retry_at:%Y-%m-%d %H:%M})")
+        return feedparser.parse("")
+    
+    start = time.time()
     try:
-        r = requests.get(url, timeout=10, verify=False)
-        r.raise_for_status()
-        return feedparser.parse(r.content)
+        feed = download_feed(url)
     except Exception as e:
+        record_feed_result(url, False, time.time() - start, error=str(e))
         print(f"[feeds] {url} -> {e}")
         return feedparser.parse("")
+    
+    ok = bool(feed.entries)
+    record_feed_result(url, ok, time.time() - start, error=None if ok else "no entries")
+    return feed
+
+def download_feed(url: str):
+    """Download and parse a feed, revalidating with a conditional GET."""
+    headers = {}
+    cached = load_feed_validators().get(url)
+    if cached:
+        if cached.get("etag"):
+            headers["If-None-Match"] = cached["etag"]
+        if cached.get("last_modified"):
+            headers["If-Modified-Since"] = cached["last_modified"]
+    
+    r = http_get(url, verify=False, headers=headers)
+    
+    if r.status_code == 304:
+        feed = load_cached_feed(url)
+        if feed is not None:
+            feed["href"] = r.url
+            return feed
+        # Validators without a cached body: fall back to a full download
+        r = http_get(url, verify=False)
+    
+    r.raise_for_status()
+    feed = feedparser.parse(r.content)
+    feed["href"] = r.url  # final URL after redirects
+    store_cached_feed(url, r, feed)
+    return feed
+
+def canonicalize_feed_url(url):
+    """Normalize a feed URL so trivially different spellings map to one key"""
+    try:
+        parts = urlsplit(url.strip())
+        scheme = parts.scheme.lower()
+        host = (parts.hostname or "").lower()
+        # Drop default ports
+        if parts.port and not ((scheme == "http" and parts.port == 80) or (scheme == "https" and parts.port == 443)):
+            host = f"{host}:{parts.port}"
+        path = parts.path or "/"
+        if len(path) > 1:
+            path = path.rstrip("/")
+        query = urlencode(sorted(parse_qsl(parts.query, keep_blank_values=True)))
+        return urlunsplit((scheme, host, path, query, ""))
+    except Exception:
+        return url
+
+# Per-run feed cache: canonical URL -> Future of the parsed feed, so each
+# distinct resource is downloaded once and shared by every fetcher
+_run_feeds = {}
+_run_feed_resolutions = {}
+_run_feeds_lock = threading.Lock()
+
+def get_feed(url):
+    """Fetch a feed at most once per run, following redirects to a canonical resource"""
+    key = canonicalize_feed_url(url)
+    with _run_feeds_lock:
+        future = _run_feeds.get(key)
+        owner = future is None
+        if owner:
+            future = Future()
+            _run_feeds[key] = future
+    
+    if not owner:
+        return future.result()
+    
+    try:
+        feed = custom_feedparser(url)
+        resolved = canonicalize_feed_url(feed.get("href") or url)
+    except Exception as e:
+        # Waiting callers must always be released; they get the same empty parse as a failed fetch
+        print(f"[feeds] {url} -> {e}")
+        feed = feedparser.parse("")
+        resolved = key
+    
+    with _run_feeds_lock:
+        _run_feed_resolutions[key] = resolved
+        # Callers asking for the redirect target directly share this result too
+        _run_feeds.setdefault(resolved, future)
+    future.set_result(feed)
+    return feed
+
+def reset_feed_run_cache():
+    """Forget the feeds fetched so far (start of a new run)"""
+    with _run_feeds_lock:
+        _run_feeds.clear()
+        _run_feed_resolutions.clear()
+
+def resolve_feed_url(url):
+    """Canonical resource a configured URL points at (after redirects, if fetched this run)"""
+    key = canonicalize_feed_url(url)
+    return _run_feed_resolutions.get(key, key)
+
+def find_duplicate_feeds(urls):
+    """Group configured feed URLs that collapse to the same resource"""
+    groups = {}
+    for url in urls:
+        groups.setdefault(resolve_feed_url(url), []).append(url)
+    return {resource: members for resource, members in groups.items() if len(members) > 1}
 
-def filter_by_recency(feed_entries, content_type="default"):
-    """Filter RSS entries to only include recent content based on configurable time limits"""
-    if not feed_entries:
-        return []
+def report_feed_duplicates():
+    """Fetch every configured feed once and print which URLs point at the same resource"""
+    all_feeds = FEEDS + CRYPTO_FEEDS + REDDIT_FEEDS + PRODUCTHUNT_FEEDS
+    fetch_feeds_concurrently(all_feeds)
     
-    max_hours = MAX_CONTENT_AGE_HOURS.get(content_type, MAX_CONTENT_AGE_HOURS["default"])
-    cutoff_time = datetime.now() - timedelta(hours=max_hours)
-    recent_entries = []
-    filtered_count = 0
+    duplicates = find_duplicate_feeds(all_feeds)
+    distinct = len({resolve_feed_url(url) for url in all_feeds})
     
-    for entry in feed_entries:
-        # Try different date fields that RSS feeds commonly use
-        published_time = None
-        
-        # Check published_parsed (most common)
-        if hasattr(entry, 'published_parsed') and entry.published_parsed:
-            try:
-                published_time = datetime(*entry.published_parsed[:6])
-            except (ValueError, TypeError):
-                pass
+    print("\n🔁 Feed Deduplication:")
+    print("=" * 50)
+    print(f"   {len(all_feeds)} configured URLs → {distinct} distinct resources")
+    for resource, members in duplicates.items():
+        print(f"\n   {resource}")
+        for url in members:
+            print(f"     ← {url}")
+    if not duplicates:
+        print("   No duplicate feeds configured")
+    print("=" * 50)
+
+def show_feed_health():
+    """Print the health record and circuit state of every configured feed"""
+    health = load_feed_health()
+    now = time.time()
+    
+    print("\n🩺 Feed Health:")
+    print("=" * 50)
+    for url in dict.fromkeys(FEEDS + CRYPTO_FEEDS + REDDIT_FEEDS + PRODUCTHUNT_FEEDS):
+        record = health.get(url)
+        if not record:
+            print(f"   ⚪ {url} (never fetched)")
+            continue
         
-        # Check updated_parsed (alternative)
-        elif hasattr(entry, 'updated_parsed') and entry.updated_parsed:
+        if record.get("open_until", 0) > now:
+            state = f"🔴 open until {datetime.fromtimestamp(record['open_until']):%Y-%m-%d %H:%M}"
+        elif record.get("failures"):
+            state = f"🟡 {record['failures']} consecutive failures"
+        else:
+            state = "🟢 healthy"
+        last_success = datetime.fromtimestamp(record["last_success"]).strftime("%Y-%m-%d %H:%M") if record.get("last_success") else "never"
+        print(f"   {state} {url}")
+        print(f"      avg {record.get('avg_latency')}s, {record.get('successes', 0)} ok / {record.get('total_failures', 0)} failed, last success: {last_success}")
+    print("=" * 50)
+
+def fetch_feeds_concurrently(urls):
+    """Fetch several feeds at once and return (url, feed) pairs in the original order"""
+    if not urls:
+        return []
+    
+    workers = max(1, min(FEED_FETCH_WORKERS, len(urls)))
+    try:
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            # map() yields results in submission order, so merging stays deterministic
+            feeds = list(pool.map(get_feed, urls))
+    finally:
+        flush_feed_state()
+    
+    return list(zip(urls, feeds))
+
+# ---------- Feed Entry Index ----------
+FEED_GROUPS = {
+    "technews": FEEDS,
+    "crypto": CRYPTO_FEEDS,
+    "reddit": REDDIT_FEEDS,
+    "product": PRODUCTHUNT_FEEDS,
+}
+
+def open_entry_index():
+    """Open (and create if needed) the local SQLite feed entry index"""
+    os.makedirs(os.path.dirname(ENTRY_INDEX_FILE), exist_ok=True)
+    conn = sqlite3.connect(ENTRY_INDEX_FILE, timeout=30)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.executescript("""
+        CREATE TABLE IF NOT EXISTS entries (
+            feed_url    TEXT NOT NULL,
+            link        TEXT NOT NULL,
+            feed_group  TEXT NOT NULL,
+            title       TEXT,
+            description TEXT,
+            published   REAL,
+            position    INTEGER,
+            first_seen  REAL NOT NULL,
+            last_seen   REAL NOT NULL,
+            PRIMARY KEY (feed_url, link)
+        );
+        CREATE INDEX IF NOT EXISTS entries_by_published ON entries (feed_url, published);
+        CREATE TABLE IF NOT EXISTS poll_state (
+            key   TEXT PRIMARY KEY,
+            value REAL
+        );
+    """)
+    return conn
+
+# Date formats tried for entries that only carry a string `published` field
+ENTRY_DATE_FORMATS = ['%a, %d %b %Y %H:%M:%S %z', '%a, %d %b %Y %H:%M:%S', '%Y-%m-%d %H:%M:%S']
+
+def entry_timestamp(entry):
+    """Epoch seconds (UTC) of an entry's published/updated date, or None if unknown"""
+    for field in ("published_parsed", "updated_parsed"):
+        parsed = entry.get(field)
+        if parsed:
             try:
-                published_time = datetime(*entry.updated_parsed[:6])
-            except (ValueError, TypeError):
+                return float(calendar.timegm(parsed))
+            except (ValueError, TypeError, OverflowError):
                 pass
-        
-        # Check published (string format)
-        elif hasattr(entry, 'published') and entry.published:
+    
+    published = entry.get("published")
+    if published:
+        for fmt in ENTRY_DATE_FORMATS:
             try:
-                # Try to parse common date formats
-                for fmt in ['%a, %d %b %Y %H:%M:%S %z', '%a, %d %b %Y %H:%M:%S', '%Y-%m-%d %H:%M:%S']:
-                    try:
-                        published_time = datetime.strptime(entry.published, fmt)
-                        break
-                    except ValueError:
-                        continue
-            except Exception:
-                pass
-        
-        # If we can't determine the time, include it (better to include than exclude)
-        if published_time is None:
-            recent_entries.append(entry)
+                parsed = datetime.strptime(published, fmt)
+            except ValueError:
+                continue
+            if parsed.tzinfo is None:
+                return float(calendar.timegm(parsed.timetuple()))
+            return parsed.timestamp()
+    return None
+
+def index_feed_entries(conn, group, url, feed):
+    """Upsert the entries of one fetched feed into the index"""
+    now = time.time()
+    rows = []
+    for position, entry in enumerate(feed.entries):
+        link = entry.get("link")
+        if not link:
             continue
-        
-        # Filter by recency
-        if published_time > cutoff_time:
-            recent_entries.append(entry)
-        else:
-            filtered_count += 1
+        rows.append((url, link, group, entry.get("title"), entry.get("description", ""),
+                     entry_timestamp(entry), position, now, now))
+    
+    conn.executemany("""
+        INSERT INTO entries (feed_url, link, feed_group, title, description, published, position, first_seen, last_seen)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+        ON CONFLICT (feed_url, link) DO UPDATE SET
+            title = excluded.title,
+            description = excluded.description,
+            published = COALESCE(excluded.published, entries.published),
+            position = excluded.position,
+            last_seen = excluded.last_seen
+    """, rows)
+    return len(rows)
+
+def poll_feeds_once():
+    """Fetch every feed group once and refresh the local entry index"""
+    reset_feed_run_cache()
+    started = time.time()
+    all_urls = list(dict.fromkeys(url for urls in FEED_GROUPS.values() for url in urls))
+    feeds = dict(fetch_feeds_concurrently(all_urls))
+    
+    conn = open_entry_index()
+    try:
+        with conn:
+            for group, urls in FEED_GROUPS.items():
+                indexed = sum(index_feed_entries(conn, group, url, feeds[url]) for url in urls)
+                print(f"[poller] {group}: {indexed} entries indexed from {len(urls)} feeds")
+            
+            # Drop entries that are far older than any recency window
+            cutoff = time.time() - FEED_INDEX_RETENTION_HOURS * 3600
+            conn.execute("DELETE FROM entries WHERE COALESCE(published, first_seen) < ? AND last_seen < ?", (cutoff, cutoff))
+            conn.execute("INSERT OR REPLACE INTO poll_state (key, value) VALUES ('last_poll', ?)", (time.time(),))
+    finally:
+        conn.close()
+    
+    print(f"[poller] Poll finished in {time.time() - started:.1f}s")
+
+def poll_feeds_forever(interval=FEED_POLL_INTERVAL):
+    """Run the feed poller until interrupted"""
+    print(f"🔄 Feed poller started (every {interval}s) → {ENTRY_INDEX_FILE}")
+    while True:
+        try:
+            poll_feeds_once()
+        except Exception as e:
+            print(f"[poller] Poll failed: {e}")
+        time.sleep(interval)
+
+def entry_index_is_fresh():
+    """True when the poller has refreshed the index recently enough to use it"""
+    if not os.path.exists(ENTRY_INDEX_FILE):
+        return False
+    try:
+        conn = open_entry_index()
+        try:
+            row = conn.execute("SELECT value FROM poll_state WHERE key = 'last_poll'").fetchone()
+        finally:
+            conn.close()
+    except Exception as e:
+        print(f"[poller] Could not read entry index: {e}")
+        return False
+    return bool(row) and time.time() - row[0] <= FEED_INDEX_MAX_AGE
+
+def load_indexed_feeds(urls):
+    """Build (url, feed) pairs from the entry index, shaped like parsed feeds"""
+    conn = open_entry_index()
+    try:
+        results = []
+        for url in urls:
+            rows = conn.execute("""
+                SELECT title, link, description, COALESCE(published, first_seen) FROM entries
+                WHERE feed_url = ?
+                ORDER BY last_seen DESC, position ASC
+            """, (url,)).fetchall()
+            # Undated entries are aged from when the poller first saw them
+            entries = [
+                feedparser.FeedParserDict(title=title, link=link, description=description or "",
+                                          published_parsed=time.gmtime(published))
+                for title, link, description, published in rows
+            ]
+            results.append((url, feedparser.FeedParserDict(entries=entries, href=url)))
+        return results
+    finally:
+        conn.close()
+
+def read_feeds(urls):
+    """Feeds for the fetchers: from the poller's index when fresh, otherwise from the network"""
+    if entry_index_is_fresh():
+        try:
+            return load_indexed_feeds(urls)
+        except Exception as e:
+            print(f"[poller] Entry index unavailable, fetching live: {e}")
+    return fetch_feeds_concurrently(urls)
+
+# ---------- Candidate Records ----------
+class Candidate:
+    """Compact, normalized feed entry used by filtering, scoring and dedupe"""
+    __slots__ = ("title", "title_lower", "link", "canonical_link", "source",
+                 "published", "description", "feed_url", "score")
+    
+    def __init__(self, title, link, source, published=None, description="", feed_url=""):
+        self.title = title
+        self.title_lower = title.lower()
+        self.link = link
+        self.canonical_link = canonicalize_feed_url(link)
+        self.source = source
+        self.published = published  # epoch seconds (UTC) or None
+        self.description = description or ""
+        self.feed_url = feed_url
+        self.score = 0
+    
+    def __getitem__(self, key):
+        # Lets dict-style helpers (scorers, identifiers) accept records directly
+        try:
+            return getattr(self, key)
+        except AttributeError:
+            raise KeyError(key) from None
+    
+    def get(self, key, default=None):
+        return getattr(self, key, default)
+    
+    def to_dict(self):
+        """Plain dict shape used for prompts and memory tracking"""
+        return {"title": self.title, "link": self.link, "source": self.source, "score": self.score}
+    
+    def __repr__(self):
+        return f"Candidate({self.title!r}, {self.link!r}, score={self.score})"
+
+def feed_source(url):
+    """Host name of a feed URL, used as the candidate's source"""
+    return url.split("//")[1].split("/")[0] if "//" in url else "unknown"
+
+def normalize_entries(entries, feed_url):
+    """Convert raw feed entries into Candidate records in a single pass"""
+    source = feed_source(feed_url)
+    candidates = []
+    for entry in entries:
+        title = entry.get("title")
+        link = entry.get("link")
+        if not title or not link:
+            continue
+        candidates.append(Candidate(title, link, source, entry_timestamp(entry),
+                                    entry.get("description", ""), feed_url))
+    return candidates
+
+def filter_by_recency(candidates, content_type="default"):
+    """Filter candidates to only include recent content based on configurable time limits"""
+    if not candidates:
+        return []
+    
+    max_hours = MAX_CONTENT_AGE_HOURS.get(content_type, MAX_CONTENT_AGE_HOURS["default"])
+    cutoff = time.time() - max_hours * 3600
+    
+    # If we can't determine the time, include it (better to include than exclude)
+    recent = [c for c in candidates if c.published is None or c.published > cutoff]
+    filtered_count = len(candidates) - len(recent)
     
     if filtered_count > 0:
-        print(f"⏰ Time filtering: {len(feed_entries)} → {len(recent_entries)} entries (filtered out {filtered_count} entries older than {max_hours}h)")
+        print(f"⏰ Time filtering: {len(candidates)} → {len(recent)} entries (filtered out {filtered_count} entries older than {max_hours}h)")
     
-    return recent_entries
+    return recent
 
-def fetch_candidates(limit=15):
-    """Fetch and filter high-signal tech news candidates"""
+def collect_candidates(urls, content_type):
+    """Normalize, time-filter and link-dedupe the entries of several feeds, in feed order"""
     items, seen = [], set()
     
-    # Collect all items first
-    for url in FEEDS:
-        feed = custom_feedparser(url)
-        
-        # Apply time filtering to get only recent content
-        recent_entries = filter_by_recency(feed.entries, "technews")
-        
-        for it in recent_entries:
-            title = getattr(it, "title", None)
-            link = getattr(it, "link", None)
-            if not title or not link or link in seen:
+    # Read all feeds (local index or concurrent fetch), then collect items in feed order
+    for url, feed in read_feeds(urls):
+        for candidate in filter_by_recency(normalize_entries(feed.entries, url), content_type):
+            if candidate.canonical_link in seen:
                 continue
-            seen.add(link)
-            
-            # Add source info for better filtering
-            source = url.split("//")[1].split("/")[0] if "//" in url else "unknown"
-            items.append({
-                "title": title, 
-                "link": link, 
-                "source": source,
-                "score": 0  # Will be calculated below
-            })
+            seen.add(candidate.canonical_link)
+            items.append(candidate)
+    
+    return items
+
+# ---------- Near-Duplicate Clustering ----------
+TITLE_STOPWORDS = {
+    "a", "an", "the", "and", "or", "but", "of", "to", "in", "on", "for", "with", "at", "by",
+    "from", "as", "is", "are", "was", "were", "be", "its", "it", "this", "that", "new", "how",
+    "why", "what", "after", "over", "into", "says", "say", "will", "has", "have",
+}
+MINHASH_BANDS = 16
+MINHASH_ROWS = 2  # 32 hash functions; pairs above ~0.5 Jaccard collide in some band >99% of the time
+_MINHASH_PRIME = (1 << 61) - 1
+_minhash_rng = random.Random(1729)  # fixed seed so clustering is stable across runs
+MINHASH_PARAMS = [(_minhash_rng.randrange(1, _MINHASH_PRIME), _minhash_rng.randrange(0, _MINHASH_PRIME))
+                  for _ in range(MINHASH_BANDS * MINHASH_ROWS)]
+
+def title_shingles(title_lower):
+    """Significant words of a lowercased title"""
+    return frozenset(w for w in re.findall(r"\w+", title_lower) if len(w) > 1 and w not in TITLE_STOPWORDS)
+
+def minhash_signature(shingles):
+    """MinHash signature of a word set"""
+    hashes = [zlib.crc32(word.encode("utf-8")) for word in shingles]
+    return tuple(min((a * h + b) % _MINHASH_PRIME for h in hashes) for a, b in MINHASH_PARAMS)
+
+def cluster_near_duplicates(candidates):
+    """Collapse candidates that report the same story, keeping the best-scored one.
+    
+    MinHash LSH buckets titles by band so only likely pairs are compared, which keeps
+    this roughly linear; bucket pairs are confirmed with the exact Jaccard similarity.
+    Returns the kept candidates in their original order.
+    """
+    if len(candidates) < 2:
+        return list(candidates)
+    
+    shingles = [title_shingles(c.title_lower) for c in candidates]
+    parent = list(range(len(candidates)))
+    
+    def find(i):
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+    
+    buckets = {}
+    for i, words in enumerate(shingles):
+        if not words:
+            continue
+        signature = minhash_signature(words)
+        for band in range(MINHASH_BANDS):
+            key = (band, signature[band * MINHASH_ROWS:(band + 1) * MINHASH_ROWS])
+            bucket = buckets.setdefault(key, [])
+            merged = False
+            for j in bucket:
+                if find(i) == find(j):
+                    merged = True
+                    continue
+                overlap = len(words & shingles[j]) / len(words | shingles[j])
+                if overlap >= NEAR_DUPLICATE_THRESHOLD:
+                    parent[find(i)] = find(j)
+                    merged = True
+            # A bucket keeps one representative per cluster so it stays small
+            if not merged:
+                bucket.append(i)
+    
+    # Best member per cluster: highest score, earliest in feed order on ties
+    best = {}
+    for i, candidate in enumerate(candidates):
+        root = find(i)
+        if root not in best or candidate.score > candidates[best[root]].score:
+            best[root] = i
+    kept = sorted(best.values())
+    
+    if len(kept) < len(candidates):
+        print(f"🧩 Near-duplicate clustering: {len(candidates)} → {len(kept)} distinct stories")
+    return [candidates[i] for i in kept]
+
+def fetch_candidates(limit=15):
+    """Fetch and filter high-signal tech news candidates"""
+    items = collect_candidates(FEEDS, "technews")
     
     # Score and filter items for quality
     scored_items = []
     for item in items:
         score = calculate_content_score(item)
         if score > 0:  # Only include items with positive scores
-            item["score"] = score
+            item.score = score
             scored_items.append(item)
     
+    # Keep one candidate per story when several feeds cover it
+    scored_items = cluster_near_duplicates(scored_items)
+    
     # Sort by score (highest first) and return top items
-    scored_items.sort(key=lambda x: x["score"], reverse=True)
-    return scored_items[:limit]
+    scored_items.sort(key=lambda x: x.score, reverse=True)
+    return [item.to_dict() for item in scored_items[:limit]]
 
 def fetch_crypto_candidates(limit=15):
     """Fetch and filter high-signal crypto news candidates"""
-    items, seen = [], set()
-    
-    # Collect all items first
-    for url in CRYPTO_FEEDS:
-        feed = custom_feedparser(url)
-        
-        # Apply time filtering to get only recent content
-        recent_entries = filter_by_recency(feed.entries, "crypto")
-        
-        for it in recent_entries:
-            title = getattr(it, "title", None)
-            link = getattr(it, "link", None)
-            if not title or not link or link in seen:
-                continue
-            seen.add(link)
-            
-            # Add source info for better filtering
-            source = url.split("//")[1].split("/")[0] if "//" in url else "unknown"
-            items.append({
-                "title": title, 
-                "link": link, 
-                "source": source,
-                "score": 0  # Will be calculated below
-            })
+    items = collect_candidates(CRYPTO_FEEDS, "crypto")
     
     # Score and filter items for quality
     scored_items = []
     for item in items:
         score = calculate_crypto_content_score(item)
         if score > 0:  # Only include items with positive scores
-            item["score"] = score
+            item.score = score
             scored_items.append(item)
     
+    # Keep one candidate per story when several feeds cover it
+    scored_items = cluster_near_duplicates(scored_items)
+    
     # Sort by score (highest first) and return top items
-    scored_items.sort(key=lambda x: x["score"], reverse=True)
-    return scored_items[:limit]
+    scored_items.sort(key=lambda x: x.score, reverse=True)
+    return [item.to_dict() for item in scored_items[:limit]]
 
-def filter_used_articles(candidates, technews_memory):
-    """Filter out articles that have already been used"""
+def filter_used_articles(candidates, technews_memory, memory_file=None):
+    """Filter out articles that have already been used (long-horizon seen index when memory_file is given)"""
     if not candidates or not technews_memory:
         return candidates
     
@@ -247,7 +862,7 @@ def filter_used_articles(candidates, technews_memory):
     for candidate in candidates:
         # Extract article identifier
         article_id = extract_article_identifier("", candidate['link'])
-        if article_id and article_id not in used_articles:
+        if article_id and article_id not in used_articles and not (memory_file and has_been_used(memory_file, article_id)):
             filtered_candidates.append(candidate)
         else:
             print(f"🚫 Filtered out used article: {candidate['title'][:60]}...")
@@ -255,41 +870,122 @@ def filter_used_articles(candidates, technews_memory):
     print(f"🔍 Content filtering: {len(candidates)} → {len(filtered_candidates)} candidates after removing used articles")
     return filtered_candidates
 
+# ---------- Content Scoring ----------
+class KeywordRules:
+    """Weighted keyword rules compiled into one regex.
+    
+    A title is scanned once; every rule with at least one keyword hit adds its
+    weight once (same semantics as the old `any(word in title ...)` checks).
+    Keywords match at the start of a word and, like the substring checks, cover
+    inflections ("research" -> "researchers", "hack" -> "hackers"). Keywords in
+    `whole_words` only match as a word or its plural, so "ai" no longer matches
+    inside "said" and "sec" no longer inside "second".
+    """
+    
+    def __init__(self, rules, source_bonus=None, whole_words=()):
+        self.rules = [(tuple(keywords), weight) for keywords, weight in rules]
+        self.source_bonus = source_bonus or (lambda source: 0)
+        self.weights = [weight for _, weight in self.rules]
+        self.keyword_rules = {}
+        for index, (keywords, _) in enumerate(self.rules):
+            for keyword in keywords:
+                self.keyword_rules.setdefault(keyword, []).append(index)
+        self.keyword_ids = {keyword: n for n, keyword in enumerate(self.keyword_rules)}
+        self._keyword_matrix = None
+        
+        # Longest keywords first so phrases win over their prefixes; group 1 is a whole-word
+        # hit, group 2 a stem hit with its inflection
+        def alternation(keywords):
+            return "|".join(re.escape(k) for k in sorted(keywords, key=len, reverse=True)) or "(?!)"
+        whole = alternation(k for k in self.keyword_rules if k in whole_words)
+        stems = alternation(k for k in self.keyword_rules if k not in whole_words)
+        matcher = rf"\b(?:({whole})(?:e?s)?\b|({stems})\w*)"
+        self.pattern = re.compile(matcher)
+        # Same matcher plus title separators, for scanning a whole batch with findall()
+        self.batch_pattern = re.compile(rf"\n|{matcher}")
+    
+    @property
+    def keyword_matrix(self):
+        """(keywords x rules) 0/1 matrix for score_batch, built on first use (NumPy is imported lazily)"""
+        if self._keyword_matrix is None:
+            import numpy as np
+            matrix = np.zeros((len(self.keyword_ids), len(self.rules)), dtype=np.int64)
+            for keyword, indexes in self.keyword_rules.items():
+                matrix[self.keyword_ids[keyword], indexes] = 1
+            self._keyword_matrix = matrix
+        return self._keyword_matrix
+    
+    def matches(self, title):
+        """Indexes of the rules hit by a lowercased title"""
+        hit = set()
+        for match in self.pattern.finditer(title):
+            hit.update(self.keyword_rules[match.group(1) or match.group(2)])
+        return hit
+    
+    def score(self, title):
+        """Sum of the weights of every rule hit by a lowercased title"""
+        return sum(self.weights[index] for index in self.matches(title))
+
+def technews_source_bonus(source):
+    """Source quality bonus for tech news (source is a lowercased host)"""
+    if "ieee" in source or "mit" in source or "nature" in source or "science" in source:
+        return 20  # Academic/research sources
+    elif "arstechnica" in source or "techmeme" in source:
+        return 15  # High-quality tech analysis
+    elif "hnrss" in source:
+        return 10  # Hacker News (already filtered by points)
+    return 0
+
+def crypto_source_bonus(source):
+    """Source quality bonus for crypto news (source is a lowercased host)"""
+    if "coindesk" in source or "cointelegraph" in source:
+        return 20  # Primary crypto news sources
+    elif "decrypt" in source or "theblock" in source:
+        return 15  # High-quality crypto analysis
+    elif "messari" in source:
+        return 18  # Crypto research and analysis
+    return 0
+
+TECHNEWS_TITLE_RULES = KeywordRules([
+    # Title quality indicators
+    (["research", "study", "breakthrough", "discovery", "innovation"], 15),
+    (["ai", "artificial intelligence", "machine learning", "neural"], 10),
+    (["quantum", "blockchain", "crypto", "web3"], 8),
+    (["regulation", "policy", "law", "government"], 12),
+    (["security", "privacy", "cybersecurity"], 10),
+    (["climate", "energy", "sustainability"], 8),
+    # Penalize low-quality indicators
+    (["rumor", "leak", "gossip", "drama", "celeb"], -20),
+    (["update", "patch", "release", "announcement"], -5),  # Minor updates get lower scores
+    (["stock", "price", "market", "earnings"], -10),       # Financial news is often low-signal
+], source_bonus=technews_source_bonus, whole_words={"ai"})
+
+CRYPTO_TITLE_RULES = KeywordRules([
+    # Title quality indicators for crypto
+    (["regulation", "policy", "law", "government", "sec", "cfdc"], 15),  # Regulatory news is high-signal
+    (["adoption", "institutional", "enterprise", "partnership"], 12),     # Adoption news is important
+    (["defi", "nft", "dao", "web3", "metaverse"], 10),                    # Emerging crypto sectors
+    (["bitcoin", "ethereum", "blockchain", "cryptocurrency"], 8),         # Core crypto topics
+    (["security", "hack", "exploit", "audit"], 10),                       # Security is critical
+    (["research", "study", "analysis", "report"], 8),                     # Research content
+    # Penalize low-quality indicators
+    (["moon", "pump", "dump", "fomo", "hodl"], -25),                      # Meme/price speculation
+    (["celebrity", "influencer", "endorsement"], -20),                    # Celebrity crypto drama
+    (["price", "market", "trading", "chart"], -15),                       # Price speculation
+    (["rumor", "leak", "unconfirmed"], -20),                              # Unverified information
+], source_bonus=crypto_source_bonus, whole_words={"sec"})
+
 def calculate_content_score(item):
     """Calculate a quality score for content based on various factors"""
-    title = item["title"].lower()
+    title = item.get("title_lower") or item["title"].lower()
     source = item["source"].lower()
     score = 0
     
     # Source quality bonuses
-    if "ieee" in source or "mit" in source or "nature" in source or "science" in source:
-        score += 20  # Academic/research sources
-    elif "arstechnica" in source or "techmeme" in source:
-        score += 15  # High-quality tech analysis
-    elif "hnrss" in source:
-        score += 10  # Hacker News (already filtered by points)
-    
-    # Title quality indicators
-    if any(word in title for word in ["research", "study", "breakthrough", "discovery", "innovation"]):
-        score += 15
-    if any(word in title for word in ["ai", "artificial intelligence", "machine learning", "neural"]):
-        score += 10
-    if any(word in title for word in ["quantum", "blockchain", "crypto", "web3"]):
-        score += 8
-    if any(word in title for word in ["regulation", "policy", "law", "government"]):
-        score += 12
-    if any(word in title for word in ["security", "privacy", "cybersecurity"]):
-        score += 10
-    if any(word in title for word in ["climate", "energy", "sustainability"]):
-        score += 8
+    score += technews_source_bonus(source)
     
-    # Penalize low-quality indicators
-    if any(word in title for word in ["rumor", "leak", "gossip", "drama", "celeb"]):
-        score -= 20
-    if any(word in title for word in ["update", "patch", "release", "announcement"]):
-        score -= 5  # Minor updates get lower scores
-    if any(word in title for word in ["stock", "price", "market", "earnings"]):
-        score -= 10  # Financial news is often low-signal
+    # Title quality indicators and penalties, matched in one pass
+    score += TECHNEWS_TITLE_RULES.score(title)
     
     # Bonus for longer, more descriptive titles (indicates substance)
     if len(title) > 60:
@@ -299,41 +995,15 @@ def calculate_content_score(item):
 
 def calculate_crypto_content_score(item):
     """Calculate a quality score for crypto content based on various factors"""
-    title = item["title"].lower()
+    title = item.get("title_lower") or item["title"].lower()
     source = item["source"].lower()
     score = 0
     
     # Source quality bonuses
-    if "coindesk" in source or "cointelegraph" in source:
-        score += 20  # Primary crypto news sources
-    elif "decrypt" in source or "theblock" in source:
-        score += 15  # High-quality crypto analysis
-    elif "messari" in source:
-        score += 18  # Crypto research and analysis
-    
-    # Title quality indicators for crypto
-    if any(word in title for word in ["regulation", "policy", "law", "government", "sec", "cfdc"]):
-        score += 15  # Regulatory news is high-signal
-    if any(word in title for word in ["adoption", "institutional", "enterprise", "partnership"]):
-        score += 12  # Adoption news is important
-    if any(word in title for word in ["defi", "nft", "dao", "web3", "metaverse"]):
-        score += 10  # Emerging crypto sectors
-    if any(word in title for word in ["bitcoin", "ethereum", "blockchain", "cryptocurrency"]):
-        score += 8  # Core crypto topics
-    if any(word in title for word in ["security", "hack", "exploit", "audit"]):
-        score += 10  # Security is critical
-    if any(word in title for word in ["research", "study", "analysis", "report"]):
-        score += 8  # Research content
+    score += crypto_source_bonus(source)
     
-    # Penalize low-quality indicators
-    if any(word in title for word in ["moon", "pump", "dump", "fomo", "hodl"]):
-        score -= 25  # Meme/price speculation
-    if any(word in title for word in ["celebrity", "influencer", "endorsement"]):
-        score -= 20  # Celebrity crypto drama
-    if any(word in title for word in ["price", "market", "trading", "chart"]):
-        score -= 15  # Price speculation
-    if any(word in title for word in ["rumor", "leak", "unconfirmed"]):
-        score -= 20  # Unverified information
+    # Title quality indicators and penalties, matched in one pass
+    score += CRYPTO_TITLE_RULES.score(title)
     
     # Bonus for longer, more descriptive titles (indicates substance)
     if len(title) > 60:
@@ -341,41 +1011,88 @@ def calculate_crypto_content_score(item):
     
     return max(0, score)  # Don't return negative scores
 
+def score_batch(candidates, rules):
+    """Score many candidates at once; identical to the per-item scorers.
+    
+    `rules` is TECHNEWS_TITLE_RULES or CRYPTO_TITLE_RULES. The distinct titles are
+    scanned by the compiled regex in a single pass; hit counts are binned into a
+    (titles x keywords) matrix with np.bincount, mapped to rules and weighted, and
+    source and length bonuses are applied with NumPy.
+    Returns an int64 array aligned with `candidates`.
+    """
+    import numpy as np
+    
+    n = len(candidates)
+    if n == 0:
+        return np.zeros(0, dtype=np.int64)
+    
+    titles = [c.get("title_lower") or c["title"].lower() for c in candidates]
+    
+    # Each distinct title is scanned and scored once; `inverse` maps candidates back to it
+    distinct = {}
+    inverse = np.fromiter((distinct.setdefault(title, len(distinct)) for title in titles), dtype=np.int64, count=n)
+    
+    # One regex scan over the distinct titles joined by "\n"; each separator shows up as an
+    # empty hit, so a hit's row is the number of separators before it. Newlines inside a
+    # title become spaces (same word boundaries) so they can't be taken for separators
+    text = "\n".join(title.replace("\n", " ") for title in distinct)
+    keyword_ids = rules.keyword_ids
+    codes = np.fromiter((keyword_ids.get(whole or stem, -1) for whole, stem in rules.batch_pattern.findall(text)),
+                        dtype=np.int64)
+    separators = codes < 0
+    rows = np.cumsum(separators)[~separators]
+    codes = codes[~separators]
+    
+    # (title, keyword) hit counts from flat indices, then keywords -> rules -> weighted sum
+    k = len(keyword_ids)
+    hits = np.bincount(rows * k + codes, minlength=len(distinct) * k).reshape(len(distinct), k)
+    rule_hits = (hits > 0).astype(np.int64) @ rules.keyword_matrix > 0
+    scores = (rule_hits.astype(np.int64) @ np.asarray(rules.weights, dtype=np.int64))[inverse]
+    
+    # Source bonuses are computed once per distinct source
+    bonus_by_source = {}
+    for c in candidates:
+        source = c["source"]
+        if source not in bonus_by_source:
+            bonus_by_source[source] = rules.source_bonus(source.lower())
+    scores += np.fromiter((bonus_by_source[c["source"]] for c in candidates), dtype=np.int64, count=n)
+    
+    # Bonus for longer, more descriptive titles
+    lengths = np.fromiter(map(len, titles), dtype=np.int64, count=n)
+    scores += np.where(lengths > 60, 5, 0)
+    
+    return np.maximum(scores, 0)
+
 def fetch_reddit_posts(limit=20):
     """Fetch top Reddit posts from multiple subreddits"""
     posts, seen = [], set()
     
-    for url in REDDIT_FEEDS:
+    for url, feed in read_feeds(REDDIT_FEEDS):
         try:
-            feed = custom_feedparser(url)
-            
             # Check if feed has entries
             if not feed.entries:
                 print(f"[reddit] No entries found in {url}")
                 continue
             
             # Apply time filtering to get only recent content
-            recent_entries = filter_by_recency(feed.entries, "reddit")
+            recent = filter_by_recency(normalize_entries(feed.entries, url), "reddit")
                 
-            for entry in recent_entries:
-                title = getattr(entry, "title", None)
-                link = getattr(entry, "link", None)
+            for post in recent:
+                if post.canonical_link in seen:
+                    continue
                 
                 # Extract subreddit from URL
-                if link and "/r/" in link:
-                    subreddit = link.split("/r/")[1].split("/")[0]
+                if "/r/" in post.link:
+                    subreddit = post.link.split("/r/")[1].split("/")[0]
                 else:
                     subreddit = "unknown"
-                
-                if not title or not link or link in seen:
-                    continue
                     
-                seen.add(link)
+                seen.add(post.canonical_link)
                 posts.append({
-                    "title": title,
-                    "link": link,
+                    "title": post.title,
+                    "link": post.link,
                     "subreddit": subreddit,
-                    "score": getattr(entry, "score", 0)  # Reddit score if available
+                    "score": post.score  # RSS entries carry no Reddit score
                 })
                 
                 if len(posts) >= limit:
@@ -395,23 +1112,20 @@ def fetch_reddit_posts(limit=20):
         
         for url in fallback_feeds:
             try:
-                feed = custom_feedparser(url)
-                if feed.entries:
-                    for entry in feed.entries[:10]:  # Limit to 10 from fallback
-                        title = getattr(entry, "title", None)
-                        link = getattr(entry, "link", None)
+                feed = get_feed(url)
+                flush_feed_state()
+                for post in normalize_entries(feed.entries[:10], url):  # Limit to 10 from fallback
+                    if post.canonical_link not in seen:
+                        seen.add(post.canonical_link)
+                        posts.append({
+                            "title": post.title,
+                            "link": post.link,
+                            "subreddit": "reddit",
+                            "score": 0
+                        })
                         
-                        if title and link and link not in seen:
-                            seen.add(link)
-                            posts.append({
-                                "title": title,
-                                "link": link,
-                                "subreddit": "reddit",
-                                "score": 0
-                            })
-                            
-                            if len(posts) >= limit:
-                                break
+                        if len(posts) >= limit:
+                            break
                                 
             except Exception as e:
                 print(f"[reddit] Fallback error for {url}: {e}")
@@ -419,47 +1133,43 @@ def fetch_reddit_posts(limit=20):
     
     return posts
 
+def product_category(description):
+    """Guess a product category from its description"""
+    category = "productivity"  # default
+    if description:
+        desc_lower = description.lower()
+        if "ai" in desc_lower or "artificial intelligence" in desc_lower:
+            category = "ai"
+        elif "design" in desc_lower or "ui" in desc_lower or "ux" in desc_lower:
+            category = "design"
+        elif "developer" in desc_lower or "code" in desc_lower or "api" in desc_lower:
+            category = "developer-tools"
+    return category
+
 def fetch_producthunt_products(limit=20):
     """Fetch new products from ProductHunt RSS feeds"""
     products, seen = [], set()
     
-    for url in PRODUCTHUNT_FEEDS:
+    for url, feed in read_feeds(PRODUCTHUNT_FEEDS):
         try:
-            feed = custom_feedparser(url)
-            
             # Check if feed has entries
             if not feed.entries:
                 print(f"[producthunt] No entries found in {url}")
                 continue
             
             # Apply time filtering to get only recent content (48h for products)
-            recent_entries = filter_by_recency(feed.entries, "product")
-                
-            for entry in recent_entries:
-                title = getattr(entry, "title", None)
-                link = getattr(entry, "link", None)
-                description = getattr(entry, "description", "")
+            recent = filter_by_recency(normalize_entries(feed.entries, url), "product")
                 
-                # Extract category from description or default
-                category = "productivity"  # default
-                if description:
-                    desc_lower = description.lower()
-                    if "ai" in desc_lower or "artificial intelligence" in desc_lower:
-                        category = "ai"
-                    elif "design" in desc_lower or "ui" in desc_lower or "ux" in desc_lower:
-                        category = "design"
-                    elif "developer" in desc_lower or "code" in desc_lower or "api" in desc_lower:
-                        category = "developer-tools"
-                
-                if not title or not link or link in seen:
+            for product in recent:
+                if product.canonical_link in seen:
                     continue
                     
-                seen.add(link)
+                seen.add(product.canonical_link)
                 products.append({
-                    "name": title,
-                    "link": link,
-                    "description": description,
-                    "category": category
+                    "name": product.title,
+                    "link": product.link,
+                    "description": product.description,
+                    "category": product_category(product.description)
                 })
                 
                 if len(products) >= limit:
@@ -479,24 +1189,20 @@ def fetch_producthunt_products(limit=20):
         
         for url in fallback_feeds:
             try:
-                feed = custom_feedparser(url)
-                if feed.entries:
-                    for entry in feed.entries[:10]:  # Limit to 10 from fallback
-                        title = getattr(entry, "title", None)
-                        link = getattr(entry, "link", None)
-                        description = getattr(entry, "description", "")
+                feed = get_feed(url)
+                flush_feed_state()
+                for product in normalize_entries(feed.entries[:10], url):  # Limit to 10 from fallback
+                    if product.canonical_link not in seen:
+                        seen.add(product.canonical_link)
+                        products.append({
+                            "name": product.title,
+                            "link": product.link,
+                            "description": product.description,
+                            "category": "productivity"
+                        })
                         
-                        if title and link and link not in seen:
-                            seen.add(link)
-                            products.append({
-                                "name": title,
-                                "link": link,
-                                "description": description,
-                                "category": "productivity"
-                            })
-                            
-                            if len(products) >= limit:
-                                break
+                        if len(products) >= limit:
+                            break
                                 
             except Exception as e:
                 print(f"[producthunt] Fallback error for {url}: {e}")
@@ -507,7 +1213,7 @@ def fetch_producthunt_products(limit=20):
 def extract_image_url(page_url: str) -> str | None:
     """Get og/twitter image and convert to a fetchable JPG via proxy."""
     try:
-        r = requests.get(page_url, headers={"User-Agent": "Mozilla/5.0"}, timeout=10)
+        r = http_get(page_url, headers={"User-Agent": "Mozilla/5.0"})
         r.raise_for_status()
         soup = BeautifulSoup(r.text, "html.parser")
         for attr, val in [
@@ -527,96 +1233,507 @@ def extract_image_url(page_url: str) -> str | None:
     except Exception:
         return None
 
+# ---------- Locking ----------
+# Cron and manual runs may overlap: each account type is processed by one run at a time
+LOCK_DIR = "data/locks"
+RUN_LOCK_POLICY = os.getenv("RUN_LOCK_POLICY", "wait")           # "wait" for the other run, or "skip" the account
+RUN_LOCK_TIMEOUT = float(os.getenv("RUN_LOCK_TIMEOUT", "900"))    # seconds to wait before skipping anyway
+_held_run_locks = set()
+
+@contextmanager
+def file_lock(path, wait=True, timeout=None):
+    """Advisory exclusive lock (fcntl.flock) on `path`; yields whether it was acquired.
+    
+    The lock is released when the block exits or the process dies.
+    """
+    if fcntl is None:
+        yield True
+        return
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    with open(path, 'a') as f:
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            try:
+                fcntl.flock(f, fcntl.LOCK_EX | (0 if wait and deadline is None else fcntl.LOCK_NB))
+                break
+            except BlockingIOError:
+                if not wait or time.monotonic() >= deadline:
+                    yield False
+                    return
+                time.sleep(0.5)
+        try:
+            yield True
+        finally:
+            fcntl.flock(f, fcntl.LOCK_UN)
+
+@contextmanager
+def run_lock(account_type):
+    """Hold the run lock of an account type; yields False when the account should be skipped.
+    
+    Memory for the type is reloaded once the lock is held, so entries written by the run
+    that held it before are seen.
+    """
+    if account_type in _held_run_locks:  # already held by this process (re-entered)
+        yield True
+        return
+    wait = RUN_LOCK_POLICY != "skip"
+    with file_lock(os.path.join(LOCK_DIR, f"{account_type}.lock"), wait=wait, timeout=RUN_LOCK_TIMEOUT if wait else None) as acquired:
+        if not acquired:
+            yield False
+            return
+        refresh_account_memory(account_type)
+        _held_run_locks.add(account_type)
+        try:
+            yield True
+        finally:
+            _held_run_locks.discard(account_type)
+
 # ---------- Memory System ----------
-# Memory files to track used books, quotes, tech news, reddit posts, products, and crypto
+# All content memory lives in one SQLite store (WAL mode) with a timestamp per item.
+# The *_MEMORY_FILE names identify each memory type and are the legacy JSON files
+# imported into the store the first time it is created.
+MEMORY_DB_FILE = "data/memory.db"
 BOOKS_MEMORY_FILE = "data/books_memory.json"
 QUOTES_MEMORY_FILE = "data/quotes_memory.json"
 TECHNEWS_MEMORY_FILE = "data/technews_memory.json"
 REDDIT_MEMORY_FILE = "data/reddit_memory.json"
 PRODUCTS_MEMORY_FILE = "data/products_memory.json"
 CRYPTO_MEMORY_FILE = "data/crypto_memory.json"
-MAX_MEMORY = 25
+MAX_MEMORY = 25  # recent items returned by the load_*_memory() functions
+# How long a used item stays blocked, per content type (days); override with MEMORY_TTL_<TYPE>_DAYS
+MEMORY_TTL_DAYS = {
+    content_type: float(os.getenv(f"MEMORY_TTL_{content_type.upper()}_DAYS", default))
+    for content_type, default in [
+        ("books", "90"), ("quotes", "7"), ("technews", "14"),
+        ("reddit", "14"), ("products", "30"), ("crypto", "14"),
+    ]
+}
+# Long-horizon "seen" index per content type: scalable Bloom filters persisted under SEEN_INDEX_DIR
+SEEN_INDEX_DIR = "data/seen"
+SEEN_INDEX_CAPACITY = int(os.getenv("SEEN_INDEX_CAPACITY", "100000"))         # items per filter before it grows
+SEEN_INDEX_ERROR_RATE = float(os.getenv("SEEN_INDEX_ERROR_RATE", "0.001"))    # false-positive rate
+# Keep memory entries when posting fails (e.g. duplicate-content rejections) so the item isn't retried
+MEMORY_KEEP_FAILED_POSTS = os.getenv("MEMORY_KEEP_FAILED_POSTS", "1") == "1"
+
+# memory file -> (content type stored in the DB, key of the list in the memory dict)
+MEMORY_TYPES = {
+    BOOKS_MEMORY_FILE: ("books", "used_books"),
+    QUOTES_MEMORY_FILE: ("quotes", "used_quotes"),
+    TECHNEWS_MEMORY_FILE: ("technews", "used_articles"),
+    REDDIT_MEMORY_FILE: ("reddit", "used_posts"),
+    PRODUCTS_MEMORY_FILE: ("products", "used_products"),
+    CRYPTO_MEMORY_FILE: ("crypto", "used_articles"),
+}
 
-def load_books_memory():
-    """Load the memory of used books from file"""
+def open_memory_store():
+    """Open (and create if needed) the SQLite memory store"""
+    os.makedirs(os.path.dirname(MEMORY_DB_FILE), exist_ok=True)
+    is_new = not os.path.exists(MEMORY_DB_FILE)
+    conn = sqlite3.connect(MEMORY_DB_FILE, timeout=30)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.executescript("""
+        CREATE TABLE IF NOT EXISTS memory (
+            content_type TEXT NOT NULL,
+            item         TEXT NOT NULL,
+            added_at     REAL NOT NULL,
+            PRIMARY KEY (content_type, item)
+        );
+        CREATE INDEX IF NOT EXISTS memory_by_time ON memory (content_type, added_at);
+    """)
+    if is_new:
+        import_json_memory_files(conn)
+    return conn
+
+_memory_local = threading.local()
+_memory_generation = 0  # bumped when the store is deleted, so threads reopen it
+
+def memory_connection():
+    """This thread's connection to the memory store, opened (and schema-checked) once per thread"""
+    conn = getattr(_memory_local, "conn", None)
+    if conn is None or _memory_local.generation != _memory_generation:
+        if conn is not None:
+            conn.close()
+        conn = _memory_local.conn = open_memory_store()
+        _memory_local.generation = _memory_generation
+    return conn
+
+def reset_memory_connections():
+    """Close this thread's connection and make every other thread reopen the store"""
+    global _memory_generation
+    conn = getattr(_memory_local, "conn", None)
+    if conn is not None:
+        conn.close()
+        _memory_local.conn = None
+    _memory_generation += 1
+
+def import_json_memory_files(conn=None):
+    """Import the legacy data/*_memory.json files into the memory store"""
+    own_conn = conn is None
+    if own_conn:
+        conn = open_memory_store()
     try:
-        if os.path.exists(BOOKS_MEMORY_FILE):
-            with open(BOOKS_MEMORY_FILE, 'r') as f:
-                return json.load(f)
-        return {"used_books": []}
-    except Exception:
-        return {"used_books": []}
+        for filename, (content_type, key) in MEMORY_TYPES.items():
+            if not os.path.exists(filename):
+                continue
+            try:
+                with open(filename, 'r') as f:
+                    items = json.load(f).get(key, [])
+            except Exception as e:
+                print(f"⚠️  Warning: Could not import {filename}: {e}")
+                continue
+            
+            # Keep the file's order by giving older items earlier timestamps
+            base = os.path.getmtime(filename) - len(items)
+            with conn:
+                conn.executemany(
+                    "INSERT OR IGNORE INTO memory (content_type, item, added_at) VALUES (?, ?, ?)",
+                    [(content_type, item, base + n) for n, item in enumerate(items)])
+            print(f"📥 Imported {len(items)} items from {filename}")
+    finally:
+        if own_conn:
+            conn.close()
+
+def memory_cutoff(content_type, now=None):
+    """Timestamp before which items of a content type have expired"""
+    return (now or time.time()) - MEMORY_TTL_DAYS[content_type] * 86400
+
+def load_memory(filename):
+    """Load the most recent MAX_MEMORY live items of a memory type as {key: [items]}"""
+    content_type, key = MEMORY_TYPES[filename]
+    try:
+        conn = memory_connection()
+        rows = conn.execute(
+            "SELECT item FROM memory WHERE content_type = ? AND added_at >= ? ORDER BY added_at DESC LIMIT ?",
+            (content_type, memory_cutoff(content_type), MAX_MEMORY)).fetchall()
+        return {key: [row[0] for row in reversed(rows)]}
+    except Exception as e:
+        print(f"⚠️  Warning: Could not load memory from {MEMORY_DB_FILE}: {e}")
+        return {key: []}
+
+def load_books_memory():
+    """Load the memory of used books"""
+    return load_memory(BOOKS_MEMORY_FILE)
 
 def load_quotes_memory():
-    """Load the memory of used quotes from file"""
-    try:
-        if os.path.exists(QUOTES_MEMORY_FILE):
-            with open(QUOTES_MEMORY_FILE, 'r') as f:
-                return json.load(f)
-        return {"used_quotes": []}
-    except Exception:
-        return {"used_quotes": []}
+    """Load the memory of used quotes"""
+    return load_memory(QUOTES_MEMORY_FILE)
 
 def load_technews_memory():
-    """Load the memory of used tech news articles from file"""
-    try:
-        if os.path.exists(TECHNEWS_MEMORY_FILE):
-            with open(TECHNEWS_MEMORY_FILE, 'r') as f:
-                return json.load(f)
-        return {"used_articles": []}
-    except Exception:
-        return {"used_articles": []}
+    """Load the memory of used tech news articles"""
+    return load_memory(TECHNEWS_MEMORY_FILE)
 
 def load_reddit_memory():
-    """Load the memory of used reddit posts from file"""
-    try:
-        if os.path.exists(REDDIT_MEMORY_FILE):
-            with open(REDDIT_MEMORY_FILE, 'r') as f:
-                return json.load(f)
-        return {"used_posts": []}
-    except Exception:
-        return {"used_posts": []}
+    """Load the memory of used reddit posts"""
+    return load_memory(REDDIT_MEMORY_FILE)
 
 def load_products_memory():
-    """Load the memory of used products from file"""
-    try:
-        if os.path.exists(PRODUCTS_MEMORY_FILE):
-            with open(PRODUCTS_MEMORY_FILE, 'r') as f:
-                return json.load(f)
-        return {"used_products": []}
-    except Exception:
-        return {"used_products": []}
+    """Load the memory of used products"""
+    return load_memory(PRODUCTS_MEMORY_FILE)
 
 def load_crypto_memory():
-    """Load the memory of used crypto articles from file"""
+    """Load the memory of used crypto articles"""
+    return load_memory(CRYPTO_MEMORY_FILE)
+
+def is_in_memory(filename, item):
+    """Indexed membership check against the live (unexpired) items of a memory type"""
+    content_type, _ = MEMORY_TYPES[filename]
     try:
-        if os.path.exists(CRYPTO_MEMORY_FILE):
-            with open(CRYPTO_MEMORY_FILE, 'r') as f:
-                return json.load(f)
-        return {"used_articles": []}
+        conn = memory_connection()
+        row = conn.execute(
+            "SELECT 1 FROM memory WHERE content_type = ? AND item = ? AND added_at >= ?",
+            (content_type, item, memory_cutoff(content_type))).fetchone()
+        return row is not None
+    except Exception as e:
+        print(f"⚠️  Warning: Could not read memory from {MEMORY_DB_FILE}: {e}")
+        return False
+
+def memory_counts(filename):
+    """(live, expired) item counts of a memory type"""
+    content_type, _ = MEMORY_TYPES[filename]
+    try:
+        conn = memory_connection()
+        cutoff = memory_cutoff(content_type)
+        live = conn.execute(
+            "SELECT COUNT(*) FROM memory WHERE content_type = ? AND added_at >= ?",
+            (content_type, cutoff)).fetchone()[0]
+        expired = conn.execute(
+            "SELECT COUNT(*) FROM memory WHERE content_type = ? AND added_at < ?",
+            (content_type, cutoff)).fetchone()[0]
+        return live, expired
     except Exception:
-        return {"used_articles": []}
+        return 0, 0
+
+def describe_memory_counts(filename):
+    """Live/expired summary of a memory type for status output"""
+    content_type, _ = MEMORY_TYPES[filename]
+    live, expired = memory_counts(filename)
+    return f"live: {live}, expired: {expired}, TTL {MEMORY_TTL_DAYS[content_type]:g}d"
+
+def sweep_expired_memory(conn, content_types=None):
+    """Delete expired items (a range delete on the (content_type, added_at) index)"""
+    now = time.time()
+    removed = 0
+    for content_type in content_types or MEMORY_TTL_DAYS:
+        removed += conn.execute(
+            "DELETE FROM memory WHERE content_type = ? AND added_at < ?",
+            (content_type, memory_cutoff(content_type, now))).rowcount
+    return removed
 
 def save_memory(memory, filename):
-    """Save the memory to file"""
+    """Replace the stored items of a memory type with the list in `memory` (used for resets)"""
+    content_type, key = MEMORY_TYPES[filename]
     try:
-        with open(filename, 'w') as f:
-            json.dump(memory, f, indent=2)
+        conn = memory_connection()
+        now = time.time()
+        with conn:
+            conn.execute("DELETE FROM memory WHERE content_type = ?", (content_type,))
+            conn.executemany(
+                "INSERT OR IGNORE INTO memory (content_type, item, added_at) VALUES (?, ?, ?)",
+                [(content_type, item, now + n * 1e-6) for n, item in enumerate(memory.get(key, []))])
     except Exception as e:
-        print(f"⚠️  Warning: Could not save memory to {filename}: {e}")
-
-def add_to_memory(memory, item_type, item, filename):
-    """Add an item to memory and maintain max size"""
-    # Only add if not already in memory
-    if item not in memory[f"used_{item_type}"]:
-        memory[f"used_{item_type}"].append(item)
-        # Keep only the last MAX_MEMORY items
-        if len(memory[f"used_{item_type}"]) > MAX_MEMORY:
-            memory[f"used_{item_type}"] = memory[f"used_{item_type}"][-MAX_MEMORY:]
-        save_memory(memory, filename)
-        print(f"📝 Added '{item}' to {filename}")
-    else:
+        print(f"⚠️  Warning: Could not save memory to {MEMORY_DB_FILE}: {e}")
+
+class MemorySession:
+    """Buffers the memory additions of one account run and writes them in one transaction"""
+    
+    def __init__(self):
+        self.pending = []  # (memory dict, key, content_type, item, added_at)
+    
+    def add(self, memory, key, content_type, item):
+        self.pending.append((memory, key, content_type, item, time.time()))
+    
+    def commit(self):
+        """Write every buffered item atomically"""
+        if not self.pending:
+            return
+        try:
+            conn = memory_connection()
+            with conn:
+                # Re-using an item from older history moves it back into the recent window
+                conn.executemany("""
+                    INSERT INTO memory (content_type, item, added_at) VALUES (?, ?, ?)
+                    ON CONFLICT (content_type, item) DO UPDATE SET added_at = excluded.added_at
+                """, [(content_type, item, added_at) for _, _, content_type, item, added_at in self.pending])
+                # Expired rows of the touched types go in the same write transaction
+                swept = sweep_expired_memory(conn, {content_type for _, _, content_type, _, _ in self.pending})
+            print(f"💾 Saved {len(self.pending)} memory item(s)")
+            if swept:
+                print(f"🧹 Swept {swept} expired memory item(s)")
+            by_type = {}
+            for _, _, content_type, item, _ in self.pending:
+                by_type.setdefault(content_type, []).append(item)
+            for content_type, items in by_type.items():
+                mark_seen(content_type, items)
+        except Exception as e:
+            print(f"⚠️  Warning: Could not save memory to {MEMORY_DB_FILE}: {e}")
+        self.pending = []
+    
+    def rollback(self):
+        """Discard buffered items and take them back out of the in-process memory lists"""
+        for memory, key, _, item, _ in self.pending:
+            if item in memory[key]:
+                memory[key].remove(item)
+        if self.pending:
+            print(f"↩️  Discarded {len(self.pending)} memory item(s)")
+        self.pending = []
+    
+    def finish(self, posted):
+        """Commit or roll back according to the posting outcome"""
+        if posted or MEMORY_KEEP_FAILED_POSTS:
+            self.commit()
+        else:
+            self.rollback()
+
+def add_to_memory(memory, item_type, item, filename, session=None):
+    """Add an item to memory (stored with a timestamp, history is kept).
+    
+    With a MemorySession the write is buffered until session.commit().
+    """
+    key = f"used_{item_type}"
+    content_type, _ = MEMORY_TYPES[filename]
+    # Only add if not already in recent memory
+    if item in memory[key]:
         print(f"⚠️  '{item}' already in memory - skipping duplicate")
+        return
+    
+    if session is not None:
+        session.add(memory, key, content_type, item)
+    else:
+        scratch = MemorySession()
+        scratch.add(memory, key, content_type, item)
+        scratch.commit()
+    
+    # Keep the in-process view limited to the last MAX_MEMORY items
+    memory[key].append(item)
+    if len(memory[key]) > MAX_MEMORY:
+        memory[key] = memory[key][-MAX_MEMORY:]
+    print(f"📝 Added '{item}' to {content_type} memory")
+
+# Memory registry: each type is loaded on first access and shared for the rest of the process
+ACCOUNT_MEMORY = {
+    # account type -> (memory file, status line label, unit)
+    "books": (BOOKS_MEMORY_FILE, "📚 Books", "books"),
+    "quotes": (QUOTES_MEMORY_FILE, "💭 Quotes", "quotes"),
+    "technews": (TECHNEWS_MEMORY_FILE, "📰 TechNews", "articles"),
+    "reddit": (REDDIT_MEMORY_FILE, "🔴 Reddit", "posts"),
+    "product": (PRODUCTS_MEMORY_FILE, "🚀 Products", "products"),
+    "crypto": (CRYPTO_MEMORY_FILE, "₿ Crypto", "articles"),
+}
+_memory_registry = {}
+_memory_registry_lock = threading.Lock()
+
+def get_memory(filename):
+    """Memory of one type, loaded on first access and cached for the rest of the process"""
+    with _memory_registry_lock:
+        memory = _memory_registry.get(filename)
+        if memory is None:
+            memory = _memory_registry[filename] = load_memory(filename)
+        return memory
+
+def refresh_account_memory(account_type):
+    """Drop the cached memory and seen index of an account type so they are re-read"""
+    if account_type not in ACCOUNT_MEMORY:
+        return
+    filename = ACCOUNT_MEMORY[account_type][0]
+    content_type, _ = MEMORY_TYPES[filename]
+    with _memory_registry_lock:
+        _memory_registry.pop(filename, None)
+    with _seen_lock:
+        _seen_indexes.pop(content_type, None)
+
+def print_account_memory(account_type):
+    """One-line memory summary for an account type (loads only that type)"""
+    if account_type not in ACCOUNT_MEMORY:
+        return
+    filename, label, unit = ACCOUNT_MEMORY[account_type]
+    _, key = MEMORY_TYPES[filename]
+    print(f"{label} memory: {len(get_memory(filename)[key])} {unit} used in last {MAX_MEMORY} runs")
+
+# ---------- Seen Index ----------
+class BloomFilter:
+    """Fixed-size Bloom filter sized for `capacity` items at `error_rate` false positives"""
+    
+    def __init__(self, capacity, error_rate):
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.num_bits = max(8, int(-capacity * math.log(error_rate) / (math.log(2) ** 2)))
+        self.num_hashes = max(1, round(self.num_bits / capacity * math.log(2)))
+        self.bits = bytearray((self.num_bits + 7) // 8)
+        self.count = 0
+    
+    def _positions(self, item):
+        # Double hashing: k positions from one 128-bit digest
+        digest = hashlib.blake2b(item.encode("utf-8"), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        return [(h1 + i * h2) % self.num_bits for i in range(self.num_hashes)]
+    
+    def __contains__(self, item):
+        return all(self.bits[p >> 3] & (1 << (p & 7)) for p in self._positions(item))
+    
+    def add(self, item):
+        if item in self:
+            return False
+        for p in self._positions(item):
+            self.bits[p >> 3] |= 1 << (p & 7)
+        self.count += 1
+        return True
+
+class ScalableBloomFilter:
+    """Bloom filters chained with doubling capacity and tightening error rates, so the
+    overall false-positive rate stays near `error_rate` however many items are added"""
+    
+    def __init__(self, capacity=SEEN_INDEX_CAPACITY, error_rate=SEEN_INDEX_ERROR_RATE):
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.filters = []
+    
+    def __contains__(self, item):
+        return any(item in f for f in self.filters)
+    
+    def __len__(self):
+        return sum(f.count for f in self.filters)
+    
+    def add(self, item):
+        if item in self:
+            return False
+        if not self.filters or self.filters[-1].count >= self.filters[-1].capacity:
+            n = len(self.filters)
+            self.filters.append(BloomFilter(self.capacity * 2 ** n, self.error_rate * 0.5 ** (n + 1)))
+        return self.filters[-1].add(item)
+    
+    def size_bytes(self):
+        return sum(len(f.bits) for f in self.filters)
+
+_seen_indexes = {}
+_seen_lock = threading.Lock()
+
+def _seen_index_path(content_type):
+    return os.path.join(SEEN_INDEX_DIR, f"{content_type}.bloom")
+
+def _read_seen_index(content_type):
+    """Read a content type's seen index from disk, seeding it from the memory store if missing"""
+    try:
+        with open(_seen_index_path(content_type), 'rb') as f:
+            return pickle.load(f)
+    except FileNotFoundError:
+        pass
+    except Exception as e:
+        print(f"⚠️  Warning: Could not read seen index for {content_type}, rebuilding: {e}")
+    
+    index = ScalableBloomFilter()
+    try:
+        conn = memory_connection()
+        for (item,) in conn.execute("SELECT item FROM memory WHERE content_type = ?", (content_type,)):
+            index.add(item)
+    except Exception as e:
+        print(f"⚠️  Warning: Could not seed seen index for {content_type}: {e}")
+    return index
+
+def load_seen_index(content_type):
+    """Load a content type's seen index (cached for the process)"""
+    with _seen_lock:
+        index = _seen_indexes.get(content_type)
+        if index is None:
+            index = _seen_indexes[content_type] = _read_seen_index(content_type)
+        return index
+
+def mark_seen(content_type, items):
+    """Record identifiers in a content type's seen index and persist it"""
+    path = _seen_index_path(content_type)
+    try:
+        os.makedirs(SEEN_INDEX_DIR, exist_ok=True)
+        with file_lock(path + ".lock"), _seen_lock:
+            # Re-read under the lock so additions from other processes aren't overwritten
+            index = _seen_indexes[content_type] = _read_seen_index(content_type)
+            added = sum(1 for item in items if index.add(item))
+            if not added:
+                return
+            with open(path + ".tmp", 'wb') as f:
+                pickle.dump(index, f)
+            os.replace(path + ".tmp", path)
+    except Exception as e:
+        print(f"⚠️  Warning: Could not save seen index for {content_type}: {e}")
+
+def has_been_used(filename, item):
+    """Used check over the whole TTL horizon: a Bloom miss answers without touching the store,
+    a hit is confirmed against the live items (false positives and expired items pass)"""
+    content_type, _ = MEMORY_TYPES[filename]
+    if item not in load_seen_index(content_type):
+        return False
+    return is_in_memory(filename, item)
+
+def filter_seen_items(items, filename, identifier, label):
+    """Drop items whose identifier has been used before"""
+    fresh = []
+    for item in items:
+        item_id = identifier(item)
+        if item_id and has_been_used(filename, item_id):
+            continue
+        fresh.append(item)
+    if len(fresh) < len(items):
+        print(f"🔍 Content filtering: {len(items)} → {len(fresh)} {label} after removing previously used ones")
+    return fresh
 
 def extract_book_title(book_data):
     """Extract book title for memory tracking"""
@@ -675,7 +1792,7 @@ def shorten_url(long_url):
     """Shorten a URL using TinyURL service"""
     try:
         # Use TinyURL's API (free, no API key required)
-        response = requests.get(f"http://tinyurl.com/api-create.php?url={long_url}", timeout=10)
+        response = http_get(f"http://tinyurl.com/api-create.php?url={long_url}")
         if response.status_code == 200:
             short_url = response.text.strip()
             print(f"🔗 Shortened: {long_url[:50]}... → {short_url}")
@@ -696,12 +1813,16 @@ def shorten_multiple_urls(urls):
     return shortened
 
 def clear_memory_files():
-    """Clear all memory files to start fresh"""
+    """Clear the memory store (and any legacy memory files) to start fresh"""
     try:
-        for filename in [BOOKS_MEMORY_FILE, QUOTES_MEMORY_FILE, TECHNEWS_MEMORY_FILE, REDDIT_MEMORY_FILE, PRODUCTS_MEMORY_FILE, CRYPTO_MEMORY_FILE]:
+        reset_memory_connections()
+        seen_files = [_seen_index_path(content_type) for content_type, _ in MEMORY_TYPES.values()]
+        for filename in [MEMORY_DB_FILE, MEMORY_DB_FILE + "-wal", MEMORY_DB_FILE + "-shm"] + list(MEMORY_TYPES) + seen_files:
             if os.path.exists(filename):
                 os.remove(filename)
                 print(f"🗑️  Cleared {filename}")
+        _seen_indexes.clear()
+        _memory_registry.clear()
         print("✅ All memory files cleared. Next run will start fresh!")
     except Exception as e:
         print(f"❌ Error clearing memory files: {e}")
@@ -713,42 +1834,54 @@ def show_memory_status():
     
     # Books memory
     books_memory = load_books_memory()
-    print(f"📚 Books: {len(books_memory['used_books'])}/{MAX_MEMORY}")
+    print(f"📚 Books: {len(books_memory['used_books'])}/{MAX_MEMORY} ({describe_memory_counts(BOOKS_MEMORY_FILE)})")
     if books_memory['used_books']:
         print(f"   Recent: {', '.join(books_memory['used_books'][-3:])}")
     
     # Quotes memory
     quotes_memory = load_quotes_memory()
-    print(f"💭 Quotes: {len(quotes_memory['used_quotes'])}/{MAX_MEMORY}")
+    print(f"💭 Quotes: {len(quotes_memory['used_quotes'])}/{MAX_MEMORY} ({describe_memory_counts(QUOTES_MEMORY_FILE)})")
     if quotes_memory['used_quotes']:
         print(f"   Recent: {', '.join(quotes_memory['used_quotes'][-3:])}")
     
     # TechNews memory
     technews_memory = load_technews_memory()
-    print(f"📰 TechNews: {len(technews_memory['used_articles'])}/{MAX_MEMORY}")
+    print(f"📰 TechNews: {len(technews_memory['used_articles'])}/{MAX_MEMORY} ({describe_memory_counts(TECHNEWS_MEMORY_FILE)})")
     if technews_memory['used_articles']:
         print(f"   Recent: {', '.join(technews_memory['used_articles'][-3:])}")
     
     # Reddit memory
     reddit_memory = load_reddit_memory()
-    print(f"🔴 Reddit: {len(reddit_memory['used_posts'])}/{MAX_MEMORY}")
+    print(f"🔴 Reddit: {len(reddit_memory['used_posts'])}/{MAX_MEMORY} ({describe_memory_counts(REDDIT_MEMORY_FILE)})")
     if reddit_memory['used_posts']:
         print(f"   Recent: {', '.join(reddit_memory['used_posts'][-3:])}")
     
     # Products memory
     products_memory = load_products_memory()
-    print(f"🚀 Products: {len(products_memory['used_products'])}/{MAX_MEMORY}")
+    print(f"🚀 Products: {len(products_memory['used_products'])}/{MAX_MEMORY} ({describe_memory_counts(PRODUCTS_MEMORY_FILE)})")
     if products_memory['used_products']:
         print(f"   Recent: {', '.join(products_memory['used_products'][-3:])}")
     
     # Crypto memory
     crypto_memory = load_crypto_memory()
-    print(f"₿ Crypto: {len(crypto_memory['used_articles'])}/{MAX_MEMORY}")
+    print(f"₿ Crypto: {len(crypto_memory['used_articles'])}/{MAX_MEMORY} ({describe_memory_counts(CRYPTO_MEMORY_FILE)})")
     if crypto_memory['used_articles']:
         print(f"   Recent: {', '.join(crypto_memory['used_articles'][-3:])}")
     
     print("=" * 50)
     
+    # Pre-generated threads
+    counts = backlog_counts()
+    print(f"📦 Backlog: {counts.get('books', 0)} book thread(s), {counts.get('quotes', 0)} quote thread(s) queued")
+    
+    # Long-horizon seen indexes
+    print("\n🧠 Seen Index (long-horizon dedupe):")
+    print("=" * 30)
+    for content_type in ["technews", "crypto", "reddit", "products"]:
+        index = load_seen_index(content_type)
+        print(f"   {content_type.capitalize()}: {len(index)} identifiers ({index.size_bytes() // 1024} KB)")
+    print("=" * 30)
+    
     # Show time filtering configuration
     print("\n⏰ Time Filtering Configuration:")
     print("=" * 30)
@@ -757,24 +1890,151 @@ def show_memory_status():
             print(f"   {content_type.capitalize()}: {hours}h max age")
     print("=" * 30)
 
+# ---------- Tweet Composer ----------
+# Tweets are measured the way Twitter counts them (twitter-text v3): every URL counts 23 (t.co),
+# an emoji sequence counts 2, characters in the Latin/punctuation ranges count 1 and all others 2
+TWEET_MAX_LENGTH = 280
+TWEET_URL_LENGTH = 23
+TWEET_URL_PATTERN = re.compile(r"https?://\S+|\b(?:www\.)?[a-z0-9-]+(?:\.[a-z0-9-]+)*\.(?:com|org|net|io|ly|co|ai|dev|app|gg|me)(?:/\S*)?", re.IGNORECASE)
+TWEET_EMOJI_PATTERN = re.compile(
+    "(?:[\U0001F000-\U0001FAFF\u2300-\u23FF\u2600-\u27BF\u2B00-\u2BFF]|[0-9#*]\uFE0F?\u20E3)"
+    "[\uFE0F\U0001F3FB-\U0001F3FF]*"
+    "(?:\u200D[\U0001F000-\U0001FAFF\u2300-\u23FF\u2600-\u27BF\u2B00-\u2BFF][\uFE0F\U0001F3FB-\U0001F3FF]*)*")
+TWEET_LIGHT_RANGES = ((0, 4351), (8192, 8205), (8208, 8223), (8242, 8247))
+
+def _text_weight(text):
+    weight = 2 * len(TWEET_EMOJI_PATTERN.findall(text))
+    for char in TWEET_EMOJI_PATTERN.sub("", text):
+        code = ord(char)
+        weight += 1 if any(low <= code <= high for low, high in TWEET_LIGHT_RANGES) else 2
+    return weight
+
+def tweet_length(text):
+    """Twitter-weighted length of a tweet"""
+    text = unicodedata.normalize("NFC", text or "")
+    urls = TWEET_URL_PATTERN.findall(text)
+    return len(urls) * TWEET_URL_LENGTH + _text_weight(TWEET_URL_PATTERN.sub("", text))
+
+def _is_protected_word(word):
+    # Links, list markers ("2.") and the "Learn more:" call to action are never trimmed
+    return bool(TWEET_URL_PATTERN.fullmatch(word) or re.fullmatch(r"\d+\.", word) or word in ("Learn", "more:"))
+
+def fit_tweet(text, limit=TWEET_MAX_LENGTH):
+    """Deterministically trim a tweet's descriptions until it fits, keeping every link.
+    
+    Words are dropped from the end of the longest unprotected run first and each shortened
+    run ends with "…". Returns None when the links and markers alone don't fit, or when
+    they would be all that is left.
+    """
+    text = re.sub(r"[ \t]+", " ", (text or "").strip())
+    if tweet_length(text) <= limit:
+        return text
+    
+    # Runs of trimmable words between protected words (links, markers)
+    parts = re.split(r"(\s+)", text)
+    runs, current = [], None
+    for n, part in enumerate(parts):
+        if part.strip() and not _is_protected_word(part):
+            if current is None:
+                current = []
+                runs.append(current)
+            current.append(n)
+        elif part.strip():
+            current = None
+    
+    # The order words are dropped in only depends on the run weights: repeatedly the last word
+    # of the heaviest run (the later run on ties). It is worked out once with running weights
+    left = [list(run) for run in runs]
+    weights = [sum(_text_weight(parts[n]) for n in run) for run in runs]
+    order = []
+    while any(left):
+        r = max((i for i in reversed(range(len(left))) if left[i]), key=lambda i: weights[i])
+        n = left[r].pop()
+        weights[r] -= _text_weight(parts[n])
+        order.append((r, n))
+    
+    def render(drops):
+        out = list(parts)
+        for _, n in order[:drops]:
+            out[n] = None
+        for r in {r for r, _ in order[:drops]}:
+            kept = [n for n in runs[r] if out[n] is not None]
+            if kept:
+                out[kept[-1]] = out[kept[-1]].rstrip(".,;:!?—-") + "…"
+        # Drop emptied words with their trailing whitespace
+        text = "".join(part for part in out if part is not None)
+        return re.sub(r"\s+([.,;:!?])", r"\1", re.sub(r"[ \t]{2,}", " ", text)).strip()
+    
+    # Every drop shortens the tweet, so the fewest drops that fit can be binary-searched;
+    # dropping every word (nothing but links and markers left) doesn't count as fitting
+    low, high = 0, len(order)
+    while low < high:
+        mid = (low + high) // 2
+        if tweet_length(render(mid)) <= limit:
+            high = mid
+        else:
+            low = mid + 1
+    if low == len(order):
+        return None
+    return render(low)
+
+def rewrite_tweet(tweet, limit=TWEET_MAX_LENGTH):
+    """Second LLM pass: ask for a shorter version of a tweet that trimming couldn't fit"""
+    system = f"""Return ONLY valid JSON exactly as:
+{{"tweet":"..."}}
+
+Rewrite the tweet below so it is at most {limit - 10} characters. Every URL counts as 23 characters
+and each emoji as 2. Keep every URL exactly as written and keep the list numbering."""
+    def parse(raw):
+        # Only a rewrite that fits and keeps every link is usable (and cached)
+        rewritten = json.loads(raw or "{}").get("tweet", "")
+        fitted = fit_tweet(rewritten, limit) if rewritten else None
+        if fitted is None or any(url not in fitted for url in TWEET_URL_PATTERN.findall(tweet)):
+            return None
+        return rewritten
+    
+    try:
+        return complete_chat(
+            messages=[{"role": "system", "content": system},
+                      {"role": "user", "content": tweet}],
+            temperature=0.2,
+            response_format={"type": "json_object"},
+            parse=parse,
+        ) or ""
+    except Exception as e:
+        print(f"❌ Error rewriting tweet: {e}")
+        return ""
+
+def compose_tweet(tweet, limit=TWEET_MAX_LENGTH):
+    """A tweet that fits Twitter's limit: trimmed locally, rewritten by the LLM only if trimming fails"""
+    length = tweet_length(tweet)
+    fitted = fit_tweet(tweet, limit)
+    if fitted is None:
+        print(f"✂️  Tweet can't be trimmed to {limit} ({length}); asking for a shorter rewrite")
+        rewritten = rewrite_tweet(tweet, limit)
+        fitted = fit_tweet(rewritten, limit) if rewritten else None
+        if fitted is not None and any(url not in fitted for url in TWEET_URL_PATTERN.findall(tweet)):
+            fitted = None  # the rewrite lost a link
+    elif fitted != tweet.strip() and length > limit:
+        print(f"✂️  Trimmed tweet from {length} to {tweet_length(fitted)} characters")
+    if fitted is None:
+        print(f"❌ Could not fit the tweet in {limit} characters")
+    return fitted
+
 # ---------- Twitter Integration ----------
 def post_to_twitter(tweet_text, account_name):
     """Post single tweet directly to Twitter"""
+    if tweet_length(tweet_text) > TWEET_MAX_LENGTH:
+        print(f"❌ Tweet is {tweet_length(tweet_text)}/{TWEET_MAX_LENGTH} characters; not posting to {account_name}")
+        return False
     try:
-        # Find the account credentials
-        account = next((acc for acc in accounts_data if acc["name"] == account_name), None)
-        if not account:
+        # Reuse the account's long-lived client (and its open connections)
+        from utils.twitter_clients import get_twitter_client
+        client = get_twitter_client(account_name)
+        if client is None:
             print(f"❌ No Twitter credentials found for {account_name}")
             return False
         
-        # Authenticate with Twitter
-        client = tweepy.Client(
-            consumer_key=account["consumer_key"],
-            consumer_secret=account["consumer_secret"],
-            access_token=account["access_token"],
-            access_token_secret=account["access_token_secret"]
-        )
-        
         # Post the tweet
         response = client.create_tweet(text=tweet_text)
         
@@ -789,20 +2049,13 @@ def post_to_twitter(tweet_text, account_name):
 def post_tweet_thread(tweets, account_name):
     """Post a series of tweets as a thread with rate limiting protection"""
     try:
-        # Find the account credentials
-        account = next((acc for acc in accounts_data if acc["name"] == account_name), None)
-        if not account:
+        # Reuse the account's long-lived client (and its open connections)
+        from utils.twitter_clients import get_twitter_client
+        client = get_twitter_client(account_name)
+        if client is None:
             print(f"❌ No Twitter credentials found for {account_name}")
             return False
         
-        # Authenticate with Twitter
-        client = tweepy.Client(
-            consumer_key=account["consumer_key"],
-            consumer_secret=account["consumer_secret"],
-            access_token=account["access_token"],
-            access_token_secret=account["access_token_secret"]
-        )
-        
         # Post the first tweet
         print(f"🐦 Posting Tweet 1/{len(tweets)}...")
         response = client.create_tweet(text=tweets[0])
@@ -857,109 +2110,565 @@ def post_tweet_thread(tweets, account_name):
         print(f"❌ Error posting tweet thread to Twitter {account_name}: {e}")
         return False
 
-# ---------- OpenAI Writers ----------
-def write_technews(candidates: list[dict]) -> dict:
-    """Generate high-signal, meaningful tech news content"""
-    cjson = json.dumps(candidates[:8])  # keep prompt small
-    
-    # Import the enhanced prompt from prompts.py
-    from utils.prompts import TECHNEWS_SYSTEM_PROMPT
-    
-    user = f"""Candidates (JSON array) - These have been pre-scored for quality:
-{cjson}
-
-IMPORTANT: These candidates have been pre-filtered for high-signal content. 
-Choose the story that has the GREATEST REAL-WORLD IMPACT and EDUCATIONAL VALUE.
+# ---------- LLM Ledger ----------
+# Every LLM call (including cache hits and failures) is appended to a JSONL ledger with its account
+# type, tokens, wall latency, retries and estimated cost; `python main.py stats` summarizes it
+LLM_LEDGER_FILE = "data/llm_ledger.jsonl"
+# USD per 1M tokens: (input, cached input, output); model names match by longest prefix
+LLM_PRICES = {
+    "gpt-4o-mini": (0.15, 0.075, 0.60),
+    "gpt-4o": (2.50, 1.25, 10.00),
+    "gpt-4.1-nano": (0.10, 0.025, 0.40),
+    "gpt-4.1-mini": (0.40, 0.10, 1.60),
+    "gpt-4.1": (2.00, 0.50, 8.00),
+}
+_llm_context = threading.local()
+_llm_ledger_lock = threading.Lock()
+
+@contextmanager
+def llm_account(account_type):
+    """Attribute the LLM calls made in this thread to an account type"""
+    previous = getattr(_llm_context, "account", None)
+    _llm_context.account = account_type
+    try:
+        yield
+    finally:
+        _llm_context.account = previous
+
+def estimate_llm_cost(model, prompt_tokens, cached_tokens, completion_tokens):
+    """Estimated USD cost of a call (0 for models missing from LLM_PRICES)"""
+    matches = [name for name in LLM_PRICES if (model or "").startswith(name)]
+    if not matches:
+        return 0.0
+    price_in, price_cached, price_out = LLM_PRICES[max(matches, key=len)]
+    return ((prompt_tokens - cached_tokens) * price_in + cached_tokens * price_cached
+            + completion_tokens * price_out) / 1_000_000
+
+def record_llm_call(model, status, latency, answered_by=None, usage=None, attempts=1, hedged=False, error=None,
+                    account=None):
+    """Append one call to the ledger"""
+    details = getattr(usage, "prompt_tokens_details", None)
+    prompt = getattr(usage, "prompt_tokens", 0) or 0
+    cached = (getattr(details, "cached_tokens", 0) or 0) if details is not None else 0
+    completion = getattr(usage, "completion_tokens", 0) or 0
+    entry = {
+        "ts": round(time.time(), 3),
+        "account": account or getattr(_llm_context, "account", None) or "other",
+        "model": model,
+        "answered_by": answered_by,
+        "status": status,  # "ok", "cache", "error", or "hedge" for a losing request that was still billed
+        "prompt_tokens": prompt,
+        "cached_tokens": cached,
+        "completion_tokens": completion,
+        "latency": round(latency, 3),
+        "retries": max(0, attempts - 1),
+        "hedged": hedged,
+        "cost": round(estimate_llm_cost(answered_by or model, prompt, cached, completion), 6),
+    }
+    if error is not None:
+        entry["error"] = str(error)[:200]
+    try:
+        os.makedirs(os.path.dirname(LLM_LEDGER_FILE), exist_ok=True)
+        with _llm_ledger_lock, open(LLM_LEDGER_FILE, 'a') as f:
+            f.write(json.dumps(entry) + "\n")
+    except Exception as e:
+        print(f"⚠️  Warning: Could not write LLM ledger: {e}")
 
-Focus on:
-- Breakthrough technologies that change how we work/live
-- Major industry transformations
-- Scientific advances with practical applications
-- Policy changes that affect tech development
-- Economic shifts that alter the tech landscape
+def _percentile(values, pct):
+    # Nearest-rank percentile of a sorted list
+    return values[max(0, math.ceil(pct / 100 * len(values)) - 1)] if values else 0.0
 
-Return ONLY the JSON object specified above."""
+def show_llm_stats(window="7d"):
+    """Summarize the ledger per account type over a window such as 24h or 7d"""
+    try:
+        unit = window[-1].lower() if window[-1].isalpha() else "d"
+        hours = float(window.rstrip("hHdD")) * (24 if unit == "d" else 1)
+    except (ValueError, IndexError):
+        print(f"❌ Invalid window '{window}' (use e.g. 24h or 7d)")
+        return
     
-    resp = client.chat.completions.create(
-        model=OPENAI_MODEL,
-        response_format={"type": "json_object"},
-        messages=[{"role":"system","content":TECHNEWS_SYSTEM_PROMPT},
+    since = time.time() - hours * 3600
+    entries = []
+    try:
+        with open(LLM_LEDGER_FILE, 'r') as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    continue  # partially written line
+                if entry.get("ts", 0) >= since:
+                    entries.append(entry)
+    except FileNotFoundError:
+        pass
+    
+    print(f"\n📈 LLM Stats (last {window}):")
+    print("=" * 86)
+    if not entries:
+        print("   No LLM calls recorded in this window")
+        print("=" * 86)
+        return
+    
+    print(f"   {'Account':<10} {'Calls':>6} {'Cache':>6} {'Errors':>6} {'Retries':>7} {'p50 s':>7} {'p95 s':>7} "
+          f"{'Prompt':>8} {'Cached':>8} {'Output':>7} {'Spend $':>9}")
+    by_account = {}
+    for entry in entries:
+        by_account.setdefault(entry.get("account", "other"), []).append(entry)
+    for account, rows in sorted(by_account.items()) + [("TOTAL", entries)]:
+        latencies = sorted(row["latency"] for row in rows if row.get("status") == "ok")
+        calls = sum(row.get("status") != "hedge" for row in rows)
+        print(f"   {account:<10} {calls:>6} "
+              f"{sum(row.get('status') == 'cache' for row in rows):>6} "
+              f"{sum(row.get('status') == 'error' for row in rows):>6} "
+              f"{sum(row.get('retries', 0) for row in rows):>7} "
+              f"{_percentile(latencies, 50):>7.2f} {_percentile(latencies, 95):>7.2f} "
+              f"{sum(row.get('prompt_tokens', 0) for row in rows):>8} "
+              f"{sum(row.get('cached_tokens', 0) for row in rows):>8} "
+              f"{sum(row.get('completion_tokens', 0) for row in rows):>7} "
+              f"{sum(row.get('cost', 0) for row in rows):>9.4f}")
+    print("=" * 86)
+    print("   Latency is wall time per call including retries; tokens and spend include losing hedge requests")
+
+# ---------- LLM Requests ----------
+# Every completion runs under a deadline with jittered exponential-backoff retries. With hedging on,
+# a call still unanswered at the p90 latency of recent calls gets a second request (optionally to a
+# cheaper model) and whichever answers first wins, which bounds the tail latency of each post.
+LLM_DEADLINE_SECONDS = float(os.getenv("LLM_DEADLINE_SECONDS", "90"))
+LLM_RETRIES = int(os.getenv("LLM_RETRIES", "2"))
+LLM_BACKOFF_SECONDS = float(os.getenv("LLM_BACKOFF_SECONDS", "1.0"))
+LLM_HEDGE = os.getenv("LLM_HEDGE", "1") == "1"
+LLM_HEDGE_MODEL = os.getenv("LLM_HEDGE_MODEL", "")                       # empty: hedge with the same model
+LLM_HEDGE_DEFAULT_SECONDS = float(os.getenv("LLM_HEDGE_DEFAULT_SECONDS", "15"))  # until enough latencies are known
+LLM_LATENCY_FILE = "data/llm_latency.json"
+LLM_LATENCY_SAMPLES = 100
+_llm_latencies = None
+_llm_latency_lock = threading.Lock()
+_llm_pool = ThreadPoolExecutor(max_workers=8, thread_name_prefix="llm")
+
+def llm_latencies():
+    """Recent request latencies in seconds, including losing hedges and deadline timeouts (persisted across runs)"""
+    global _llm_latencies
+    with _llm_latency_lock:
+        if _llm_latencies is None:
+            try:
+                with open(LLM_LATENCY_FILE, 'r') as f:
+                    _llm_latencies = [float(x) for x in json.load(f)][-LLM_LATENCY_SAMPLES:]
+            except Exception:
+                _llm_latencies = []
+        return list(_llm_latencies)
+
+def record_llm_latency(seconds):
+    """Remember the latency of one request"""
+    llm_latencies()
+    with _llm_latency_lock:
+        _llm_latencies.append(round(seconds, 3))
+        del _llm_latencies[:-LLM_LATENCY_SAMPLES]
+        try:
+            os.makedirs(os.path.dirname(LLM_LATENCY_FILE), exist_ok=True)
+            with open(LLM_LATENCY_FILE, 'w') as f:
+                json.dump(_llm_latencies, f)
+        except Exception as e:
+            print(f"⚠️  Warning: Could not save LLM latencies: {e}")
+
+def hedge_delay():
+    """Seconds to wait before hedging: p90 of recent latencies"""
+    samples = sorted(llm_latencies())
+    if len(samples) < 10:
+        return LLM_HEDGE_DEFAULT_SECONDS
+    return samples[min(len(samples) - 1, int(len(samples) * 0.9))]
+
+def is_retryable(error):
+    """Connection problems, timeouts, rate limits and server errors are worth retrying"""
+    return isinstance(error, (APIConnectionError, RateLimitError, InternalServerError, TimeoutError))
+
+def request_completion(model, messages, temperature, response_format, timeout):
+    """One chat completion request; returns (content, model, usage, latency)"""
+    start = time.monotonic()
+    kwargs = {"response_format": response_format} if response_format else {}
+    resp = client.chat.completions.create(
+        model=model, messages=messages, temperature=temperature, timeout=max(1.0, timeout), **kwargs)
+    return resp.choices[0].message.content or "", model, getattr(resp, "usage", None), time.monotonic() - start
+
+def log_usage(usage):
+    """Print token usage of a completion, including prompt tokens served from the provider's prefix cache"""
+    if usage is None:
+        return
+    details = getattr(usage, "prompt_tokens_details", None)
+    cached = (getattr(details, "cached_tokens", 0) or 0) if details is not None else 0
+    prompt = getattr(usage, "prompt_tokens", 0) or 0
+    share = f" ({cached / prompt:.0%})" if prompt else ""
+    print(f"🧮 Tokens: {prompt} prompt, {cached} cached{share}, {getattr(usage, 'completion_tokens', 0) or 0} completion")
+
+def hedged_completion(messages, temperature, response_format=None, model=None):
+    """Chat completion under LLM_DEADLINE_SECONDS with retries and optional hedging.
+    
+    Returns (content, model that answered, usage).
+    """
+    model = model or OPENAI_MODEL
+    start = time.monotonic()
+    deadline = start + LLM_DEADLINE_SECONDS
+    last_error = None
+    attempts = 0
+    hedged = False
+    submitted = {}  # future -> start time
+    timed_out = set()
+    account = getattr(_llm_context, "account", None)
+    
+    def bill_losers(winner=None):
+        # Requests that lost the race (or outlived the deadline) still use tokens once they finish;
+        # losers also count as latency samples so the hedge delay isn't learned from winners only
+        def record(future):
+            if not future.cancelled() and future.exception() is None:
+                _, answered_by, usage, latency = future.result()
+                if future not in timed_out:
+                    record_llm_latency(latency)
+                record_llm_call(model, "hedge", latency, answered_by, usage, account=account)
+        for future in submitted:
+            if future is not winner:
+                future.add_done_callback(record)
+    
+    for attempt in range(LLM_RETRIES + 1):
+        attempts = attempt + 1
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            break
+        futures = {_llm_pool.submit(request_completion, model, messages, temperature, response_format, remaining)}
+        submitted.update(dict.fromkeys(futures, time.monotonic()))
+        delay = hedge_delay()
+        
+        if LLM_HEDGE and delay < remaining:
+            done, _ = wait(futures, timeout=delay)
+            if not done:
+                hedge_model = LLM_HEDGE_MODEL or model
+                print(f"🪁 No LLM answer after {delay:.1f}s, hedging with {hedge_model}")
+                hedged = True
+                hedge = _llm_pool.submit(request_completion, hedge_model, messages, temperature,
+                                         response_format, deadline - time.monotonic())
+                futures.add(hedge)
+                submitted[hedge] = time.monotonic()
+        
+        # First successful answer wins; the slower request is left to finish in the background
+        pending = futures
+        while pending:
+            done, pending = wait(pending, timeout=max(0, deadline - time.monotonic()), return_when=FIRST_COMPLETED)
+            if not done:
+                break
+            for future in done:
+                if future.exception() is None:
+                    content, answered_by, usage, latency = future.result()
+                    record_llm_latency(latency)
+                    record_llm_call(model, "ok", time.monotonic() - start, answered_by, usage, attempts, hedged)
+                    bill_losers(future)
+                    return content, answered_by, usage
+                last_error = future.exception()
+        
+        if pending:
+            # Requests cut off by the deadline are sampled at the time they had run by then
+            for future in pending:
+                record_llm_latency(time.monotonic() - submitted[future])
+                timed_out.add(future)
+            last_error = TimeoutError(f"LLM call exceeded its {LLM_DEADLINE_SECONDS:g}s deadline")
+            break
+        if not is_retryable(last_error) or attempt == LLM_RETRIES:
+            break
+        backoff = min(random.uniform(0, LLM_BACKOFF_SECONDS * 2 ** attempt), max(0, deadline - time.monotonic()))
+        print(f"🔁 LLM call failed ({last_error}); retrying in {backoff:.1f}s")
+        time.sleep(backoff)
+    
+    error = last_error or TimeoutError(f"LLM call exceeded its {LLM_DEADLINE_SECONDS:g}s deadline")
+    record_llm_call(model, "error", time.monotonic() - start, attempts=attempts, hedged=hedged, error=error)
+    bill_losers()
+    raise error
+
+# ---------- LLM Response Cache ----------
+# Completions are cached by a hash of (model, messages, temperature, response_format), so retried
+# runs and development loops reuse them; runs with fresh candidates produce new prompts and miss
+LLM_CACHE_FILE = "data/llm_cache.db"
+LLM_CACHE_TTL_HOURS = float(os.getenv("LLM_CACHE_TTL_HOURS", "24"))
+LLM_CACHE_MAX_ENTRIES = int(os.getenv("LLM_CACHE_MAX_ENTRIES", "500"))   # least recently used are evicted
+LLM_CACHE_BYPASS = os.getenv("LLM_CACHE_BYPASS", "0") == "1"             # also: python main.py ... --no-cache
+
+def llm_cache_key(model, messages, temperature, response_format=None):
+    """Content address of a chat completion request"""
+    request = {"model": model, "messages": messages, "temperature": temperature, "response_format": response_format}
+    return hashlib.sha256(json.dumps(request, sort_keys=True, ensure_ascii=False).encode("utf-8")).hexdigest()
+
+def open_llm_cache():
+    """Open (and create if needed) the SQLite response cache"""
+    os.makedirs(os.path.dirname(LLM_CACHE_FILE), exist_ok=True)
+    conn = sqlite3.connect(LLM_CACHE_FILE, timeout=30)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.executescript("""
+        CREATE TABLE IF NOT EXISTS responses (
+            key        TEXT PRIMARY KEY,
+            content    TEXT NOT NULL,
+            created_at REAL NOT NULL,
+            used_at    REAL NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS responses_by_use ON responses (used_at);
+    """)
+    return conn
+
+def llm_cache_get(key):
+    """Cached content for a request key, or None (expired entries count as misses)"""
+    try:
+        conn = open_llm_cache()
+        try:
+            now = time.time()
+            row = conn.execute(
+                "SELECT content FROM responses WHERE key = ? AND created_at >= ?",
+                (key, now - LLM_CACHE_TTL_HOURS * 3600)).fetchone()
+            if row is not None:
+                with conn:
+                    conn.execute("UPDATE responses SET used_at = ? WHERE key = ?", (now, key))
+            return row[0] if row else None
+        finally:
+            conn.close()
+    except Exception as e:
+        print(f"⚠️  Warning: Could not read LLM cache: {e}")
+        return None
+
+def llm_cache_put(key, content):
+    """Store a response, then drop expired entries and evict beyond LLM_CACHE_MAX_ENTRIES (LRU)"""
+    try:
+        conn = open_llm_cache()
+        try:
+            now = time.time()
+            with conn:
+                conn.execute(
+                    "INSERT OR REPLACE INTO responses (key, content, created_at, used_at) VALUES (?, ?, ?, ?)",
+                    (key, content, now, now))
+                conn.execute("DELETE FROM responses WHERE created_at < ?", (now - LLM_CACHE_TTL_HOURS * 3600,))
+                conn.execute("""
+                    DELETE FROM responses WHERE key IN (
+                        SELECT key FROM responses ORDER BY used_at DESC LIMIT -1 OFFSET ?
+                    )
+                """, (LLM_CACHE_MAX_ENTRIES,))
+        finally:
+            conn.close()
+    except Exception as e:
+        print(f"⚠️  Warning: Could not write LLM cache: {e}")
+
+def llm_cache_delete(key):
+    """Drop a cached response"""
+    try:
+        conn = open_llm_cache()
+        try:
+            with conn:
+                conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+        finally:
+            conn.close()
+    except Exception as e:
+        print(f"⚠️  Warning: Could not write LLM cache: {e}")
+
+def complete_chat(messages, temperature, response_format=None, model=None, parse=None):
+    """Chat completion content, served from the response cache when possible.
+    
+    With `parse`, returns parse(content) instead. The response is only cached once parse accepts
+    it (returns something other than None), and a cached response it rejects is dropped and
+    requested again, so a retry after an unusable answer never replays it.
+    """
+    model = model or OPENAI_MODEL
+    key = llm_cache_key(model, messages, temperature, response_format)
+    if not LLM_CACHE_BYPASS:
+        start = time.monotonic()
+        cached = llm_cache_get(key)
+        if cached is not None:
+            try:
+                result = parse(cached) if parse else cached
+            except Exception:
+                result = None
+            if result is not None:
+                print("♻️  Using cached LLM response")
+                record_llm_call(model, "cache", time.monotonic() - start)
+                return result
+            print("🗑️  Dropping cached LLM response that failed validation")
+            llm_cache_delete(key)
+    
+    content, answered_by, usage = hedged_completion(messages, temperature, response_format, model)
+    log_usage(usage)
+    result = parse(content) if parse else content
+    # A hedge answered by the fallback model isn't stored under the primary model's key
+    if (content and result is not None and answered_by == model
+            and response_is_cacheable(content, response_format)):
+        llm_cache_put(key, content)
+    return result
+
+def response_is_cacheable(content, response_format):
+    """Only well-formed responses are cached, so a retry after a bad response asks again"""
+    if (response_format or {}).get("type") != "json_object":
+        return True
+    try:
+        json.loads(content)
+        return True
+    except ValueError:
+        return False
+
+# ---------- Prompt Packing ----------
+# Candidate lists go to the model as compact "id | source | title" lines, best first, until the
+# token budget is used; the model answers with the id and the link is filled in afterwards
+PROMPT_TOKEN_BUDGET = int(os.getenv("PROMPT_TOKEN_BUDGET", "600"))      # tokens for the candidate list
+PROMPT_MAX_CANDIDATES = int(os.getenv("PROMPT_MAX_CANDIDATES", "12"))
+_token_encoding = None
+
+def count_tokens(text):
+    """Token count of `text` for OPENAI_MODEL (tiktoken), or an estimate of ~4 characters per token"""
+    global _token_encoding
+    if tiktoken is not None and _token_encoding is None:
+        try:
+            _token_encoding = tiktoken.encoding_for_model(OPENAI_MODEL)
+        except Exception:
+            try:
+                _token_encoding = tiktoken.get_encoding("o200k_base")
+            except Exception:
+                _token_encoding = False  # encoding files unavailable (offline)
+    if _token_encoding:
+        return len(_token_encoding.encode(text))
+    return (len(text) + 3) // 4
+
+def strip_html(text):
+    """Plain text of an HTML snippet with whitespace collapsed"""
+    if not text:
+        return ""
+    if "<" in text:
+        text = BeautifulSoup(text, "html.parser").get_text(" ")
+    return re.sub(r"\s+", " ", text).strip()
+
+def truncate_tokens(text, max_tokens):
+    """Cut `text` at a word boundary so it fits in `max_tokens`"""
+    if count_tokens(text) <= max_tokens:
+        return text
+    words = text.split()
+    low, high = 0, len(words)
+    while low < high:  # longest word prefix that fits, with room for the ellipsis
+        mid = (low + high + 1) // 2
+        if count_tokens(" ".join(words[:mid]) + "…") <= max_tokens:
+            low = mid
+        else:
+            high = mid - 1
+    return " ".join(words[:low]) + "…"
+
+def pack_candidates(candidates, budget=None):
+    """Compact prompt block for a candidate list and the {id: link} map to resolve the answer"""
+    budget = PROMPT_TOKEN_BUDGET if budget is None else budget
+    lines, links, used = [], {}, 0
+    for n, cand in enumerate(candidates[:PROMPT_MAX_CANDIDATES], 1):
+        line = f"c{n} | {cand.get('source', '')} | {strip_html(cand.get('title', ''))}"
+        tokens = count_tokens(line) + 1  # newline
+        if lines and used + tokens > budget:
+            break
+        lines.append(line)
+        links[f"c{n}"] = cand.get("link", "")
+        used += tokens
+    
+    verbose = count_tokens(json.dumps(candidates[:len(lines)]))
+    print(f"🧮 Packed {len(lines)} candidates into {used} tokens (JSON would be {verbose})")
+    return "\n".join(lines), links
+
+def unpack_choice(obj, links):
+    """Replace the candidate id in a model answer with the candidate's link"""
+    chosen = str(obj.get("source_url", "")).strip().strip("[]<>")
+    url = links.get(chosen, chosen)
+    obj["source_url"] = url
+    if url and obj.get("tweet"):
+        tweet = obj["tweet"].replace("<URL>", url)
+        obj["tweet"] = re.sub(r"\[?\b(c\d+)\b\]?", lambda m: links.get(m.group(1), m.group(0)), tweet)
+    return obj
+
+# ---------- OpenAI Writers ----------
+def write_technews(candidates: list[dict]) -> dict:
+    """Generate high-signal, meaningful tech news content"""
+    packed, links = pack_candidates(candidates)
+    
+    # Import the enhanced prompt from prompts.py
+    from utils.prompts import TECHNEWS_SYSTEM_PROMPT, TECHNEWS_USER_PROMPT_TEMPLATE
+    
+    # Static instructions first so the provider can cache the prompt prefix; candidates last
+    user = TECHNEWS_USER_PROMPT_TEMPLATE.format(candidates=packed)
+    
+    def parse(raw):
+        obj = unpack_choice(json.loads(raw or "{}"), links)
+        # Ensure link text appended if model omitted it
+        if obj.get("source_url") and "Learn more:" not in obj.get("tweet",""):
+            obj["tweet"] = f'{obj["tweet"]} Learn more: {obj["source_url"]}'
+        obj["tweet"] = compose_tweet(obj.get("tweet", ""))
+        return obj if obj["tweet"] else None
+    
+    return complete_chat(
+        messages=[{"role":"system","content":TECHNEWS_SYSTEM_PROMPT},
                   {"role":"user","content":user}],
         temperature=0.4,  # Lower temperature for more focused, factual content
+        response_format={"type": "json_object"},
+        parse=parse,
     )
-    raw = resp.choices[0].message.content or "{}"
-    obj = json.loads(raw)
-    # Ensure link text appended if model omitted it
-    if obj.get("source_url") and "Learn more:" not in obj.get("tweet",""):
-        obj["tweet"] = f'{obj["tweet"]} Learn more: {obj["source_url"]}'
-    return obj
 
 def write_crypto(candidates: list[dict]) -> dict:
     """Generate high-signal, meaningful crypto news content"""
-    cjson = json.dumps(candidates[:8])  # keep prompt small
+    packed, links = pack_candidates(candidates)
     
     # Import the enhanced prompt from prompts.py
-    from utils.prompts import CRYPTO_SYSTEM_PROMPT
+    from utils.prompts import CRYPTO_SYSTEM_PROMPT, TECHNEWS_USER_PROMPT_TEMPLATE
     
-    user = f"""Candidates (JSON array) - These have been pre-scored for quality:
-{cjson}
-
-IMPORTANT: These candidates have been pre-filtered for high-signal content. 
-Choose the story that has the GREATEST REAL-WORLD IMPACT and EDUCATIONAL VALUE.
-
-Focus on:
-- Regulatory developments that affect crypto adoption
-- Institutional adoption and enterprise partnerships
-- Security breakthroughs and vulnerabilities
-- DeFi, NFT, and Web3 innovations
-- Research and analysis on blockchain technology
-
-Return ONLY the JSON object specified above."""
+    # Static instructions first so the provider can cache the prompt prefix; candidates last
+    user = TECHNEWS_USER_PROMPT_TEMPLATE.format(candidates=packed)
     
-    resp = client.chat.completions.create(
-        model=OPENAI_MODEL,
-        response_format={"type": "json_object"},
-        temperature=0.4,  # Lower temperature for more focused, factual content
+    def parse(raw):
+        obj = unpack_choice(json.loads(raw or "{}"), links)
+        # Ensure link text appended if model omitted it
+        if obj.get("source_url") and "Learn more:" not in obj.get("tweet",""):
+            obj["tweet"] = f'{obj["tweet"]} Learn more: {obj["source_url"]}'
+        obj["tweet"] = compose_tweet(obj.get("tweet", ""))
+        return obj if obj["tweet"] else None
+    
+    return complete_chat(
         messages=[{"role":"system","content":CRYPTO_SYSTEM_PROMPT},
                   {"role":"user","content":user}],
+        temperature=0.4,  # Lower temperature for more focused, factual content
+        response_format={"type": "json_object"},
+        parse=parse,
     )
-    raw = resp.choices[0].message.content or "{}"
-    obj = json.loads(raw)
-    # Ensure link text appended if model omitted it
-    if obj.get("source_url") and "Learn more:" not in obj.get("tweet",""):
-        obj["tweet"] = f'{obj["tweet"]} Learn more: {obj["source_url"]}'
-    return obj
+
+# Influential books list
+INFLUENTIAL_BOOKS = [
+    '"Meditations" by Marcus Aurelius',
+    '"The Art of War" by Sun Tzu',
+    '"1984" by George Orwell',
+    '"The Great Gatsby" by F. Scott Fitzgerald',
+    '"To Kill a Mockingbird" by Harper Lee',
+    '"The Catcher in the Rye" by J.D. Salinger',
+    '"Pride and Prejudice" by Jane Austen',
+    '"The Lord of the Rings" by J.R.R. Tolkien',
+    '"The Hobbit" by J.R.R. Tolkien',
+    '"The Alchemist" by Paulo Coelho',
+    '"The Little Prince" by Antoine de Saint-Exupéry',
+    '"Animal Farm" by George Orwell',
+    '"Brave New World" by Aldous Huxley',
+    '"Fahrenheit 451" by Ray Bradbury',
+    '"The Handmaid\'s Tale" by Margaret Atwood',
+    '"The Bell Jar" by Sylvia Plath',
+    '"Slaughterhouse-Five" by Kurt Vonnegut',
+    '"Catch-22" by Joseph Heller',
+    '"The Grapes of Wrath" by John Steinbeck',
+    '"Of Mice and Men" by John Steinbeck'
+]
+
+# Quote thread topics
+QUOTE_TOPICS = [
+    "Leadership", "Perseverance", "Love & Romance", "Success", 
+    "Wisdom", "Courage", "Creativity", "Friendship", 
+    "Change", "Happiness", "Purpose", "Resilience"
+]
 
 def write_books_thread():
     """Generate a 6-tweet thread about a book recommendation"""
-    # Influential books list
-    INFLUENTIAL_BOOKS = [
-        '"Meditations" by Marcus Aurelius',
-        '"The Art of War" by Sun Tzu',
-        '"1984" by George Orwell',
-        '"The Great Gatsby" by F. Scott Fitzgerald',
-        '"To Kill a Mockingbird" by Harper Lee',
-        '"The Catcher in the Rye" by J.D. Salinger',
-        '"Pride and Prejudice" by Jane Austen',
-        '"The Lord of the Rings" by J.R.R. Tolkien',
-        '"The Hobbit" by J.R.R. Tolkien',
-        '"The Alchemist" by Paulo Coelho',
-        '"The Little Prince" by Antoine de Saint-Exupéry',
-        '"Animal Farm" by George Orwell',
-        '"Brave New World" by Aldous Huxley',
-        '"Fahrenheit 451" by Ray Bradbury',
-        '"The Handmaid\'s Tale" by Margaret Atwood',
-        '"The Bell Jar" by Sylvia Plath',
-        '"Slaughterhouse-Five" by Kurt Vonnegut',
-        '"Catch-22" by Joseph Heller',
-        '"The Grapes of Wrath" by John Steinbeck',
-        '"Of Mice and Men" by John Steinbeck'
-    ]
-    
     # Load memory to avoid recently used books
-    books_memory = load_books_memory()
+    books_memory = get_memory(BOOKS_MEMORY_FILE)
     used_books = books_memory.get('used_books', [])
     
+    # Pre-generated threads are used first (see fill_backlog)
+    queued = pop_backlog("books", used_books)
+    if queued:
+        return queued
+    
     # Filter out recently used books
     available_books = [book for book in INFLUENTIAL_BOOKS if book not in used_books]
     
@@ -974,45 +2683,28 @@ def write_books_thread():
     if used_books:
         print(f"📝 Recently used: {', '.join(used_books[-3:])}")  # Show last 3 used
     
-    # Add stronger instruction to avoid duplicates
-    system = f"""Return ONLY valid JSON exactly as:
-{{"book_title":"...","author":"...","summary":"...","takeaways":["takeaway1","takeaway2","takeaway3","takeaway4","takeaway5"]}}
-
-Role: Editor of "Books by Quinn".
-Choose ONE book from this curated list and create a comprehensive 6-tweet thread.
-
-CRITICAL: You MUST choose from these available books ONLY. Do NOT repeat recently used books:
+    # Static instructions first so the provider can cache the prompt prefix; per-run choices last
+    from utils.prompts import BOOKS_THREAD_SYSTEM_PROMPT
+    user = f"""Available books (choose ONE):
 {chr(10).join([f"- {book}" for book in available_books])}
 
-Requirements:
-- book_title: Just the book title (no quotes)
-- author: Just the author name
-- summary: A compelling 1-2 sentence summary of the book's main message (keep under 200 characters)
-- takeaways: Array of 5 powerful, actionable insights from the book
-
-Rules for takeaways:
-- Each should be 1-2 sentences max
-- Focus on practical wisdom and life lessons
-- Make them universally applicable
-- Avoid generic advice - be specific and insightful
-- Each should stand alone as valuable insight
-- Keep each takeaway under 250 characters to ensure room for numbering
-
-IMPORTANT: Choose a DIFFERENT book from the available list above.
-
-SUGGESTION: Consider choosing {random.choice(available_books) if available_books else 'a different book'} for variety.
-"""
+SUGGESTION: Consider choosing {random.choice(available_books) if available_books else 'a different book'} for variety."""
 
+    def parse(raw):
+        # Incomplete threads or tweets over the limit are rejected (and not cached)
+        obj = json.loads(raw or "{}")
+        return obj if validate_thread_payload("books", obj) else None
+    
     try:
-        resp = client.chat.completions.create(
-            model=OPENAI_MODEL,
-            response_format={"type": "json_object"},
-            messages=[{"role": "system", "content": system}],
+        obj = complete_chat(
+            messages=[{"role": "system", "content": BOOKS_THREAD_SYSTEM_PROMPT},
+                      {"role": "user", "content": user}],
             temperature=0.7,
+            response_format={"type": "json_object"},
+            parse=parse,
         )
-        
-        raw = resp.choices[0].message.content or "{}"
-        obj = json.loads(raw)
+        if obj is None:
+            print("❌ Generated book thread failed validation")
         return obj
         
     except Exception as e:
@@ -1037,69 +2729,50 @@ def create_books_thread(book_data):
 def write_quotes_thread():
     """Generate a 4-tweet thread with quotes on a specific topic"""
     # Load memory to avoid recently used topics
-    quotes_memory = load_quotes_memory()
+    quotes_memory = get_memory(QUOTES_MEMORY_FILE)
     used_topics = quotes_memory.get('used_quotes', [])
     
-    # Available topics
-    ALL_TOPICS = [
-        "Leadership", "Perseverance", "Love & Romance", "Success", 
-        "Wisdom", "Courage", "Creativity", "Friendship", 
-        "Change", "Happiness", "Purpose", "Resilience"
-    ]
+    # Pre-generated threads are used first (see fill_backlog)
+    queued = pop_backlog("quotes", used_topics)
+    if queued:
+        return queued
     
     # Filter out recently used topics
-    available_topics = [topic for topic in ALL_TOPICS if topic not in used_topics]
+    available_topics = [topic for topic in QUOTE_TOPICS if topic not in used_topics]
     
     # If all topics have been used recently, reset memory and use all topics
     if not available_topics:
         print("🔄 All topics have been used recently. Resetting quotes memory...")
         quotes_memory['used_quotes'] = []
         save_memory(quotes_memory, QUOTES_MEMORY_FILE)
-        available_topics = ALL_TOPICS
+        available_topics = QUOTE_TOPICS
     
-    print(f"💭 Available topics: {len(available_topics)} out of {len(ALL_TOPICS)}")
+    print(f"💭 Available topics: {len(available_topics)} out of {len(QUOTE_TOPICS)}")
     if used_topics:
         print(f"📝 Recently used: {', '.join(used_topics[-3:])}")  # Show last 3 used
     
-    system = f"""Return ONLY valid JSON exactly as:
-{{"topic":"...","quotes":[{{"quote":"...","author":"...","year":"..."}},{{"quote":"...","author":"...","year":"..."}},{{"quote":"...","author":"...","year":"..."}}]}}
-
-Role: Editor of "Quotes by Quinn".
-Choose ONE compelling topic and provide the 3 most powerful quotes on that subject.
-
-CRITICAL: You MUST choose from these available topics ONLY. Do NOT repeat recently used topics:
+    # Static instructions first so the provider can cache the prompt prefix; per-run choices last
+    from utils.prompts import QUOTES_THREAD_SYSTEM_PROMPT
+    user = f"""Available topics (choose ONE):
 {chr(10).join([f"- {topic}" for topic in available_topics])}
 
-Requirements:
-- topic: Choose one of the topics above
-- quotes: Array of 3 powerful quotes on that topic
-- Each quote should include: quote text, author name, and year
-- Focus on the highest signal, most impactful quotes
-- Choose quotes that are universally applicable and timeless
-
-Rules for quotes:
-- Each quote should be 1-2 sentences max
-- Focus on practical wisdom and life lessons
-- Make them inspiring and thought-provoking
-- Use realistic years (e.g., 1800-2020 range)
-- Each should stand alone as valuable insight
-- Keep each quote under 200 characters to ensure room for author/year
-
-IMPORTANT: Choose a DIFFERENT topic from the available list above.
-
-SUGGESTION: Consider choosing {random.choice(available_topics) if available_topics else 'a different topic'} for variety.
-"""
+SUGGESTION: Consider choosing {random.choice(available_topics) if available_topics else 'a different topic'} for variety."""
 
+    def parse(raw):
+        # Incomplete threads or tweets over the limit are rejected (and not cached)
+        obj = json.loads(raw or "{}")
+        return obj if validate_thread_payload("quotes", obj) else None
+    
     try:
-        resp = client.chat.completions.create(
-            model=OPENAI_MODEL,
-            response_format={"type": "json_object"},
-            messages=[{"role": "system", "content": system}],
+        obj = complete_chat(
+            messages=[{"role": "system", "content": QUOTES_THREAD_SYSTEM_PROMPT},
+                      {"role": "user", "content": user}],
             temperature=0.7,
+            response_format={"type": "json_object"},
+            parse=parse,
         )
-        
-        raw = resp.choices[0].message.content or "{}"
-        obj = json.loads(raw)
+        if obj is None:
+            print("❌ Generated quotes thread failed validation")
         return obj
         
     except Exception as e:
@@ -1125,6 +2798,220 @@ def create_quotes_thread(quotes_data):
     
     return tweets
 
+# ---------- Content Backlog ----------
+# Book and quote threads don't depend on live data, so they can be generated in bulk off-peak
+# (`python main.py backlog`) and queued; the posting run then just pops the next thread
+BACKLOG_FILE = "data/backlog.db"
+BACKLOG_TARGET = int(os.getenv("BACKLOG_TARGET", "14"))        # threads to keep queued per type
+BACKLOG_BATCH_SIZE = int(os.getenv("BACKLOG_BATCH_SIZE", "5"))  # threads generated per request
+BACKLOG_CLAIM_SECONDS = 3600  # a thread claimed by a run that never settled it is reused after this
+
+def open_backlog():
+    """Open (and create if needed) the SQLite backlog queue"""
+    os.makedirs(os.path.dirname(BACKLOG_FILE), exist_ok=True)
+    conn = sqlite3.connect(BACKLOG_FILE, timeout=30)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.executescript("""
+        CREATE TABLE IF NOT EXISTS backlog (
+            id           INTEGER PRIMARY KEY AUTOINCREMENT,
+            content_type TEXT NOT NULL,
+            item         TEXT NOT NULL,
+            payload      TEXT NOT NULL,
+            created_at   REAL NOT NULL,
+            claimed_at   REAL,
+            UNIQUE (content_type, item)
+        );
+    """)
+    try:
+        conn.execute("ALTER TABLE backlog ADD COLUMN claimed_at REAL")  # queues created before claims
+    except sqlite3.OperationalError:
+        pass  # column already exists
+    return conn
+
+def backlog_item(content_type, payload):
+    """Memory identifier of a queued thread (book title or quote topic)"""
+    return extract_book_title(payload) if content_type == "books" else extract_quote_topic(payload)
+
+def validate_thread_payload(content_type, payload):
+    """A book/quote thread must be complete and every tweet must fit in 280 characters"""
+    try:
+        if content_type == "books":
+            if not (payload["book_title"] and payload["author"] and payload["summary"]):
+                return False
+            if not any(f'"{payload["book_title"]}"' in book for book in INFLUENTIAL_BOOKS):
+                return False
+            if len(payload["takeaways"]) != 5:
+                return False
+            tweets = create_books_thread(payload)
+        else:
+            if payload["topic"] not in QUOTE_TOPICS or len(payload["quotes"]) != 3:
+                return False
+            if not all(q["quote"] and q["author"] and q["year"] for q in payload["quotes"]):
+                return False
+            tweets = create_quotes_thread(payload)
+        return all(isinstance(tweet, str) and 0 < tweet_length(tweet) <= TWEET_MAX_LENGTH for tweet in tweets)
+    except (KeyError, TypeError, AttributeError):
+        return False
+
+def backlog_counts():
+    """Queued threads per content type"""
+    try:
+        conn = open_backlog()
+        try:
+            return dict(conn.execute("SELECT content_type, COUNT(*) FROM backlog GROUP BY content_type").fetchall())
+        finally:
+            conn.close()
+    except Exception as e:
+        print(f"⚠️  Warning: Could not read backlog: {e}")
+        return {}
+
+def pop_backlog(content_type, used_items):
+    """Claim the oldest queued thread whose book/topic is not in recent memory, or None.
+    
+    The thread stays queued until settle_backlog() is called with the outcome of posting it.
+    """
+    try:
+        conn = open_backlog()
+        try:
+            with conn:
+                now = time.time()
+                for row_id, item, payload in conn.execute(
+                        "SELECT id, item, payload FROM backlog WHERE content_type = ? "
+                        "AND (claimed_at IS NULL OR claimed_at < ?) ORDER BY id",
+                        (content_type, now - BACKLOG_CLAIM_SECONDS)).fetchall():
+                    if item in used_items:
+                        continue
+                    conn.execute("UPDATE backlog SET claimed_at = ? WHERE id = ?", (now, row_id))
+                    print(f"📦 Using pre-generated {content_type} thread: {item}")
+                    return dict(json.loads(payload), _backlog_id=row_id)
+        finally:
+            conn.close()
+    except Exception as e:
+        print(f"⚠️  Warning: Could not read backlog: {e}")
+    return None
+
+def settle_backlog(choice, posted):
+    """Delete a claimed thread once it is posted, or return it to the queue if posting failed"""
+    row_id = choice.get("_backlog_id") if isinstance(choice, dict) else None
+    if row_id is None:
+        return  # not from the backlog
+    try:
+        conn = open_backlog()
+        try:
+            with conn:
+                if posted:
+                    conn.execute("DELETE FROM backlog WHERE id = ?", (row_id,))
+                else:
+                    conn.execute("UPDATE backlog SET claimed_at = NULL WHERE id = ?", (row_id,))
+                    print("📦 Returned the thread to the backlog")
+        finally:
+            conn.close()
+    except Exception as e:
+        print(f"⚠️  Warning: Could not update backlog: {e}")
+
+def generate_backlog_batch(content_type, choices, count):
+    """Ask for `count` threads in one request, each on a different book/topic from `choices`"""
+    if content_type == "books":
+        shape = '{"book_title":"...","author":"...","summary":"...","takeaways":["takeaway1","takeaway2","takeaway3","takeaway4","takeaway5"]}'
+        brief = """Role: Editor of "Books by Quinn".
+For each thread choose a DIFFERENT book from the curated list in the user message ONLY.
+
+Per thread:
+- book_title: Just the book title (no quotes)
+- author: Just the author name
+- summary: A compelling 1-2 sentence summary of the book's main message (keep under 200 characters)
+- takeaways: Array of 5 powerful, actionable insights from the book, 1-2 sentences each, specific
+  rather than generic, each under 250 characters"""
+    else:
+        shape = '{"topic":"...","quotes":[{"quote":"...","author":"...","year":"..."},{"quote":"...","author":"...","year":"..."},{"quote":"...","author":"...","year":"..."}]}'
+        brief = """Role: Editor of "Quotes by Quinn".
+For each thread choose a DIFFERENT topic from the list in the user message ONLY.
+
+Per thread:
+- topic: One of the topics above
+- quotes: The 3 most powerful, timeless quotes on that topic with quote text, author and a
+  realistic year; 1-2 sentences each, under 200 characters"""
+    
+    # Static instructions first so the provider can cache the prompt prefix; per-call data last
+    system = f"""Return ONLY valid JSON exactly as:
+{{"items":[{shape}, ...]}}
+
+{brief}"""
+    user = f"""{"Books" if content_type == "books" else "Topics"}:
+{chr(10).join(f"- {choice}" for choice in choices)}
+
+Return exactly {count} items."""
+    
+    def parse(raw):
+        # A batch without a single valid thread on one of `choices` is rejected (and not cached),
+        # so fill_backlog's next attempt asks again instead of replaying it
+        items = json.loads(raw or "{}").get("items", [])
+        if not isinstance(items, list):
+            return None
+        for payload in items:
+            item = backlog_item(content_type, payload) if isinstance(payload, dict) else None
+            if item and any(item == choice or f'"{item}"' in choice for choice in choices) \
+                    and validate_thread_payload(content_type, payload):
+                return items
+        return None
+    
+    return complete_chat(
+        messages=[{"role": "system", "content": system},
+                  {"role": "user", "content": user}],
+        temperature=0.7,
+        response_format={"type": "json_object"},
+        parse=parse,
+    ) or []
+
+def fill_backlog(content_type, target=None):
+    """Top up the queue of a content type ("books" or "quotes") to `target` validated threads"""
+    target = BACKLOG_TARGET if target is None else target
+    memory_file = BOOKS_MEMORY_FILE if content_type == "books" else QUOTES_MEMORY_FILE
+    _, key = MEMORY_TYPES[memory_file]
+    used = set(get_memory(memory_file).get(key, []))
+    
+    conn = open_backlog()
+    try:
+        queued = {row[0] for row in conn.execute("SELECT item FROM backlog WHERE content_type = ?", (content_type,))}
+        attempts = 0
+        while len(queued) < target and attempts < 3:
+            # Books/topics neither queued nor recently posted; fall back to anything not queued
+            if content_type == "books":
+                fresh = [book for book in INFLUENTIAL_BOOKS if not any(f'"{item}"' in book for item in queued | used)]
+                choices = fresh or [book for book in INFLUENTIAL_BOOKS if not any(f'"{item}"' in book for item in queued)]
+            else:
+                fresh = [topic for topic in QUOTE_TOPICS if topic not in queued | used]
+                choices = fresh or [topic for topic in QUOTE_TOPICS if topic not in queued]
+            if not choices:
+                break  # every book/topic is already queued
+            
+            count = min(BACKLOG_BATCH_SIZE, target - len(queued), len(choices))
+            print(f"🏭 Generating {count} {content_type} thread(s)...")
+            try:
+                with llm_account(content_type):
+                    items = generate_backlog_batch(content_type, choices, count)
+            except Exception as e:
+                print(f"❌ Error generating backlog: {e}")
+                items = []
+            
+            added = 0
+            now = time.time()
+            with conn:
+                for payload in items:
+                    item = backlog_item(content_type, payload) if isinstance(payload, dict) else None
+                    if not item or item in queued or not validate_thread_payload(content_type, payload):
+                        continue
+                    conn.execute(
+                        "INSERT OR IGNORE INTO backlog (content_type, item, payload, created_at) VALUES (?, ?, ?, ?)",
+                        (content_type, item, json.dumps(payload), now))
+                    queued.add(item)
+                    added += 1
+            print(f"📦 Queued {added}/{len(items)} valid {content_type} thread(s)")
+            attempts = attempts + 1 if added == 0 else 0
+        print(f"✅ {content_type.capitalize()} backlog: {len(queued)} thread(s) queued")
+    finally:
+        conn.close()
+
 def write_reddit_summary(reddit_posts):
     """Generate a single tweet summarizing the top 5 Reddit posts"""
     # Take top 5 posts
@@ -1139,54 +3026,34 @@ def write_reddit_summary(reddit_posts):
     for post in top_posts:
         post['short_link'] = shortened_urls.get(post['link'], post['link'])
     
-    system = """Return ONLY valid JSON exactly as:
-{"tweet":"...","summary":"..."}
-
-Role: Editor of "Reddit by Quinn".
-Create a single tweet summarizing the top 5 Reddit posts of the day.
-
-CRITICAL REQUIREMENTS:
-- tweet: Must be ≤ 280 characters total (this is a hard limit)
-- Include all 5 posts with their shortened links
-- Use extremely short, concise descriptions
-- Focus on the most essential information only
-
-Format: "🔥 Top Reddit today: [very brief summary] 1. [3-5 word title] [short_link] 2. [3-5 word title] [short_link] ..."
-
-Rules:
-- Each post description should be 3-5 words maximum
-- Use abbreviations and short forms where possible
-- Prioritize shortened links over descriptions
-- Test character count before returning
-- If over 280 chars, make descriptions even shorter
-"""
-
-    # Prepare post data for GPT with shortened URLs
-    posts_data = []
-    for i, post in enumerate(top_posts, 1):
-        posts_data.append({
-            "number": i,
-            "title": post['title'],
-            "subreddit": post['subreddit'],
-            "link": post['short_link']  # Use shortened URL
-        })
+    from utils.prompts import REDDIT_SYSTEM_PROMPT
+
+    # Prepare post data for GPT with shortened URLs, one compact line per post
+    posts_data = "\n".join(
+        f"{i}. r/{post['subreddit']} | {truncate_tokens(strip_html(post['title']), 40)} | {post['short_link']}"
+        for i, post in enumerate(top_posts, 1))
+    print(f"🧮 Packed {len(top_posts)} posts into {count_tokens(posts_data)} tokens")
     
-    user = f"""Top 5 Reddit posts to summarize (with shortened URLs):
-{json.dumps(posts_data, indent=2)}
+    user = f"""Top 5 Reddit posts to summarize (number. subreddit | title | shortened URL):
+{posts_data}
 
 Create a single tweet summarizing these posts with all shortened links included."""
     
+    def parse(raw):
+        obj = json.loads(raw or "{}")
+        obj['tweet'] = compose_tweet(obj.get('tweet', ''))
+        return obj if obj['tweet'] else None
+    
     try:
-        resp = client.chat.completions.create(
-            model=OPENAI_MODEL,
-            response_format={"type": "json_object"},
-            messages=[{"role": "system", "content": system},
+        obj = complete_chat(
+            messages=[{"role": "system", "content": REDDIT_SYSTEM_PROMPT},
                       {"role": "user", "content": user}],
             temperature=0.7,
+            response_format={"type": "json_object"},
+            parse=parse,
         )
-        
-        raw = resp.choices[0].message.content or "{}"
-        obj = json.loads(raw)
+        if obj is None:
+            return None
         
         # Add the posts data for memory tracking
         obj['posts'] = top_posts
@@ -1209,46 +3076,31 @@ def write_product_summary(product_list):
     print("🔗 Shortening ProductHunt URL...")
     short_url = shorten_url(product['link'])
     
-    system = """Return ONLY valid JSON exactly as:
-{"tweet":"...","summary":"..."}
-
-Role: Editor of "Product by Quinn".
-Create a single tweet about a ProductHunt product.
-
-CRITICAL REQUIREMENTS:
-- tweet: Must be ≤ 280 characters total (this is a hard limit)
-- Format: "🚀 [Product Name] — [What it does in 1 sentence] + [Ideal user in 3-5 words] + [1 standout feature in 5-8 words] + Learn more: [shortened_url]"
-- Keep descriptions concise but informative
-- Focus on the most compelling aspects
-
-Rules:
-- Product name: Keep it short
-- What it does: 1 clear sentence
-- Ideal user: 3-5 words maximum
-- Standout feature: 5-8 words maximum
-- Always end with "Learn more: [URL]"
-- Test character count before returning
-"""
+    from utils.prompts import PRODUCT_SYSTEM_PROMPT
 
     user = f"""ProductHunt product to feature:
 Name: {product['name']}
 Category: {product['category']}
-Description: {product['description'][:200]}...
+Description: {truncate_tokens(strip_html(product['description']), 60)}
 Link: {short_url}
 
 Create a tweet following the exact format specified above."""
 
+    def parse(raw):
+        obj = json.loads(raw or "{}")
+        obj['tweet'] = compose_tweet(obj.get('tweet', ''))
+        return obj if obj['tweet'] else None
+    
     try:
-        resp = client.chat.completions.create(
-            model=OPENAI_MODEL,
-            response_format={"type": "json_object"},
-            messages=[{"role": "system", "content": system},
+        obj = complete_chat(
+            messages=[{"role": "system", "content": PRODUCT_SYSTEM_PROMPT},
                       {"role": "user", "content": user}],
             temperature=0.7,
+            response_format={"type": "json_object"},
+            parse=parse,
         )
-        
-        raw = resp.choices[0].message.content or "{}"
-        obj = json.loads(raw)
+        if obj is None:
+            return None
         
         # Add the product data for memory tracking
         obj['product'] = product
@@ -1259,278 +3111,377 @@ Create a tweet following the exact format specified above."""
         print(f"❌ Error generating product content: {e}")
         return None
 
+# ---------- Content Generation ----------
+# With PARALLEL_GENERATION=1 the content of every account in a run is generated up front by a
+# bounded worker pool, so the run takes about as long as the slowest generation; posting stays in order
+PARALLEL_GENERATION = os.getenv("PARALLEL_GENERATION", "0") == "1"
+GENERATION_WORKERS = int(os.getenv("GENERATION_WORKERS", "3"))
+
+def generate_account_content(account_type, cands=None):
+    """Fetch the inputs of one account type and generate its content (no posting).
+    
+    Returns the write_* result, or None when there is nothing new to post.
+    """
+    if account_type == "technews":
+        if cands is None:
+            cands = fetch_candidates()
+        if not cands:
+            print("No candidates found; skipping TechNews.")
+            return None
+        print(f"📊 Content Quality: {len(cands)} pre-scored candidates")
+        
+        # Filter out already used articles BEFORE generating content
+        cands = filter_used_articles(cands, get_memory(TECHNEWS_MEMORY_FILE), TECHNEWS_MEMORY_FILE)
+        if not cands:
+            print("❌ No new articles available after filtering; all candidates have been used recently.")
+            return None
+        
+        top_candidate = cands[0]
+        print(f"🏆 Top candidate: {top_candidate['title'][:80]}... (Score: {top_candidate['score']})")
+        print(f"📰 Source: {top_candidate['source']}")
+        print()
+        return write_technews(cands)
+    
+    elif account_type == "books":
+        choice = write_books_thread()
+        if not choice:
+            print("❌ Failed to generate book content")
+        return choice
+    
+    elif account_type == "quotes":
+        choice = write_quotes_thread()
+        if not choice:
+            print("❌ Failed to generate quotes content")
+        return choice
+    
+    elif account_type == "reddit":
+        reddit_posts = fetch_reddit_posts(limit=20)
+        if not reddit_posts:
+            print("❌ Failed to fetch Reddit posts")
+            return None
+        
+        reddit_posts = filter_seen_items(reddit_posts, REDDIT_MEMORY_FILE, extract_reddit_identifier, "posts")
+        if not reddit_posts:
+            print("❌ No new Reddit posts available; all have been used before")
+            return None
+        
+        print(f"🔴 Fetched {len(reddit_posts)} Reddit posts")
+        print(f"Top 5 posts:")
+        for i, post in enumerate(reddit_posts[:5], 1):
+            print(f"{i}. r/{post['subreddit']}: {post['title'][:60]}...")
+        
+        choice = write_reddit_summary(reddit_posts)
+        if not choice:
+            print("❌ Failed to generate Reddit content")
+        return choice
+    
+    elif account_type == "product":
+        product_list = fetch_producthunt_products(limit=10)
+        if not product_list:
+            print("❌ Failed to fetch ProductHunt products")
+            return None
+        
+        product_list = filter_seen_items(product_list, PRODUCTS_MEMORY_FILE, extract_product_identifier, "products")
+        if not product_list:
+            print("❌ No new ProductHunt products available; all have been featured before")
+            return None
+        
+        print(f"🚀 Fetched {len(product_list)} ProductHunt products")
+        print(f"Top product: {product_list[0]['name']} ({product_list[0]['category']})")
+        
+        choice = write_product_summary(product_list)
+        if not choice:
+            print("❌ Failed to generate product content")
+        return choice
+    
+    elif account_type == "crypto":
+        crypto_cands = fetch_crypto_candidates()
+        if not crypto_cands:
+            print("❌ No crypto candidates found; skipping Crypto.")
+            return None
+        print(f"📊 Crypto Content Quality: {len(crypto_cands)} pre-scored candidates")
+        
+        # Filter out already used articles BEFORE generating content
+        crypto_cands = filter_used_articles(crypto_cands, get_memory(CRYPTO_MEMORY_FILE), CRYPTO_MEMORY_FILE)
+        if not crypto_cands:
+            print("❌ No new crypto articles available after filtering; all candidates have been used recently.")
+            return None
+        
+        top_candidate = crypto_cands[0]
+        print(f"🏆 Top candidate: {top_candidate['title'][:80]}... (Score: {top_candidate['score']})")
+        print(f"📰 Source: {top_candidate['source']}")
+        print()
+        return write_crypto(crypto_cands)
+    
+    return None
+
+class ContentGeneration:
+    """Content for the accounts of one run: generated in-line on request, or all at once
+    in a worker pool when PARALLEL_GENERATION is on.
+    
+    In parallel mode the run locks of all accounts are taken (in ACCOUNTS order) before
+    generating, so the memory the generators read cannot change under them. Accounts whose lock is busy are
+    left to the posting loop.
+    """
+    
+    def __init__(self, account_types, cands=None, parallel=None):
+        self.account_types = list(dict.fromkeys(account_types))
+        self.cands = cands
+        self.parallel = PARALLEL_GENERATION if parallel is None else parallel
+        self.futures = {}
+        self.pregenerated = set()  # account types whose content was generated up front
+        self.locks = ExitStack()
+        self.executor = None
+    
+    def __enter__(self):
+        if not self.parallel or len(self.account_types) < 2:
+            return self
+        # Locks are taken in ACCOUNTS order whatever order the run lists its accounts in, so two
+        # overlapping runs can't each hold one lock while waiting for the other's
+        order = {account["type"]: n for n, account in enumerate(ACCOUNTS)}
+        locked = {t for t in sorted(self.account_types, key=lambda t: (order.get(t, len(order)), t))
+                  if self.locks.enter_context(run_lock(t))}
+        ready = [t for t in self.account_types if t in locked]
+        if ready:
+            workers = max(1, min(GENERATION_WORKERS, len(ready)))
+            print(f"⚡ Generating content for {len(ready)} accounts ({workers} workers)")
+            self.executor = ThreadPoolExecutor(max_workers=workers)
+            for account_type in ready:
+                self.futures[account_type] = self.executor.submit(self.generate, account_type, self.cands)
+            self.pregenerated.update(ready)
+        return self
+    
+    def result(self, account_type):
+        """Content for an account type (waits for its generation if it is still running)"""
+        future = self.futures.pop(account_type, None)
+        if future is None:
+            return self.generate(account_type, self.cands)
+        return future.result()
+    
+    @staticmethod
+    def generate(account_type, cands):
+        with llm_account(account_type):
+            return generate_account_content(account_type, cands)
+    
+    def __exit__(self, *exc):
+        if self.executor:
+            self.executor.shutdown(wait=True, cancel_futures=True)
+        self.locks.close()
+        return False
+
 # ---------- Main execution ----------
 def run_specific_accounts(account_types: list[str]):
     """Run only specific account types"""
     print(f"🚀 Running specific accounts: {', '.join(account_types)}")
     print()
     
-    # Load memory for all types
-    books_memory = load_books_memory()
-    quotes_memory = load_quotes_memory()
-    technews_memory = load_technews_memory()
-    reddit_memory = load_reddit_memory()
-    products_memory = load_products_memory()
-    crypto_memory = load_crypto_memory()
-    
-    # Show memory status for requested types
+    # Show memory status for requested types (memory is loaded lazily, per type)
     for account_type in account_types:
-        if account_type == "books":
-            print(f"📚 Books memory: {len(books_memory['used_books'])} books used in last {MAX_MEMORY} runs")
-        elif account_type == "quotes":
-            print(f"💭 Quotes memory: {len(quotes_memory['used_quotes'])} quotes used in last {MAX_MEMORY} runs")
-        elif account_type == "technews":
-            print(f"📰 TechNews memory: {len(technews_memory['used_articles'])} articles used in last {MAX_MEMORY} runs")
-        elif account_type == "reddit":
-            print(f"🔴 Reddit memory: {len(reddit_memory['used_posts'])} posts used in last {MAX_MEMORY} runs")
-        elif account_type == "product":
-            print(f"🚀 Products memory: {len(products_memory['used_products'])} products used in last {MAX_MEMORY} runs")
-        elif account_type == "crypto":
-            print(f"₿ Crypto memory: {len(crypto_memory['used_articles'])} articles used in last {MAX_MEMORY} runs")
+        print_account_memory(account_type)
     print()
     
     # Process only the requested account types
-    for account in ACCOUNTS:
-        handle = account["handle"]
-        account_type = account["type"]
-        
-        if account_type not in account_types:
-            continue
-            
-        print(f"--- Processing {handle} ({account_type}) ---")
+    with ContentGeneration(account_types) as generation:
+        for account in ACCOUNTS:
+            handle = account["handle"]
+            account_type = account["type"]
         
-        # Show content quality info for TechNews
-        if account_type == "technews":
-            cands = fetch_candidates()
-            if not cands:
-                print("No candidates found; skipping TechNews.")
+            if account_type not in account_types:
                 continue
-            print(f"📊 Content Quality: {len(cands)} pre-scored candidates")
             
-            # Filter out already used articles BEFORE generating content
-            cands = filter_used_articles(cands, technews_memory)
-            if not cands:
-                print("❌ No new articles available after filtering; all candidates have been used recently.")
-                continue
-                
-            if cands:
-                top_candidate = cands[0]
-                print(f"🏆 Top candidate: {top_candidate['title'][:80]}... (Score: {top_candidate['score']})")
-                print(f"📰 Source: {top_candidate['source']}")
-                print()
+            print(f"--- Processing {handle} ({account_type}) ---")
         
-        try:
-            if account_type == "technews":
-                # Generate and post TechNews as single tweet
-                choice = write_technews(cands)
-                tweet = choice.get("tweet", "").strip()
-                src = choice.get("source_url")
-                image_url = extract_image_url(src) if src else None
-
-                print(f"Tweet: {tweet}")
-                print(f"Source: {src}")
-                print(f"Image: {image_url or '(none)'}")
-                
-                # Track in memory BEFORE posting to prevent duplicates
-                article_id = extract_article_identifier(tweet, src)
-                if article_id:
-                    add_to_memory(technews_memory, "articles", article_id, TECHNEWS_MEMORY_FILE)
-                    print(f"📝 Added article '{article_id}' to technews memory")
-                
-                # Post directly to Twitter
-                print("\n🐦 Posting TechNews directly to Twitter...")
-                post_to_twitter(tweet, handle)
-                
-            elif account_type == "books":
-                # Generate and post Books as 6-tweet thread
-                choice = write_books_thread()
-                if not choice:
-                    print("❌ Failed to generate book content")
-                    continue
-                
-                print(f"📖 Generated Book Thread:")
-                print(f"Book: {choice['book_title']} by {choice['author']}")
-                print(f"Summary: {choice['summary']}")
-                print(f"\nTop 5 Takeaways:")
-                for i, takeaway in enumerate(choice['takeaways'], 1):
-                    print(f"{i}. {takeaway}")
-                
-                # Create the tweet thread
-                tweets = create_books_thread(choice)
-                
-                print(f"\n🐦 Tweet Thread Preview:")
-                for i, tweet in enumerate(tweets, 1):
-                    print(f"\n--- Tweet {i}/6 ({len(tweet)} chars) ---")
-                    print(tweet)
-                
-                # Track in memory
-                book_title = extract_book_title(choice)
-                if book_title:
-                    add_to_memory(books_memory, "books", book_title, BOOKS_MEMORY_FILE)
-                    print(f"📝 Added '{book_title}' to books memory")
-                
-                # Post thread directly to Twitter
-                print(f"\n🐦 Posting book thread to Twitter...")
-                success = post_tweet_thread(tweets, handle)
-                if not success:
-                    print("⚠️  Book thread posting failed - this may be due to duplicate content or rate limiting")
-                    print("   The book has been added to memory to prevent future duplicates")
-                
-            elif account_type == "quotes":
-                # Generate and post Quotes as 4-tweet thread
-                choice = write_quotes_thread()
-                if not choice:
-                    print("❌ Failed to generate quotes content")
-                    continue
-                
-                print(f"💭 Generated Quotes Thread:")
-                print(f"Topic: {choice['topic']}")
-                print(f"\nTop 3 Quotes:")
-                for i, quote_data in enumerate(choice['quotes'], 1):
-                    print(f"{i}. \"{quote_data['quote']}\" - {quote_data['author']}, {quote_data['year']}")
-                
-                # Create the tweet thread
-                tweets = create_quotes_thread(choice)
-                
-                print(f"\n🐦 Tweet Thread Preview:")
-                for i, tweet in enumerate(tweets, 1):
-                    print(f"\n--- Tweet {i}/4 ({len(tweet)} chars) ---")
-                    print(tweet)
-                
-                # Track in memory
-                quote_topic = extract_quote_topic(choice)
-                if quote_topic:
-                    add_to_memory(quotes_memory, "quotes", quote_topic, QUOTES_MEMORY_FILE)
-                    print(f"📝 Added topic '{quote_topic}' to quotes memory")
-                
-                # Post thread directly to Twitter
-                print(f"\n🐦 Posting quotes thread to Twitter...")
-                success = post_tweet_thread(tweets, handle)
-                if not success:
-                    print("⚠️  Quotes thread posting failed - this may be due to duplicate content or rate limiting")
-                    print("   The topic has been added to memory to prevent future duplicates")
-                
-            elif account_type == "reddit":
-                # Generate and post Reddit summary as single tweet
-                reddit_posts = fetch_reddit_posts(limit=20)
-                if not reddit_posts:
-                    print("❌ Failed to fetch Reddit posts")
-                    continue
-                
-                print(f"🔴 Fetched {len(reddit_posts)} Reddit posts")
-                print(f"Top 5 posts:")
-                for i, post in enumerate(reddit_posts[:5], 1):
-                    print(f"{i}. r/{post['subreddit']}: {post['title'][:60]}...")
-                
-                choice = write_reddit_summary(reddit_posts)
-                if not choice:
-                    print("❌ Failed to generate Reddit content")
-                    continue
-                
-                tweet = choice.get("tweet", "").strip()
-                print(f"\n🔴 Generated Reddit Summary:")
-                print(f"Tweet: {tweet}")
-                print(f"Character count: {len(tweet)}/280")
-                
-                # Track in memory
-                for post in choice.get('posts', []):
-                    post_id = extract_reddit_identifier(post)
-                    if post_id:
-                        add_to_memory(reddit_memory, "posts", post_id, REDDIT_MEMORY_FILE)
-                
-                # Post directly to Twitter
-                print(f"\n🐦 Posting Reddit summary to Twitter...")
-                success = post_to_twitter(tweet, handle)
-                if not success:
-                    print("⚠️  Reddit summary posting failed")
-                
-            elif account_type == "product":
-                # Generate and post ProductHunt product as single tweet
-                product_list = fetch_producthunt_products(limit=10)
-                if not product_list:
-                    print("❌ Failed to fetch ProductHunt products")
-                    continue
-                
-                print(f"🚀 Fetched {len(product_list)} ProductHunt products")
-                print(f"Top product: {product_list[0]['name']} ({product_list[0]['category']})")
-                
-                choice = write_product_summary(product_list)
-                if not choice:
-                    print("❌ Failed to generate product content")
-                    continue
-                
-                tweet = choice.get("tweet", "").strip()
-                print(f"\n🚀 Generated Product Summary:")
-                print(f"Tweet: {tweet}")
-                print(f"Character count: {len(tweet)}/280")
-                
-                # Track in memory
-                product_id = extract_product_identifier(choice.get('product', {}))
-                if product_id:
-                    add_to_memory(products_memory, "products", product_id, PRODUCTS_MEMORY_FILE)
-                
-                # Post directly to Twitter
-                print(f"\n🐦 Posting product summary to Twitter...")
-                success = post_to_twitter(tweet, handle)
-                if not success:
-                    print("⚠️  Product summary posting failed")
-                
-            elif account_type == "crypto":
-                # Generate and post Crypto as single tweet
-                crypto_cands = fetch_crypto_candidates()
-                if not crypto_cands:
-                    print("❌ No crypto candidates found; skipping Crypto.")
-                    continue
-                print(f"📊 Crypto Content Quality: {len(crypto_cands)} pre-scored candidates")
-                
-                # Filter out already used articles BEFORE generating content
-                crypto_cands = filter_used_articles(crypto_cands, crypto_memory)
-                if not crypto_cands:
-                    print("❌ No new crypto articles available after filtering; all candidates have been used recently.")
-                    continue
-                    
-                if crypto_cands:
-                    top_candidate = crypto_cands[0]
-                    print(f"🏆 Top candidate: {top_candidate['title'][:80]}... (Score: {top_candidate['score']})")
-                    print(f"📰 Source: {top_candidate['source']}")
+            with run_lock(account_type) as acquired:
+                if not acquired:
+                    print(f"⏭️  Skipping {handle}: another run is processing {account_type}")
                     print()
-                
-                choice = write_crypto(crypto_cands)
-                tweet = choice.get("tweet", "").strip()
-                src = choice.get("source_url")
-                image_url = extract_image_url(src) if src else None
-
-                print(f"Tweet: {tweet}")
-                print(f"Source: {src}")
-                print(f"Image: {image_url or '(none)'}")
-                
-                # Track in memory BEFORE posting to prevent duplicates
-                article_id = extract_article_identifier(tweet, src)
-                if article_id:
-                    add_to_memory(crypto_memory, "articles", article_id, CRYPTO_MEMORY_FILE)
-                    print(f"📝 Added article '{article_id}' to crypto memory")
-                
-                # Post directly to Twitter
-                print("\n🐦 Posting Crypto directly to Twitter...")
-                success = post_to_twitter(tweet, handle)
-                if not success:
-                    print("⚠️  Crypto posting failed")
-                
-            else:
-                print(f"Unknown account type: {account_type}")
-                continue
+                    continue
             
-            print()
+                memory_session = MemorySession()
+                try:
+                    success = False
+                    if account_type == "technews":
+                        # Generate and post TechNews as single tweet
+                        choice = generation.result(account_type)
+                        if not choice:
+                            continue
+                        tweet = choice.get("tweet", "").strip()
+                        src = choice.get("source_url")
+                        image_url = extract_image_url(src) if src else None
+
+                        print(f"Tweet: {tweet}")
+                        print(f"Source: {src}")
+                        print(f"Image: {image_url or '(none)'}")
+                
+                        # Track in memory BEFORE posting to prevent duplicates
+                        article_id = extract_article_identifier(tweet, src)
+                        if article_id:
+                            add_to_memory(get_memory(TECHNEWS_MEMORY_FILE), "articles", article_id, TECHNEWS_MEMORY_FILE, memory_session)
+                            print(f"📝 Added article '{article_id}' to technews memory")
+                
+                        # Post directly to Twitter
+                        print("\n🐦 Posting TechNews directly to Twitter...")
+                        success = post_to_twitter(tweet, handle)
+                
+                    elif account_type == "books":
+                        # Generate and post Books as 6-tweet thread
+                        choice = generation.result(account_type)
+                        if not choice:
+                            continue
+                
+                        print(f"📖 Generated Book Thread:")
+                        print(f"Book: {choice['book_title']} by {choice['author']}")
+                        print(f"Summary: {choice['summary']}")
+                        print(f"\nTop 5 Takeaways:")
+                        for i, takeaway in enumerate(choice['takeaways'], 1):
+                            print(f"{i}. {takeaway}")
+                
+                        # Create the tweet thread
+                        tweets = create_books_thread(choice)
+                
+                        print(f"\n🐦 Tweet Thread Preview:")
+                        for i, tweet in enumerate(tweets, 1):
+                            print(f"\n--- Tweet {i}/6 ({len(tweet)} chars) ---")
+                            print(tweet)
+                
+                        # Track in memory
+                        book_title = extract_book_title(choice)
+                        if book_title:
+                            add_to_memory(get_memory(BOOKS_MEMORY_FILE), "books", book_title, BOOKS_MEMORY_FILE, memory_session)
+                            print(f"📝 Added '{book_title}' to books memory")
+                
+                        # Post thread directly to Twitter
+                        print(f"\n🐦 Posting book thread to Twitter...")
+                        success = post_tweet_thread(tweets, handle)
+                        settle_backlog(choice, success)
+                        if not success:
+                            print("⚠️  Book thread posting failed - this may be due to duplicate content or rate limiting")
+                            print("   The book has been added to memory to prevent future duplicates")
+                
+                    elif account_type == "quotes":
+                        # Generate and post Quotes as 4-tweet thread
+                        choice = generation.result(account_type)
+                        if not choice:
+                            continue
+                
+                        print(f"💭 Generated Quotes Thread:")
+                        print(f"Topic: {choice['topic']}")
+                        print(f"\nTop 3 Quotes:")
+                        for i, quote_data in enumerate(choice['quotes'], 1):
+                            print(f"{i}. \"{quote_data['quote']}\" - {quote_data['author']}, {quote_data['year']}")
+                
+                        # Create the tweet thread
+                        tweets = create_quotes_thread(choice)
+                
+                        print(f"\n🐦 Tweet Thread Preview:")
+                        for i, tweet in enumerate(tweets, 1):
+                            print(f"\n--- Tweet {i}/4 ({len(tweet)} chars) ---")
+                            print(tweet)
+                
+                        # Track in memory
+                        quote_topic = extract_quote_topic(choice)
+                        if quote_topic:
+                            add_to_memory(get_memory(QUOTES_MEMORY_FILE), "quotes", quote_topic, QUOTES_MEMORY_FILE, memory_session)
+                            print(f"📝 Added topic '{quote_topic}' to quotes memory")
+                
+                        # Post thread directly to Twitter
+                        print(f"\n🐦 Posting quotes thread to Twitter...")
+                        success = post_tweet_thread(tweets, handle)
+                        settle_backlog(choice, success)
+                        if not success:
+                            print("⚠️  Quotes thread posting failed - this may be due to duplicate content or rate limiting")
+                            print("   The topic has been added to memory to prevent future duplicates")
+                
+                    elif account_type == "reddit":
+                        # Generate and post Reddit summary as single tweet
+                        choice = generation.result(account_type)
+                        if not choice:
+                            continue
+                
+                        tweet = choice.get("tweet", "").strip()
+                        print(f"\n🔴 Generated Reddit Summary:")
+                        print(f"Tweet: {tweet}")
+                        print(f"Character count: {tweet_length(tweet)}/{TWEET_MAX_LENGTH}")
+                
+                        # Track in memory
+                        for post in choice.get('posts', []):
+                            post_id = extract_reddit_identifier(post)
+                            if post_id:
+                                add_to_memory(get_memory(REDDIT_MEMORY_FILE), "posts", post_id, REDDIT_MEMORY_FILE, memory_session)
+                
+                        # Post directly to Twitter
+                        print(f"\n🐦 Posting Reddit summary to Twitter...")
+                        success = post_to_twitter(tweet, handle)
+                        if not success:
+                            print("⚠️  Reddit summary posting failed")
+                
+                    elif account_type == "product":
+                        # Generate and post ProductHunt product as single tweet
+                        choice = generation.result(account_type)
+                        if not choice:
+                            continue
+                
+                        tweet = choice.get("tweet", "").strip()
+                        print(f"\n🚀 Generated Product Summary:")
+                        print(f"Tweet: {tweet}")
+                        print(f"Character count: {tweet_length(tweet)}/{TWEET_MAX_LENGTH}")
+                
+                        # Track in memory
+                        product_id = extract_product_identifier(choice.get('product', {}))
+                        if product_id:
+                            add_to_memory(get_memory(PRODUCTS_MEMORY_FILE), "products", product_id, PRODUCTS_MEMORY_FILE, memory_session)
+                
+                        # Post directly to Twitter
+                        print(f"\n🐦 Posting product summary to Twitter...")
+                        success = post_to_twitter(tweet, handle)
+                        if not success:
+                            print("⚠️  Product summary posting failed")
+                
+                    elif account_type == "crypto":
+                        # Generate and post Crypto as single tweet
+                        choice = generation.result(account_type)
+                        if not choice:
+                            continue
+                        tweet = choice.get("tweet", "").strip()
+                        src = choice.get("source_url")
+                        image_url = extract_image_url(src) if src else None
+
+                        print(f"Tweet: {tweet}")
+                        print(f"Source: {src}")
+                        print(f"Image: {image_url or '(none)'}")
+                
+                        # Track in memory BEFORE posting to prevent duplicates
+                        article_id = extract_article_identifier(tweet, src)
+                        if article_id:
+                            add_to_memory(get_memory(CRYPTO_MEMORY_FILE), "articles", article_id, CRYPTO_MEMORY_FILE, memory_session)
+                            print(f"📝 Added article '{article_id}' to crypto memory")
+                
+                        # Post directly to Twitter
+                        print("\n🐦 Posting Crypto directly to Twitter...")
+                        success = post_to_twitter(tweet, handle)
+                        if not success:
+                            print("⚠️  Crypto posting failed")
+                
+                    else:
+                        print(f"Unknown account type: {account_type}")
+                        continue
+            
+                    # Persist this account's memory in one transaction, depending on the outcome
+                    memory_session.finish(success)
+                    print()
             
-            # Add delay between account types to avoid overwhelming Twitter's API
-            if account_type != "technews":  # Skip delay after technews since it's first
-                print("⏳ Waiting 5 seconds before processing next account...")
-                time.sleep(5)
-                print()
+                    # Add delay between account types to avoid overwhelming Twitter's API. Pre-generated
+                    # accounts skip it: each posts as a different Twitter user (separate rate limits)
+                    # and the delay would otherwise dominate a parallel run
+                    if account_type != "technews" and account_type not in generation.pregenerated:
+                        print("⏳ Waiting 5 seconds before processing next account...")
+                        time.sleep(5)
+                        print()
             
-        except Exception as e:
-            print(f"❌ Error processing {handle}: {e}")
-            print()
+                except Exception as e:
+                    memory_session.rollback()
+                    print(f"❌ Error processing {handle}: {e}")
+                    print()
 
 def main():
     """Run all account types"""
@@ -1541,212 +3492,191 @@ def main():
 
     print(f"Found {len(cands)} candidates from RSS feeds\n")
 
-    # Load memory for books, quotes, tech news, reddit posts, and products
-    books_memory = load_books_memory()
-    quotes_memory = load_quotes_memory()
-    technews_memory = load_technews_memory()
-    reddit_memory = load_reddit_memory()
-    products_memory = load_products_memory()
-    print(f"📚 Books memory: {len(books_memory['used_books'])} books used in last {MAX_MEMORY} runs")
-    print(f"💭 Quotes memory: {len(quotes_memory['used_quotes'])} quotes used in last {MAX_MEMORY} runs")
-    print(f"📰 TechNews memory: {len(technews_memory['used_articles'])} articles used in last {MAX_MEMORY} runs")
-    print(f"🔴 Reddit memory: {len(reddit_memory['used_posts'])} posts used in last {MAX_MEMORY} runs")
-    print(f"🚀 Products memory: {len(products_memory['used_products'])} products used in last {MAX_MEMORY} runs\n")
+    # Crypto is posted through `python main.py crypto`; the full run covers the other accounts
+    account_types = [account["type"] for account in ACCOUNTS if account["type"] != "crypto"]
+
+    # Show memory for the account types this run posts to (memory is loaded lazily, per type)
+    for account_type in account_types:
+        print_account_memory(account_type)
+    print()
 
     # Process each account type
-    for account in ACCOUNTS:
-        handle = account["handle"]
-        account_type = account["type"]
+    with ContentGeneration(account_types, cands) as generation:
+        for account in ACCOUNTS:
+            handle = account["handle"]
+            account_type = account["type"]
         
-        print(f"--- Processing {handle} ({account_type}) ---")
-        
-        # Show content quality info for TechNews
-        if account_type == "technews":
-            print(f"📊 Content Quality: {len(cands)} pre-scored candidates")
-            
-            # Filter out already used articles BEFORE generating content
-            cands = filter_used_articles(cands, technews_memory)
-            if not cands:
-                print("❌ No new articles available after filtering; all candidates have been used recently.")
+            if account_type not in account_types:
                 continue
-                
-            if cands:
-                top_candidate = cands[0]
-                print(f"🏆 Top candidate: {top_candidate['title'][:80]}... (Score: {top_candidate['score']})")
-                print(f"📰 Source: {top_candidate['source']}")
-                print()
+            
+            print(f"--- Processing {handle} ({account_type}) ---")
         
-        try:
-            if account_type == "technews":
-                # Generate and post TechNews as single tweet
-                choice = write_technews(cands)
-                tweet = choice.get("tweet", "").strip()
-                src = choice.get("source_url")
-                image_url = extract_image_url(src) if src else None
-
-                print(f"Tweet: {tweet}")
-                print(f"Source: {src}")
-                print(f"Image: {image_url or '(none)'}")
-                
-                # Track in memory BEFORE posting to prevent duplicates
-                article_id = extract_article_identifier(tweet, src)
-                if article_id:
-                    add_to_memory(technews_memory, "articles", article_id, TECHNEWS_MEMORY_FILE)
-                    print(f"📝 Added article '{article_id}' to technews memory")
-                
-                # Post directly to Twitter
-                print("\n🐦 Posting TechNews directly to Twitter...")
-                post_to_twitter(tweet, handle)
-                
-            elif account_type == "books":
-                # Generate and post Books as 6-tweet thread
-                choice = write_books_thread()
-                if not choice:
-                    print("❌ Failed to generate book content")
-                    continue
-                
-                print(f"📖 Generated Book Thread:")
-                print(f"Book: {choice['book_title']} by {choice['author']}")
-                print(f"Summary: {choice['summary']}")
-                print(f"\nTop 5 Takeaways:")
-                for i, takeaway in enumerate(choice['takeaways'], 1):
-                    print(f"{i}. {takeaway}")
-                
-                # Create the tweet thread
-                tweets = create_books_thread(choice)
-                
-                print(f"\n🐦 Tweet Thread Preview:")
-                for i, tweet in enumerate(tweets, 1):
-                    print(f"\n--- Tweet {i}/6 ({len(tweet)} chars) ---")
-                    print(tweet)
-                
-                # Track in memory
-                book_title = extract_book_title(choice)
-                if book_title:
-                    add_to_memory(books_memory, "books", book_title, BOOKS_MEMORY_FILE)
-                    print(f"📝 Added '{book_title}' to books memory")
-                
-                # Post thread directly to Twitter
-                print(f"\n🐦 Posting book thread to Twitter...")
-                success = post_tweet_thread(tweets, handle)
-                if not success:
-                    print("⚠️  Book thread posting failed - this may be due to duplicate content or rate limiting")
-                    print("   The book has been added to memory to prevent future duplicates")
-                
-            elif account_type == "quotes":
-                # Generate and post Quotes as 4-tweet thread
-                choice = write_quotes_thread()
-                if not choice:
-                    print("❌ Failed to generate quotes content")
-                    continue
-                
-                print(f"💭 Generated Quotes Thread:")
-                print(f"Topic: {choice['topic']}")
-                print(f"\nTop 3 Quotes:")
-                for i, quote_data in enumerate(choice['quotes'], 1):
-                    print(f"{i}. \"{quote_data['quote']}\" - {quote_data['author']}, {quote_data['year']}")
-                
-                # Create the tweet thread
-                tweets = create_quotes_thread(choice)
-                
-                print(f"\n🐦 Tweet Thread Preview:")
-                for i, tweet in enumerate(tweets, 1):
-                    print(f"\n--- Tweet {i}/4 ({len(tweet)} chars) ---")
-                    print(tweet)
-                
-                # Track in memory
-                quote_topic = extract_quote_topic(choice)
-                if quote_topic:
-                    add_to_memory(quotes_memory, "quotes", quote_topic, QUOTES_MEMORY_FILE)
-                    print(f"📝 Added topic '{quote_topic}' to quotes memory")
-                
-                # Post thread directly to Twitter
-                print(f"\n🐦 Posting quotes thread to Twitter...")
-                success = post_tweet_thread(tweets, handle)
-                if not success:
-                    print("⚠️  Quotes thread posting failed - this may be due to duplicate content or rate limiting")
-                    print("   The topic has been added to memory to prevent future duplicates")
-                
-            elif account_type == "reddit":
-                # Generate and post Reddit summary as single tweet
-                reddit_posts = fetch_reddit_posts(limit=20)
-                if not reddit_posts:
-                    print("❌ Failed to fetch Reddit posts")
-                    continue
-                
-                print(f"🔴 Fetched {len(reddit_posts)} Reddit posts")
-                print(f"Top 5 posts:")
-                for i, post in enumerate(reddit_posts[:5], 1):
-                    print(f"{i}. r/{post['subreddit']}: {post['title'][:60]}...")
-                
-                choice = write_reddit_summary(reddit_posts)
-                if not choice:
-                    print("❌ Failed to generate Reddit content")
-                    continue
-                
-                tweet = choice.get("tweet", "").strip()
-                print(f"\n🔴 Generated Reddit Summary:")
-                print(f"Tweet: {tweet}")
-                print(f"Character count: {len(tweet)}/280")
-                
-                # Track in memory
-                for post in choice.get('posts', []):
-                    post_id = extract_reddit_identifier(post)
-                    if post_id:
-                        add_to_memory(reddit_memory, "posts", post_id, REDDIT_MEMORY_FILE)
-                
-                # Post directly to Twitter
-                print(f"\n🐦 Posting Reddit summary to Twitter...")
-                success = post_to_twitter(tweet, handle)
-                if not success:
-                    print("⚠️  Reddit summary posting failed")
-                
-            elif account_type == "product":
-                # Generate and post ProductHunt product as single tweet
-                product_list = fetch_producthunt_products(limit=10)
-                if not product_list:
-                    print("❌ Failed to fetch ProductHunt products")
-                    continue
-                
-                print(f"🚀 Fetched {len(product_list)} ProductHunt products")
-                print(f"Top product: {product_list[0]['name']} ({product_list[0]['category']})")
-                
-                choice = write_product_summary(product_list)
-                if not choice:
-                    print("❌ Failed to generate product content")
+            with run_lock(account_type) as acquired:
+                if not acquired:
+                    print(f"⏭️  Skipping {handle}: another run is processing {account_type}")
+                    print()
                     continue
-                
-                tweet = choice.get("tweet", "").strip()
-                print(f"\n🚀 Generated Product Summary:")
-                print(f"Tweet: {tweet}")
-                print(f"Character count: {len(tweet)}/280")
-                
-                # Track in memory
-                product_id = extract_product_identifier(choice.get('product', {}))
-                if product_id:
-                    add_to_memory(products_memory, "products", product_id, PRODUCTS_MEMORY_FILE)
-                
-                # Post directly to Twitter
-                print(f"\n🐦 Posting product summary to Twitter...")
-                success = post_to_twitter(tweet, handle)
-                if not success:
-                    print("⚠️  Product summary posting failed")
-                
-            else:
-                print(f"Unknown account type: {account_type}")
-                continue
             
-            print()
+                memory_session = MemorySession()
+                try:
+                    success = False
+                    if account_type == "technews":
+                        # Generate and post TechNews as single tweet
+                        choice = generation.result(account_type)
+                        if not choice:
+                            continue
+                        tweet = choice.get("tweet", "").strip()
+                        src = choice.get("source_url")
+                        image_url = extract_image_url(src) if src else None
+
+                        print(f"Tweet: {tweet}")
+                        print(f"Source: {src}")
+                        print(f"Image: {image_url or '(none)'}")
+                
+                        # Track in memory BEFORE posting to prevent duplicates
+                        article_id = extract_article_identifier(tweet, src)
+                        if article_id:
+                            add_to_memory(get_memory(TECHNEWS_MEMORY_FILE), "articles", article_id, TECHNEWS_MEMORY_FILE, memory_session)
+                            print(f"📝 Added article '{article_id}' to technews memory")
+                
+                        # Post directly to Twitter
+                        print("\n🐦 Posting TechNews directly to Twitter...")
+                        success = post_to_twitter(tweet, handle)
+                
+                    elif account_type == "books":
+                        # Generate and post Books as 6-tweet thread
+                        choice = generation.result(account_type)
+                        if not choice:
+                            continue
+                
+                        print(f"📖 Generated Book Thread:")
+                        print(f"Book: {choice['book_title']} by {choice['author']}")
+                        print(f"Summary: {choice['summary']}")
+                        print(f"\nTop 5 Takeaways:")
+                        for i, takeaway in enumerate(choice['takeaways'], 1):
+                            print(f"{i}. {takeaway}")
+                
+                        # Create the tweet thread
+                        tweets = create_books_thread(choice)
+                
+                        print(f"\n🐦 Tweet Thread Preview:")
+                        for i, tweet in enumerate(tweets, 1):
+                            print(f"\n--- Tweet {i}/6 ({len(tweet)} chars) ---")
+                            print(tweet)
+                
+                        # Track in memory
+                        book_title = extract_book_title(choice)
+                        if book_title:
+                            add_to_memory(get_memory(BOOKS_MEMORY_FILE), "books", book_title, BOOKS_MEMORY_FILE, memory_session)
+                            print(f"📝 Added '{book_title}' to books memory")
+                
+                        # Post thread directly to Twitter
+                        print(f"\n🐦 Posting book thread to Twitter...")
+                        success = post_tweet_thread(tweets, handle)
+                        settle_backlog(choice, success)
+                        if not success:
+                            print("⚠️  Book thread posting failed - this may be due to duplicate content or rate limiting")
+                            print("   The book has been added to memory to prevent future duplicates")
+                
+                    elif account_type == "quotes":
+                        # Generate and post Quotes as 4-tweet thread
+                        choice = generation.result(account_type)
+                        if not choice:
+                            continue
+                
+                        print(f"💭 Generated Quotes Thread:")
+                        print(f"Topic: {choice['topic']}")
+                        print(f"\nTop 3 Quotes:")
+                        for i, quote_data in enumerate(choice['quotes'], 1):
+                            print(f"{i}. \"{quote_data['quote']}\" - {quote_data['author']}, {quote_data['year']}")
+                
+                        # Create the tweet thread
+                        tweets = create_quotes_thread(choice)
+                
+                        print(f"\n🐦 Tweet Thread Preview:")
+                        for i, tweet in enumerate(tweets, 1):
+                            print(f"\n--- Tweet {i}/4 ({len(tweet)} chars) ---")
+                            print(tweet)
+                
+                        # Track in memory
+                        quote_topic = extract_quote_topic(choice)
+                        if quote_topic:
+                            add_to_memory(get_memory(QUOTES_MEMORY_FILE), "quotes", quote_topic, QUOTES_MEMORY_FILE, memory_session)
+                            print(f"📝 Added topic '{quote_topic}' to quotes memory")
+                
+                        # Post thread directly to Twitter
+                        print(f"\n🐦 Posting quotes thread to Twitter...")
+                        success = post_tweet_thread(tweets, handle)
+                        settle_backlog(choice, success)
+                        if not success:
+                            print("⚠️  Quotes thread posting failed - this may be due to duplicate content or rate limiting")
+                            print("   The topic has been added to memory to prevent future duplicates")
+                
+                    elif account_type == "reddit":
+                        # Generate and post Reddit summary as single tweet
+                        choice = generation.result(account_type)
+                        if not choice:
+                            continue
+                
+                        tweet = choice.get("tweet", "").strip()
+                        print(f"\n🔴 Generated Reddit Summary:")
+                        print(f"Tweet: {tweet}")
+                        print(f"Character count: {tweet_length(tweet)}/{TWEET_MAX_LENGTH}")
+                
+                        # Track in memory
+                        for post in choice.get('posts', []):
+                            post_id = extract_reddit_identifier(post)
+                            if post_id:
+                                add_to_memory(get_memory(REDDIT_MEMORY_FILE), "posts", post_id, REDDIT_MEMORY_FILE, memory_session)
+                
+                        # Post directly to Twitter
+                        print(f"\n🐦 Posting Reddit summary to Twitter...")
+                        success = post_to_twitter(tweet, handle)
+                        if not success:
+                            print("⚠️  Reddit summary posting failed")
+                
+                    elif account_type == "product":
+                        # Generate and post ProductHunt product as single tweet
+                        choice = generation.result(account_type)
+                        if not choice:
+                            continue
+                
+                        tweet = choice.get("tweet", "").strip()
+                        print(f"\n🚀 Generated Product Summary:")
+                        print(f"Tweet: {tweet}")
+                        print(f"Character count: {tweet_length(tweet)}/{TWEET_MAX_LENGTH}")
+                
+                        # Track in memory
+                        product_id = extract_product_identifier(choice.get('product', {}))
+                        if product_id:
+                            add_to_memory(get_memory(PRODUCTS_MEMORY_FILE), "products", product_id, PRODUCTS_MEMORY_FILE, memory_session)
+                
+                        # Post directly to Twitter
+                        print(f"\n🐦 Posting product summary to Twitter...")
+                        success = post_to_twitter(tweet, handle)
+                        if not success:
+                            print("⚠️  Product summary posting failed")
+                
+                    else:
+                        print(f"Unknown account type: {account_type}")
+                        continue
             
-            # Add delay between account types to avoid overwhelming Twitter's API
-            if account_type != "technews":  # Skip delay after technews since it's first
-                print("⏳ Waiting 5 seconds before processing next account...")
-                time.sleep(5)
-                print()
+                    # Persist this account's memory in one transaction, depending on the outcome
+                    memory_session.finish(success)
+                    print()
             
-        except Exception as e:
-            print(f"❌ Error processing {handle}: {e}")
-            print()
+                    # Add delay between account types to avoid overwhelming Twitter's API. Pre-generated
+                    # accounts skip it: each posts as a different Twitter user (separate rate limits)
+                    # and the delay would otherwise dominate a parallel run
+                    if account_type != "technews" and account_type not in generation.pregenerated:
+                        print("⏳ Waiting 5 seconds before processing next account...")
+                        time.sleep(5)
+                        print()
+            
+                except Exception as e:
+                    memory_session.rollback()
+                    print(f"❌ Error processing {handle}: {e}")
+                    print()
 
 if __name__ == "__main__":
     import sys
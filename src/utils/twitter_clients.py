@@ -0,0 +1,53 @@
+# ---------- Twitter Client Registry ----------
+# Credentials are indexed by account name once, and each account gets one long-lived tweepy.Client
+# whose session keeps its HTTPS connections alive, shared by the bot and the dashboard
+
+import os
+import threading
+import tweepy
+from requests.adapters import HTTPAdapter
+from config.twitter_dict import accounts_data
+
+TWITTER_POOL_SIZE = int(os.getenv("TWITTER_POOL_SIZE", "4"))  # keep-alive connections per account
+
+_accounts_by_name = {account["name"]: account for account in accounts_data}
+_clients = {}
+_user_ids = {}
+_clients_lock = threading.Lock()
+
+def get_twitter_account(account_name):
+    """Credentials of an account, or None if it is not configured"""
+    return _accounts_by_name.get(account_name)
+
+def get_twitter_client(account_name):
+    """Return the cached client of an account, creating it on first use (None if not configured)"""
+    with _clients_lock:
+        client = _clients.get(account_name)
+        if client is None:
+            account = _accounts_by_name.get(account_name)
+            if not account:
+                return None
+            client = tweepy.Client(
+                consumer_key=account["consumer_key"],
+                consumer_secret=account["consumer_secret"],
+                access_token=account["access_token"],
+                access_token_secret=account["access_token_secret"]
+            )
+            # No transport retries: a retried POST could publish the same tweet twice
+            adapter = HTTPAdapter(pool_connections=1, pool_maxsize=TWITTER_POOL_SIZE)
+            client.session.mount("https://", adapter)
+            _clients[account_name] = client
+        return client
+
+def get_twitter_user_id(account_name):
+    """User id of an account, looked up once per process (None if unavailable)"""
+    if account_name in _user_ids:
+        return _user_ids[account_name]
+    client = get_twitter_client(account_name)
+    if client is None:
+        return None
+    user = client.get_me()
+    if not user.data:
+        return None
+    _user_ids[account_name] = user.data.id
+    return user.data.id
@@ -0,0 +1,39 @@
+import os
+import sys
+from types import SimpleNamespace
+
+import pytest
+
+# The core module needs an API key at import time; tests never reach the API
+os.environ.setdefault("OPENAI_API_KEY", "test-key")
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+
+@pytest.fixture
+def llm(tmp_path, monkeypatch):
+    """Fake OpenAI client answering from a list of replies; state files live in tmp_path"""
+    import core.main as core
+    monkeypatch.setattr(core, "LLM_CACHE_FILE", str(tmp_path / "llm_cache.db"))
+    monkeypatch.setattr(core, "LLM_LEDGER_FILE", str(tmp_path / "llm_ledger.jsonl"))
+    monkeypatch.setattr(core, "LLM_LATENCY_FILE", str(tmp_path / "llm_latency.json"))
+    monkeypatch.setattr(core, "LLM_CACHE_BYPASS", False)
+    monkeypatch.setattr(core, "LLM_HEDGE", False)
+    fake = SimpleNamespace(replies=[], requests=0)
+
+    def create(**kwargs):
+        fake.requests += 1
+        content = fake.replies.pop(0) if len(fake.replies) > 1 else fake.replies[0]
+        return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=content))], usage=None)
+
+    monkeypatch.setattr(core, "client", SimpleNamespace(chat=SimpleNamespace(completions=SimpleNamespace(create=create))))
+    return fake
+
+
+@pytest.fixture
+def memory_store(tmp_path, monkeypatch):
+    """Run with the memory store and seen indexes under tmp_path"""
+    import core.main as core
+    monkeypatch.chdir(tmp_path)
+    core.reset_memory_connections()
+    yield
+    core.reset_memory_connections()
@@ -0,0 +1,25 @@
+import json
+
+import core.main as core
+
+
+def test_backlog_retries_ask_again_after_an_invalid_batch(llm, tmp_path, monkeypatch):
+    monkeypatch.setattr(core, "BACKLOG_FILE", str(tmp_path / "backlog.db"))
+    monkeypatch.setattr(core, "get_memory", lambda filename: {"used_quotes": []})
+    llm.replies = [json.dumps({"items": [{"topic": "Not a topic", "quotes": []}]})]
+    core.fill_backlog("quotes", target=2)
+    assert llm.requests == 3  # every attempt reached the model
+    assert core.backlog_counts() == {}
+
+
+def test_backlog_queues_valid_threads(llm, tmp_path, monkeypatch):
+    monkeypatch.setattr(core, "BACKLOG_FILE", str(tmp_path / "backlog.db"))
+    monkeypatch.setattr(core, "get_memory", lambda filename: {"used_quotes": []})
+    thread = {"topic": "Courage", "quotes": [{"quote": "Be brave.", "author": "Someone", "year": "1900"}] * 3}
+    llm.replies = [json.dumps({"items": [thread]})]
+    core.fill_backlog("quotes", target=1)
+    assert core.backlog_counts() == {"quotes": 1}
+    claimed = core.pop_backlog("quotes", [])
+    assert claimed["topic"] == "Courage"
+    core.settle_backlog(claimed, posted=False)  # a failed post puts it back
+    assert core.pop_backlog("quotes", [])["topic"] == "Courage"
@@ -0,0 +1,43 @@
+import threading
+import time
+
+import core.main as core
+
+
+def test_concurrent_callers_share_one_fetch(monkeypatch):
+    calls = []
+
+    def fetch(url):
+        calls.append(url)
+        time.sleep(0.1)
+        return core.feedparser.FeedParserDict(entries=[{"link": "https://example.com/1"}], href=url)
+
+    monkeypatch.setattr(core, "custom_feedparser", fetch)
+    core.reset_feed_run_cache()
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(core.get_feed("https://example.com/feed")))
+               for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(timeout=5)
+    assert len(calls) == 1
+    assert len(results) == 4 and all(len(feed.entries) == 1 for feed in results)
+
+
+def test_waiters_are_released_when_the_fetch_raises(monkeypatch):
+    def crash(url):
+        time.sleep(0.1)
+        raise RuntimeError("parser crashed")
+
+    monkeypatch.setattr(core, "custom_feedparser", crash)
+    core.reset_feed_run_cache()
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(core.get_feed("https://example.com/broken")))
+               for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(timeout=5)
+    assert not any(thread.is_alive() for thread in threads)
+    assert [len(feed.entries) for feed in results] == [0, 0, 0, 0]
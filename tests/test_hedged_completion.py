@@ -0,0 +1,92 @@
+import json
+import threading
+import time
+from types import SimpleNamespace
+
+import pytest
+
+import core.main as core
+
+MESSAGES = [{"role": "user", "content": "hello"}]
+
+
+@pytest.fixture
+def api(tmp_path, monkeypatch):
+    """Fake OpenAI client playing (delay, reply or exception) steps in request order"""
+    monkeypatch.setattr(core, "LLM_LEDGER_FILE", str(tmp_path / "llm_ledger.jsonl"))
+    monkeypatch.setattr(core, "LLM_LATENCY_FILE", str(tmp_path / "llm_latency.json"))
+    monkeypatch.setattr(core, "_llm_latencies", None)
+    monkeypatch.setattr(core, "LLM_HEDGE", False)
+    monkeypatch.setattr(core, "LLM_HEDGE_MODEL", "")
+    monkeypatch.setattr(core, "LLM_BACKOFF_SECONDS", 0)
+    fake = SimpleNamespace(steps=[], models=[])
+    lock = threading.Lock()
+
+    def create(model, **kwargs):
+        with lock:
+            fake.models.append(model)
+            delay, reply = fake.steps.pop(0)
+        time.sleep(delay)
+        if isinstance(reply, Exception):
+            raise reply
+        return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=reply))], usage=None)
+
+    monkeypatch.setattr(core, "client", SimpleNamespace(chat=SimpleNamespace(completions=SimpleNamespace(create=create))))
+    return fake
+
+
+def ledger():
+    try:
+        with open(core.LLM_LEDGER_FILE) as f:
+            return [json.loads(line) for line in f]
+    except FileNotFoundError:
+        return []
+
+
+def wait_for(condition, timeout=5):
+    end = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < end, "timed out waiting for background requests"
+        time.sleep(0.01)
+
+
+def test_hedge_wins_and_loser_is_sampled(api, monkeypatch):
+    monkeypatch.setattr(core, "LLM_HEDGE", True)
+    monkeypatch.setattr(core, "LLM_HEDGE_MODEL", "hedge-model")
+    monkeypatch.setattr(core, "hedge_delay", lambda: 0.05)
+    api.steps = [(0.5, "slow"), (0, "fast")]
+    content, answered_by, _ = core.hedged_completion(MESSAGES, 0.5, model="main-model")
+    assert (content, answered_by) == ("fast", "hedge-model")
+    wait_for(lambda: any(row["status"] == "hedge" for row in ledger()))
+    fast, slow = core.llm_latencies()
+    assert fast < 0.25 <= slow
+    assert [row["status"] for row in ledger()] == ["ok", "hedge"]
+
+
+def test_retryable_error_is_retried(api):
+    api.steps = [(0, TimeoutError("read timed out")), (0, "answer")]
+    content, _, _ = core.hedged_completion(MESSAGES, 0.5)
+    assert content == "answer"
+    assert len(api.models) == 2
+    assert ledger()[-1]["retries"] == 1
+    assert len(core.llm_latencies()) == 1
+
+
+def test_non_retryable_error_raises_after_one_attempt(api):
+    api.steps = [(0, ValueError("bad request")), (0, "never asked")]
+    with pytest.raises(ValueError):
+        core.hedged_completion(MESSAGES, 0.5)
+    assert len(api.models) == 1
+    assert ledger()[-1]["status"] == "error"
+
+
+def test_deadline_is_sampled_once(api, monkeypatch):
+    monkeypatch.setattr(core, "LLM_DEADLINE_SECONDS", 0.2)
+    api.steps = [(0.5, "too late")]
+    with pytest.raises(TimeoutError):
+        core.hedged_completion(MESSAGES, 0.5)
+    [sample] = core.llm_latencies()
+    assert 0.15 <= sample < 0.5
+    # The late answer is billed but not sampled a second time
+    wait_for(lambda: any(row["status"] == "hedge" for row in ledger()))
+    assert core.llm_latencies() == [sample]
@@ -0,0 +1,65 @@
+import random
+
+import pytest
+
+from core.main import (
+    calculate_content_score, calculate_crypto_content_score,
+    TECHNEWS_TITLE_RULES, CRYPTO_TITLE_RULES,
+)
+
+# Words whose keyword hits are the same for substring matching and word matching
+WORDS = [
+    "researchers", "study", "breakthrough", "quantum", "hackers", "exploited", "defi", "bitcoin",
+    "policy", "laws", "leaked", "celebrity", "update", "released", "pumping", "market", "new",
+    "chips", "startup", "funding", "ai", "the", "of", "for", "with", "climate", "energy",
+]
+SOURCES = ["hnrss.org", "www.techmeme.com", "news.mit.edu", "www.coindesk.com", "decrypt.co", "example.com"]
+
+
+def substring_score(item, rules):
+    """The original scorer: `any(word in title)` per rule"""
+    title, source = item["title"].lower(), item["source"].lower()
+    score = rules.source_bonus(source)
+    score += sum(weight for keywords, weight in rules.rules if any(k in title for k in keywords))
+    if len(title) > 60:
+        score += 5
+    return max(0, score)
+
+
+def make_items(count, seed=7):
+    rng = random.Random(seed)
+    return [{"title": " ".join(rng.choice(WORDS) for _ in range(rng.randint(3, 14))).capitalize(),
+             "source": rng.choice(SOURCES)} for _ in range(count)]
+
+
+@pytest.mark.parametrize("scorer, rules", [
+    (calculate_content_score, TECHNEWS_TITLE_RULES),
+    (calculate_crypto_content_score, CRYPTO_TITLE_RULES),
+])
+def test_matches_substring_scorer(scorer, rules):
+    for item in make_items(2000):
+        assert scorer(item) == substring_score(item, rules), item["title"]
+
+
+@pytest.mark.parametrize("title, tech, crypto", [
+    ("Researchers release update", 10, 8),
+    ("Hackers exploited a DeFi protocol", 0, 20),
+    ("Celebrity leaks rumored deal", 0, 0),
+])
+def test_stem_keywords_match_inflections(title, tech, crypto):
+    item = {"title": title, "source": "example.com"}
+    assert calculate_content_score(item) == tech
+    assert calculate_crypto_content_score(item) == crypto
+
+
+def test_short_keywords_only_match_whole_words():
+    said = {"title": "He said the second quantum chip", "source": "example.com"}
+    assert calculate_content_score(said) == 8  # quantum only, no "ai"
+    assert calculate_crypto_content_score(said) == 0  # no "sec"
+    assert calculate_content_score({"title": "New AI chips", "source": "example.com"}) == 10
+    assert calculate_crypto_content_score({"title": "SEC sues exchange", "source": "example.com"}) == 15
+
+
+def test_each_rule_counts_once():
+    item = {"title": "Research study breakthrough", "source": "example.com"}
+    assert calculate_content_score(item) == 15
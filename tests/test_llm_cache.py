@@ -0,0 +1,41 @@
+import json
+
+import core.main as core
+
+
+MESSAGES = [{"role": "user", "content": "hello"}]
+JSON = {"type": "json_object"}
+
+
+def accept_ok(raw):
+    return json.loads(raw).get("ok")
+
+
+def test_valid_response_is_cached(llm):
+    llm.replies = ['{"ok": 1}']
+    assert core.complete_chat(MESSAGES, 0.5, JSON, parse=accept_ok) == 1
+    assert core.complete_chat(MESSAGES, 0.5, JSON, parse=accept_ok) == 1
+    assert llm.requests == 1
+
+
+def test_rejected_response_is_not_cached(llm):
+    llm.replies = ['{"ok": null}', '{"ok": 2}']
+    assert core.complete_chat(MESSAGES, 0.5, JSON, parse=accept_ok) is None
+    assert core.complete_chat(MESSAGES, 0.5, JSON, parse=accept_ok) == 2
+    assert llm.requests == 2
+
+
+def test_cached_response_rejected_later_is_dropped(llm):
+    llm.replies = ['{"ok": 1}', '{"ok": 2}']
+    core.complete_chat(MESSAGES, 0.5, JSON, parse=accept_ok)
+    stricter = lambda raw: json.loads(raw)["ok"] if json.loads(raw)["ok"] == 2 else None  # noqa: E731
+    assert core.complete_chat(MESSAGES, 0.5, JSON, parse=stricter) == 2
+    assert llm.requests == 2
+
+
+def test_bypass_skips_the_cache(llm, monkeypatch):
+    llm.replies = ['{"ok": 1}']
+    core.complete_chat(MESSAGES, 0.5, JSON, parse=accept_ok)
+    monkeypatch.setattr(core, "LLM_CACHE_BYPASS", True)
+    core.complete_chat(MESSAGES, 0.5, JSON, parse=accept_ok)
+    assert llm.requests == 2
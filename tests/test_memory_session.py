@@ -0,0 +1,48 @@
+import core.main as core
+
+QUOTES = core.QUOTES_MEMORY_FILE
+
+
+def stored_quotes():
+    return core.load_memory(QUOTES)["used_quotes"]
+
+
+def test_commit_writes_every_buffered_item(memory_store):
+    memory = {"used_quotes": []}
+    session = core.MemorySession()
+    core.add_to_memory(memory, "quotes", "first", QUOTES, session=session)
+    core.add_to_memory(memory, "quotes", "second", QUOTES, session=session)
+    assert stored_quotes() == []  # buffered until commit
+    session.commit()
+    assert stored_quotes() == ["first", "second"]
+
+
+def test_rollback_takes_items_out_of_the_in_process_lists(memory_store):
+    memory = {"used_quotes": ["older"]}
+    session = core.MemorySession()
+    core.add_to_memory(memory, "quotes", "fresh", QUOTES, session=session)
+    assert memory["used_quotes"] == ["older", "fresh"]
+    session.rollback()
+    assert memory["used_quotes"] == ["older"]
+    assert session.pending == []
+    assert stored_quotes() == []
+
+
+def test_failed_post_writes_nothing_unless_kept(memory_store, monkeypatch):
+    monkeypatch.setattr(core, "MEMORY_KEEP_FAILED_POSTS", False)
+    memory = {"used_quotes": []}
+    session = core.MemorySession()
+    core.add_to_memory(memory, "quotes", "rejected", QUOTES, session=session)
+    session.finish(posted=False)
+    assert stored_quotes() == []
+    assert memory["used_quotes"] == []
+    assert not core.is_in_memory(QUOTES, "rejected")
+
+
+def test_failed_post_is_kept_by_default(memory_store, monkeypatch):
+    monkeypatch.setattr(core, "MEMORY_KEEP_FAILED_POSTS", True)
+    memory = {"used_quotes": []}
+    session = core.MemorySession()
+    core.add_to_memory(memory, "quotes", "rejected", QUOTES, session=session)
+    session.finish(posted=False)
+    assert stored_quotes() == ["rejected"]
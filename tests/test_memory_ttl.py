@@ -0,0 +1,48 @@
+import time
+
+import core.main as core
+
+QUOTES = core.QUOTES_MEMORY_FILE
+
+
+def insert(item, days_ago, content_type="quotes"):
+    conn = core.memory_connection()
+    with conn:
+        conn.execute("INSERT INTO memory (content_type, item, added_at) VALUES (?, ?, ?)",
+                     (content_type, item, time.time() - days_ago * 86400))
+
+
+def test_expired_items_are_ignored(memory_store, monkeypatch):
+    monkeypatch.setitem(core.MEMORY_TTL_DAYS, "quotes", 7)
+    insert("stale", days_ago=8)
+    insert("fresh", days_ago=1)
+    assert core.load_memory(QUOTES)["used_quotes"] == ["fresh"]
+    assert core.is_in_memory(QUOTES, "fresh")
+    assert not core.is_in_memory(QUOTES, "stale")
+    assert core.memory_counts(QUOTES) == (1, 1)
+
+
+def test_ttl_is_per_content_type(memory_store, monkeypatch):
+    monkeypatch.setitem(core.MEMORY_TTL_DAYS, "quotes", 7)
+    monkeypatch.setitem(core.MEMORY_TTL_DAYS, "books", 90)
+    insert("Some Book", days_ago=30, content_type="books")
+    assert core.is_in_memory(core.BOOKS_MEMORY_FILE, "Some Book")
+    assert core.memory_counts(core.BOOKS_MEMORY_FILE) == (1, 0)
+
+
+def test_sweep_removes_only_expired_items(memory_store, monkeypatch):
+    monkeypatch.setitem(core.MEMORY_TTL_DAYS, "quotes", 7)
+    insert("stale", days_ago=8)
+    insert("fresh", days_ago=1)
+    conn = core.memory_connection()
+    with conn:
+        assert core.sweep_expired_memory(conn, {"quotes"}) == 1
+    assert core.memory_counts(QUOTES) == (1, 0)
+
+
+def test_reusing_an_expired_item_makes_it_live_again(memory_store, monkeypatch):
+    monkeypatch.setitem(core.MEMORY_TTL_DAYS, "quotes", 7)
+    insert("comeback", days_ago=8)
+    core.add_to_memory({"used_quotes": []}, "quotes", "comeback", QUOTES)
+    assert core.is_in_memory(QUOTES, "comeback")
+    assert core.memory_counts(QUOTES) == (1, 0)
@@ -0,0 +1,36 @@
+from core.main import Candidate, cluster_near_duplicates
+
+
+def candidate(title, source, score):
+    item = Candidate(title, f"https://{source}/story", source)
+    item.score = score
+    return item
+
+
+def test_same_story_from_two_sources_keeps_the_higher_score():
+    low = candidate("OpenAI releases GPT-5 model with reasoning upgrades", "www.theverge.com", 10)
+    high = candidate("OpenAI releases GPT-5 model with major reasoning upgrades", "techcrunch.com", 25)
+    assert cluster_near_duplicates([low, high]) == [high]
+
+
+def test_unrelated_titles_are_kept_in_order():
+    items = [
+        candidate("Quantum chip startup raises Series B funding", "techcrunch.com", 5),
+        candidate("Bitcoin ETF inflows hit record high", "www.coindesk.com", 30),
+        candidate("Researchers map the fruit fly brain connectome", "news.mit.edu", 12),
+    ]
+    assert cluster_near_duplicates(items) == items
+
+
+def test_kept_duplicate_stays_at_its_feed_position():
+    first = candidate("Apple unveils M5 chip for MacBook Pro laptops", "www.theverge.com", 8)
+    other = candidate("NASA delays Artemis moon landing again", "www.space.com", 15)
+    best = candidate("Apple unveils M5 chip for new MacBook Pro laptops", "arstechnica.com", 20)
+    last = candidate("Linux kernel adds Rust drivers for GPUs", "lwn.net", 3)
+    assert cluster_near_duplicates([first, other, best, last]) == [other, best, last]
+
+
+def test_titles_without_significant_words_are_never_merged():
+    items = [candidate("How it is", "a.example", 1), candidate("How it is", "b.example", 2),
+             candidate("What is new?", "c.example", 3)]
+    assert cluster_near_duplicates(items) == items
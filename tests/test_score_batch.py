@@ -0,0 +1,46 @@
+import random
+
+import pytest
+
+from core.main import score_batch, calculate_content_score, calculate_crypto_content_score, TECHNEWS_TITLE_RULES, CRYPTO_TITLE_RULES
+
+WORDS = [
+    "researchers", "study", "breakthrough", "quantum", "hackers", "exploited", "defi", "bitcoin",
+    "policy", "laws", "leaked", "celebrity", "update", "released", "pumping", "market", "new",
+    "chips", "startup", "funding", "ai", "the", "of", "for", "with", "climate", "energy",
+]
+SOURCES = ["hnrss.org", "www.techmeme.com", "news.mit.edu", "www.coindesk.com", "decrypt.co", "example.com"]
+
+
+def make_items(count, seed=7):
+    rng = random.Random(seed)
+    return [{"title": " ".join(rng.choice(WORDS) for _ in range(rng.randint(3, 14))).capitalize(),
+             "source": rng.choice(SOURCES)} for _ in range(count)]
+
+
+@pytest.mark.parametrize("scorer, rules", [
+    (calculate_content_score, TECHNEWS_TITLE_RULES),
+    (calculate_crypto_content_score, CRYPTO_TITLE_RULES),
+])
+def test_score_batch_matches_per_item(scorer, rules):
+    items = make_items(500)
+    assert score_batch(items, rules).tolist() == [scorer(item) for item in items]
+
+
+def test_score_batch_handles_newlines_in_titles():
+    items = [{"title": "AI\nresearch", "source": "example.com"},
+             {"title": "Quantum leap", "source": "example.com"},
+             {"title": "bitcoin\nhack", "source": "example.com"}]
+    for scorer, rules in [(calculate_content_score, TECHNEWS_TITLE_RULES),
+                          (calculate_crypto_content_score, CRYPTO_TITLE_RULES)]:
+        assert score_batch(items, rules).tolist() == [scorer(item) for item in items]
+
+
+def test_score_batch_empty():
+    assert score_batch([], TECHNEWS_TITLE_RULES).tolist() == []
+
+
+def test_score_batch_duplicate_titles_keep_their_own_source_bonus():
+    items = make_items(50) * 3
+    items = [dict(item, source=SOURCES[n % len(SOURCES)]) for n, item in enumerate(items)]
+    assert score_batch(items, TECHNEWS_TITLE_RULES).tolist() == [calculate_content_score(item) for item in items]
@@ -0,0 +1,29 @@
+import pickle
+
+from core.main import ScalableBloomFilter
+
+
+def test_no_false_negatives_across_growth():
+    index = ScalableBloomFilter(capacity=100, error_rate=0.01)
+    items = [f"https://example.com/post/{n}" for n in range(2500)]
+    for item in items:
+        index.add(item)
+    assert len(index.filters) > 3  # grew several times
+    assert all(item in index for item in items)
+
+
+def test_false_positive_rate_stays_bounded():
+    index = ScalableBloomFilter(capacity=100, error_rate=0.01)
+    for n in range(2500):
+        index.add(f"seen-{n}")
+    false_positives = sum(f"unseen-{n}" in index for n in range(10000))
+    assert false_positives / 10000 < 0.03
+
+
+def test_survives_pickling():
+    index = ScalableBloomFilter(capacity=50, error_rate=0.01)
+    for n in range(300):
+        index.add(str(n))
+    restored = pickle.loads(pickle.dumps(index))
+    assert all(str(n) in restored for n in range(300))
+    assert len(restored) == len(index)
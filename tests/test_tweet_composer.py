@@ -0,0 +1,58 @@
+from core.main import fit_tweet, tweet_length, TWEET_MAX_LENGTH
+
+URL = "https://example.com/a/very/long/path/that/twitter/shortens/to/twenty-three"
+
+
+def test_plain_text_counts_characters():
+    assert tweet_length("hello world") == 11
+
+
+def test_url_counts_23():
+    assert tweet_length(URL) == 23
+    assert tweet_length(f"Read {URL} now") == len("Read  now") + 23
+
+
+def test_cjk_and_emoji_count_double():
+    assert tweet_length("日本語") == 6
+    assert tweet_length("🚀") == 2
+    assert tweet_length("👨‍👩‍👧") == 2  # one ZWJ sequence
+    assert tweet_length("café") == 4
+
+
+def test_fit_tweet_keeps_tweets_at_the_limit():
+    text = "a" * (TWEET_MAX_LENGTH - 24) + " " + URL
+    assert tweet_length(text) == TWEET_MAX_LENGTH
+    assert fit_tweet(text) == text
+
+
+def test_fit_tweet_trims_one_over_the_limit():
+    text = "word " * 51 + "xx " + URL  # 281 weighted characters
+    assert tweet_length(text) == TWEET_MAX_LENGTH + 1
+    fitted = fit_tweet(text)
+    assert tweet_length(fitted) <= TWEET_MAX_LENGTH
+    assert fitted.endswith(URL)
+    assert "…" in fitted
+
+
+def test_fit_tweet_keeps_links_and_list_markers():
+    text = " ".join(f"{n}. " + "detail " * 12 + f"https://example.com/{n}" for n in range(1, 5))
+    fitted = fit_tweet(text)
+    assert tweet_length(fitted) <= TWEET_MAX_LENGTH
+    for n in range(1, 5):
+        assert f"{n}." in fitted
+        assert f"https://example.com/{n}" in fitted
+
+
+def test_fit_tweet_gives_up_when_only_links_would_be_left():
+    assert fit_tweet("x" * 400) is None
+    assert fit_tweet(" ".join(f"https://example.com/{n}" for n in range(13))) is None
+
+
+def test_fit_tweet_is_fast_on_long_text():
+    import time
+    text = "word " * 2000 + URL
+    start = time.perf_counter()
+    fitted = fit_tweet(text)
+    assert time.perf_counter() - start < 1.0
+    assert tweet_length(fitted) == TWEET_MAX_LENGTH
+    assert fitted.endswith("word… " + URL)
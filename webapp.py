@@ -5,15 +5,19 @@ Shows all tweets from your 6 Quinn accounts with real-time updates
 """
 
 import os
+import sys
 import json
 import time
 import threading
 from datetime import datetime, timedelta
 from flask import Flask, render_template, jsonify, request
 from flask_socketio import SocketIO, emit
-import tweepy
 from config.twitter_dict import accounts_data
 
+# Share the bot's per-account Twitter clients (src/utils/twitter_clients.py)
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
+from utils.twitter_clients import get_twitter_client, get_twitter_user_id
+
 app = Flask(__name__)
 app.config['SECRET_KEY'] = 'quinn-dashboard-secret-key-2024'
 socketio = SocketIO(app, cors_allowed_origins="*")
@@ -25,28 +29,18 @@ last_update = {}
 def fetch_recent_tweets(account_name, max_tweets=50):
     """Fetch recent tweets from a specific account (all available tweets)"""
     try:
-        # Find the account credentials
-        account = next((acc for acc in accounts_data if acc["name"] == account_name), None)
-        if not account:
+        # Reuse the account's long-lived client (and its open connections)
+        client = get_twitter_client(account_name)
+        if client is None:
             print(f"❌ No Twitter credentials found for {account_name}")
             return get_sample_tweets(account_name)
         
-        # Authenticate with Twitter
-        client = tweepy.Client(
-            consumer_key=account["consumer_key"],
-            consumer_secret=account["consumer_secret"],
-            access_token=account["access_token"],
-            access_token_secret=account["access_token_secret"]
-        )
-        
-        # Get user ID first
-        user = client.get_me()
-        if not user.data:
+        # User ID is looked up once per process
+        user_id = get_twitter_user_id(account_name)
+        if user_id is None:
             print(f"❌ Could not get user info for {account_name}")
             return get_sample_tweets(account_name)
         
-        user_id = user.data.id
-        
         # Get recent tweets
         tweets = client.get_users_tweets(
             id=user_id,